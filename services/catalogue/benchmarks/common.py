@@ -0,0 +1,67 @@
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+from src.domain.entities import Category, Product
+from src.domain.value_objects import Inventory, Price
+
+CATEGORIES = ["Books", "Games", "Garden", "Kitchen", "Music", "Toys"]
+
+
+def build_products(
+    count: int, prefix: str = "BENCH", start: int = 0
+) -> List[Product]:
+    return [
+        Product(
+            sku=f"{prefix}-{index:08d}",
+            name=f"Benchmark product {index}",
+            description="Product created by the catalogue benchmarks",
+            image_url="http://example.com/image.png",
+            price=Price(
+                id=uuid4(), value=10.0 + index % 100, discount_percent=0
+            ),
+            inventory=Inventory(id=uuid4(), quantity=100, reserved=0),
+            category=Category(
+                id=uuid4(), name=CATEGORIES[index % len(CATEGORIES)]
+            ),
+        )
+        for index in range(start, start + count)
+    ]
+
+
+async def seed_products(
+    adapter, count: int, prefix: str = "BENCH", batch_size: int = 5000
+) -> None:
+    """Bulk insert ``count`` products, skipping skus that already exist."""
+    for start in range(0, count, batch_size):
+        products = build_products(
+            min(batch_size, count - start), prefix, start
+        )
+        await adapter.create_products(products, batch_size=batch_size)
+
+
+async def measure(
+    operation: Callable[[int], Awaitable[object]], iterations: int
+) -> Dict[str, float]:
+    """Run ``operation`` sequentially and report latencies in ms."""
+    latencies = []
+    for iteration in range(iterations):
+        started_at = time.perf_counter()
+        await operation(iteration)
+        latencies.append((time.perf_counter() - started_at) * 1000)
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'case':<28}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<28}{result['mean_ms']:>10.3f}"
+            f"{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+        )
@@ -0,0 +1,203 @@
+"""
+Compare category lookup, foreign key join and delete latency with and
+without the lookup indexes on the Product foreign keys and on
+lower(Category.name).
+
+The foreign key joins start from a Price or Inventory row and reach its
+Product through the indexed column, the same lookup deleting a Price or
+Inventory row makes to check the foreign key. The indexes are dropped
+for the first run and rebuilt for the second, so run it against a
+throwaway database migrated to head:
+
+    CATALOGUE_DATABASE_URL=postgresql://... \\
+        python -m benchmarks.lookup_indexes --products 1000000
+"""
+
+import argparse
+import asyncio
+import random
+from typing import Any, Dict, List
+
+from benchmarks.common import (
+    CATEGORIES,
+    measure,
+    print_results,
+    seed_products,
+)
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.adapter.postgres import ProductPostgresAdapter
+from src.config import get_config
+from src.domain.exceptions import ProductNotFound
+
+config = get_config()
+
+INDEXES = {
+    "ix_Product_price_id": 'ON "Product" (price_id)',
+    "ix_Product_inventory_id": 'ON "Product" (inventory_id)',
+    "ix_Product_category_id": 'ON "Product" (category_id)',
+    "ix_Category_name_lower": 'ON "Category" (lower(name))',
+}
+
+SEED_CATEGORIES = text(
+    """
+    INSERT INTO "Category" (id, name)
+    SELECT gen_random_uuid(), 'Bench category ' || number
+    FROM generate_series(0, :count - 1) AS number
+    ON CONFLICT (name) DO NOTHING
+    """
+)
+
+CATEGORY_LOOKUP = text(
+    """
+    SELECT id FROM "Category" WHERE lower(name) = lower(:name)
+    """
+)
+
+SAMPLE_CHILDREN = text(
+    """
+    SELECT price_id, inventory_id FROM "Product"
+    WHERE sku LIKE 'BENCH-%'
+    ORDER BY random() LIMIT :count
+    """
+)
+
+PRICE_JOIN = text(
+    """
+    SELECT p.sku, i.quantity, c.name FROM "Price" pr
+    JOIN "Product" p ON p.price_id = pr.id
+    JOIN "Inventory" i ON p.inventory_id = i.id
+    JOIN "Category" c ON p.category_id = c.id
+    WHERE pr.id = :id
+    """
+)
+
+INVENTORY_JOIN = text(
+    """
+    SELECT p.sku, pr.value, c.name FROM "Inventory" i
+    JOIN "Product" p ON p.inventory_id = i.id
+    JOIN "Price" pr ON p.price_id = pr.id
+    JOIN "Category" c ON p.category_id = c.id
+    WHERE i.id = :id
+    """
+)
+
+CATEGORY_PRODUCTS = text(
+    """
+    SELECT count(*) FROM "Product" p
+    JOIN "Category" c ON p.category_id = c.id
+    WHERE lower(c.name) = lower(:name)
+    """
+)
+
+
+async def set_indexes(engine, enabled: bool) -> None:
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        for name, definition in INDEXES.items():
+            if enabled:
+                await connection.execute(
+                    text(f'CREATE INDEX IF NOT EXISTS "{name}" {definition}')
+                )
+            else:
+                await connection.execute(
+                    text(f'DROP INDEX IF EXISTS "{name}"')
+                )
+        await connection.execute(text('ANALYZE "Product", "Category"'))
+
+
+async def seed_categories(engine, count: int) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(SEED_CATEGORIES, {"count": count})
+
+
+async def run(
+    adapter, engine, categories: int, operations: int, phase: str
+) -> Dict[str, Dict[str, float]]:
+    category_names = [
+        f"BENCH CATEGORY {random.randrange(categories)}"
+        for _ in range(operations)
+    ]
+    async with engine.connect() as connection:
+        children = (
+            await connection.execute(SAMPLE_CHILDREN, {"count": operations})
+        ).fetchall()
+    # Each phase deletes its own products so both runs delete the same
+    # number of rows.
+    delete_prefix = f"DELETE-{phase.upper()}"
+    await seed_products(adapter, operations, prefix=delete_prefix)
+
+    def lookup(statement, values: List[Dict[str, Any]]):
+        async def execute(iteration: int) -> None:
+            async with engine.connect() as connection:
+                await connection.execute(statement, values[iteration])
+
+        return execute
+
+    async def count_category(iteration: int) -> None:
+        async with engine.connect() as connection:
+            await connection.execute(
+                CATEGORY_PRODUCTS,
+                {"name": CATEGORIES[iteration % len(CATEGORIES)].upper()},
+            )
+
+    return {
+        f"category lookup {phase}": await measure(
+            lookup(
+                CATEGORY_LOOKUP, [{"name": name} for name in category_names]
+            ),
+            operations,
+        ),
+        f"price join {phase}": await measure(
+            lookup(PRICE_JOIN, [{"id": row.price_id} for row in children]),
+            len(children),
+        ),
+        f"inventory join {phase}": await measure(
+            lookup(
+                INVENTORY_JOIN, [{"id": row.inventory_id} for row in children]
+            ),
+            len(children),
+        ),
+        f"category join {phase}": await measure(
+            count_category, max(operations // 100, 1)
+        ),
+        f"delete {phase}": await measure(
+            lambda iteration: adapter.delete_product(
+                f"{delete_prefix}-{iteration:08d}", ProductNotFound()
+            ),
+            operations,
+        ),
+    }
+
+
+async def main(products: int, categories: int, operations: int) -> None:
+    adapter = ProductPostgresAdapter(config.DATABASE_URL)
+    engine = create_async_engine(
+        ProductPostgresAdapter.async_url(config.DATABASE_URL)
+    )
+    await seed_products(adapter, products)
+    await seed_categories(engine, categories)
+
+    results = {}
+    for phase, enabled in (("before", False), ("after", True)):
+        await set_indexes(engine, enabled)
+        results.update(
+            await run(adapter, engine, categories, operations, phase)
+        )
+    print_results(results)
+
+    await engine.dispose()
+    await adapter.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1000000)
+    parser.add_argument("--categories", type=int, default=100000)
+    parser.add_argument("--operations", type=int, default=1000)
+    arguments = parser.parse_args()
+    asyncio.run(
+        main(arguments.products, arguments.categories, arguments.operations)
+    )
@@ -0,0 +1,68 @@
+"""
+Compare product lookups through the four table join and the ProductRead
+read model.
+
+Run from services/catalogue against a migrated database:
+
+    CATALOGUE_DATABASE_URL=postgresql://... \\
+        python -m benchmarks.read_model --products 100000 --lookups 5000
+"""
+
+import argparse
+import asyncio
+import random
+
+from benchmarks.common import measure, print_results, seed_products
+from src.adapter.postgres import ProductPostgresAdapter
+from src.config import get_config
+from src.domain.exceptions import ProductNotFound
+
+config = get_config()
+
+
+async def main(products: int, lookups: int) -> None:
+    join_adapter = ProductPostgresAdapter(config.DATABASE_URL)
+    read_model_adapter = ProductPostgresAdapter(
+        config.DATABASE_URL, read_model=True
+    )
+    await seed_products(read_model_adapter, products)
+    # Products seeded by an earlier run without the read model.
+    await read_model_adapter.sync_read_model()
+
+    skus = [f"BENCH-{random.randrange(products):08d}" for _ in range(lookups)]
+    results = {}
+    for name, adapter in (
+        ("get_product_by_sku join", join_adapter),
+        ("get_product_by_sku read", read_model_adapter),
+    ):
+        # Warm the pool and the buffer cache before measuring.
+        for sku in skus[:100]:
+            await adapter.get_product_by_sku(sku, ProductNotFound())
+        results[name] = await measure(
+            lambda iteration: adapter.get_product_by_sku(
+                skus[iteration], ProductNotFound()
+            ),
+            lookups,
+        )
+    for name, adapter in (
+        ("get_products_by_skus join", join_adapter),
+        ("get_products_by_skus read", read_model_adapter),
+    ):
+        results[name] = await measure(
+            lambda iteration: adapter.get_products_by_skus(
+                skus[iteration : iteration + 50]
+            ),
+            lookups // 50,
+        )
+    print_results(results)
+
+    await join_adapter.dispose()
+    await read_model_adapter.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.products, arguments.lookups))
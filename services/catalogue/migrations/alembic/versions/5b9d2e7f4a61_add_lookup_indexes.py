@@ -0,0 +1,36 @@
+"""add lookup indexes
+
+Revision ID: 5b9d2e7f4a61
+Revises: 3e5a7c1d9b24
+Create Date: 2026-10-17 16:48:05.731942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9d2e7f4a61'
+down_revision: Union[str, None] = '3e5a7c1d9b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so a populated catalogue keeps serving writes,
+    # which can not happen inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_Product_price_id', 'Product', ['price_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_Product_inventory_id', 'Product', ['inventory_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_Product_category_id', 'Product', ['category_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_Category_name_lower', 'Category', [sa.text('lower(name)')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_Category_name_lower', table_name='Category', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_Product_category_id', table_name='Product', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_Product_inventory_id', table_name='Product', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_Product_price_id', table_name='Product', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,43 @@
+"""store prices as numeric
+
+Revision ID: 9f3c6a2d8e15
+Revises: 5b9d2e7f4a61
+Create Date: 2026-10-17 18:21:54.094127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3c6a2d8e15'
+down_revision: Union[str, None] = '5b9d2e7f4a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ('Price', 'value', sa.Numeric(precision=12, scale=2)),
+    ('Price', 'discount_percent', sa.Numeric(precision=5, scale=4)),
+    ('ProductRead', 'price_value', sa.Numeric(precision=12, scale=2)),
+    ('ProductRead', 'price_discount_percent', sa.Numeric(precision=5, scale=4)),
+]
+
+
+def upgrade() -> None:
+    # Rewrites both tables, run it in a maintenance window on large
+    # catalogues.
+    for table, column, numeric in COLUMNS:
+        op.alter_column(table, column,
+               existing_type=sa.Float(),
+               type_=numeric,
+               postgresql_using=f'round({column}::numeric, {numeric.scale})')
+
+
+def downgrade() -> None:
+    for table, column, numeric in COLUMNS:
+        op.alter_column(table, column,
+               existing_type=numeric,
+               type_=sa.Float(),
+               postgresql_using=f'{column}::double precision')
@@ -0,0 +1,377 @@
+import logging
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from src.config import get_config
+from src.domain.entities import Product
+from src.domain.enums import InventoryOperation, ProductImportStatus
+from src.domain.events import ProductEvent
+from src.domain.value_objects import Inventory
+from src.port.caches import ProductCache
+from src.port.repositories import ProductRepository
+
+config = get_config()
+logger = logging.getLogger("app")
+
+
+class InMemoryProductCache(ProductCache):
+    """
+    Bounded LRU cache with a time to live, local to the process.
+
+    Entries keep the product version, an entry is never replaced by an
+    older version of the same product. Deletes bump the SKU generation,
+    so a read-through fill started before them is dropped; only the last
+    ``max_size`` SKUs deleted keep a generation of their own. Writes only
+    clear the entries of the process that made them, with several
+    workers the others rely on the Redis invalidation listener or,
+    without Redis, on ``ttl``, so keep it short.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__entries: "OrderedDict[str, Tuple[float, Product]]" = (
+            OrderedDict()
+        )
+        self.__generations: "OrderedDict[str, int]" = OrderedDict()
+        self.__last_generation = 0
+        # Returned for the SKUs without a generation of their own, it is
+        # never below one that was dropped.
+        self.__generation_floor = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    async def get(self, sku: str) -> Optional[Product]:
+        entry = self.__entries.get(sku)
+        if entry is None:
+            self.__misses += 1
+            return None
+        expires_at, product = entry
+        if expires_at < time.monotonic():
+            del self.__entries[sku]
+            self.__expirations += 1
+            self.__misses += 1
+            return None
+        self.__entries.move_to_end(sku)
+        self.__hits += 1
+        return product
+
+    async def set(
+        self, product: Product, generation: Optional[int] = None
+    ) -> None:
+        if generation is not None and generation != self.__generation(
+            product.sku
+        ):
+            return
+        entry = self.__entries.get(product.sku)
+        if entry is not None and (entry[1].version or 0) > (
+            product.version or 0
+        ):
+            return
+        self.__entries[product.sku] = (
+            time.monotonic() + self.__ttl,
+            product,
+        )
+        self.__entries.move_to_end(product.sku)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    async def delete(self, sku: str) -> None:
+        self.__entries.pop(sku, None)
+        self.__last_generation += 1
+        self.__generations[sku] = self.__last_generation
+        self.__generations.move_to_end(sku)
+        while len(self.__generations) > self.__max_size:
+            _, self.__generation_floor = self.__generations.popitem(last=False)
+
+    async def generation(self, sku: str) -> int:
+        return self.__generation(sku)
+
+    def __generation(self, sku: str) -> int:
+        return self.__generations.get(sku, self.__generation_floor)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self.__entries),
+            "max_size": self.__max_size,
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "expirations": self.__expirations,
+        }
+
+
+class CachedProductRepository(ProductRepository):
+    """
+    Read-through cache in front of a product repository.
+
+    Reads look up the cache tiers in order and backfill the faster
+    tiers on a hit. A miss reads the repository and fills each tier only
+    if the product was not invalidated meanwhile, so a read racing a
+    write can not cache the old product after the write cleared it.
+    Writes go to the repository first and then refresh or invalidate
+    every tier, so a failing tier never fails a request.
+    """
+
+    def __init__(
+        self,
+        product_repository: ProductRepository,
+        product_caches: List[ProductCache],
+    ) -> None:
+        self.__product_repository = product_repository
+        self.__product_caches = product_caches
+        self.__invalidations = 0
+
+    async def __cache_get(self, sku: str) -> Optional[Product]:
+        for index, product_cache in enumerate(self.__product_caches):
+            try:
+                product = await product_cache.get(sku)
+            except Exception as error:
+                logger.error(f"Error reading product cache: {error}")
+                continue
+            if product is not None:
+                await self.__cache_set(product, self.__product_caches[:index])
+                return product
+        return None
+
+    async def __cache_set(
+        self, product: Product, product_caches: List[ProductCache]
+    ) -> None:
+        for product_cache in product_caches:
+            try:
+                await product_cache.set(product)
+            except Exception as error:
+                logger.error(f"Error writing product cache: {error}")
+
+    async def __cache_generations(self, sku: str) -> List[Optional[int]]:
+        generations: List[Optional[int]] = []
+        for product_cache in self.__product_caches:
+            try:
+                generations.append(await product_cache.generation(sku))
+            except Exception as error:
+                logger.error(f"Error reading product cache: {error}")
+                generations.append(None)
+        return generations
+
+    async def __cache_fill(
+        self, product: Product, generations: List[Optional[int]]
+    ) -> None:
+        for product_cache, generation in zip(
+            self.__product_caches, generations
+        ):
+            # A tier whose generation could not be read is left alone.
+            if generation is None:
+                continue
+            try:
+                await product_cache.set(product, generation=generation)
+            except Exception as error:
+                logger.error(f"Error writing product cache: {error}")
+
+    async def __cache_delete(self, sku: str) -> None:
+        self.__invalidations += 1
+        for product_cache in self.__product_caches:
+            try:
+                await product_cache.delete(sku)
+            except Exception as error:
+                logger.error(f"Error invalidating product cache: {error}")
+
+    async def create_product(
+        self,
+        product: Product,
+        on_duplicate_sku: Exception,
+        on_not_found: Exception,
+    ) -> Product:
+        created_product = await self.__product_repository.create_product(
+            product=product,
+            on_duplicate_sku=on_duplicate_sku,
+            on_not_found=on_not_found,
+        )
+        await self.__cache_set(created_product, self.__product_caches)
+        return created_product
+
+    async def create_products(
+        self, products: List[Product], batch_size: int
+    ) -> List[ProductImportStatus]:
+        return await self.__product_repository.create_products(
+            products=products, batch_size=batch_size
+        )
+
+    async def get_product_version(
+        self, sku: str, on_not_found: Exception
+    ) -> int:
+        product = await self.__cache_get(sku)
+        if product is not None and product.version is not None:
+            return product.version
+        return await self.__product_repository.get_product_version(
+            sku=sku, on_not_found=on_not_found
+        )
+
+    async def get_product_by_sku(
+        self, sku: str, on_not_found: Exception
+    ) -> Product:
+        product = await self.__cache_get(sku)
+        if product is not None:
+            return product
+        generations = await self.__cache_generations(sku)
+        product = await self.__product_repository.get_product_by_sku(
+            sku=sku, on_not_found=on_not_found
+        )
+        await self.__cache_fill(product, generations)
+        return product
+
+    async def get_products_by_skus(self, skus: List[str]) -> List[Product]:
+        products: List[Product] = []
+        missing_skus: List[str] = []
+        for sku in skus:
+            product = await self.__cache_get(sku)
+            if product is None:
+                missing_skus.append(sku)
+            else:
+                products.append(product)
+        if missing_skus:
+            generations = {
+                sku: await self.__cache_generations(sku)
+                for sku in missing_skus
+            }
+            found_products = (
+                await self.__product_repository.get_products_by_skus(
+                    skus=missing_skus
+                )
+            )
+            for product in found_products:
+                await self.__cache_fill(product, generations[product.sku])
+            products.extend(found_products)
+        return products
+
+    async def list_products(
+        self, after_sku: Optional[str], limit: int
+    ) -> List[Product]:
+        return await self.__product_repository.list_products(
+            after_sku=after_sku, limit=limit
+        )
+
+    def stream_products(self, batch_size: int) -> AsyncIterator[Product]:
+        return self.__product_repository.stream_products(batch_size=batch_size)
+
+    async def update_product(
+        self,
+        product: Product,
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        on_duplicate: Exception,
+    ) -> Product:
+        try:
+            updated_product = await self.__product_repository.update_product(
+                product=product,
+                on_not_found=on_not_found,
+                on_outdated_version=on_outdated_version,
+                on_duplicate=on_duplicate,
+            )
+        except Exception:
+            await self.__cache_delete(product.sku)
+            raise
+        await self.__cache_delete(product.sku)
+        await self.__cache_set(updated_product, self.__product_caches)
+        return updated_product
+
+    async def patch_product(
+        self,
+        sku: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int],
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        on_invalid_inventory: Exception,
+    ) -> Product:
+        try:
+            patched_product = await self.__product_repository.patch_product(
+                sku=sku,
+                changes=changes,
+                expected_version=expected_version,
+                on_not_found=on_not_found,
+                on_outdated_version=on_outdated_version,
+                on_invalid_inventory=on_invalid_inventory,
+            )
+        except Exception:
+            await self.__cache_delete(sku)
+            raise
+        await self.__cache_delete(sku)
+        await self.__cache_set(patched_product, self.__product_caches)
+        return patched_product
+
+    async def reprice_category(
+        self,
+        category_name: str,
+        discount_percent: Decimal,
+        on_not_found: Exception,
+    ) -> List[str]:
+        skus = await self.__product_repository.reprice_category(
+            category_name=category_name,
+            discount_percent=discount_percent,
+            on_not_found=on_not_found,
+        )
+        for sku in skus:
+            await self.__cache_delete(sku)
+        return skus
+
+    async def delete_product(self, sku: str, on_not_found: Exception) -> bool:
+        try:
+            return await self.__product_repository.delete_product(
+                sku=sku, on_not_found=on_not_found
+            )
+        finally:
+            await self.__cache_delete(sku)
+
+    async def adjust_inventory(
+        self,
+        operation: InventoryOperation,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient_inventory: Exception,
+    ) -> Dict[str, Inventory]:
+        try:
+            return await self.__product_repository.adjust_inventory(
+                operation=operation,
+                quantities=quantities,
+                on_not_found=on_not_found,
+                on_insufficient_inventory=on_insufficient_inventory,
+            )
+        finally:
+            for sku in quantities:
+                await self.__cache_delete(sku)
+
+    async def relay_product_events(
+        self,
+        handler: Callable[[List[ProductEvent]], Awaitable[None]],
+        batch_size: int,
+        handler_timeout: Optional[float] = None,
+    ) -> int:
+        return await self.__product_repository.relay_product_events(
+            handler=handler,
+            batch_size=batch_size,
+            handler_timeout=handler_timeout,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "invalidations": self.__invalidations,
+            "tiers": [
+                product_cache.stats()
+                for product_cache in self.__product_caches
+            ],
+        }
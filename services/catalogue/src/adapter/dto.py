@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -9,6 +9,11 @@ class InventoryDTO(BaseModel):
     reserved: Optional[int] = 0
 
 
+class InventoryPatchDTO(BaseModel):
+    quantity: Optional[int] = None
+    reserved: Optional[int] = None
+
+
 class PriceDTO(BaseModel):
     value: float
     discount_percent: float
@@ -44,8 +49,30 @@ class ProductRequestDTO(BaseModel):
     }
 
 
+class ProductPatchRequestDTO(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    price: Optional[PriceDTO] = None
+    inventory: Optional[InventoryPatchDTO] = None
+    category: Optional[CategoryDTO] = None
+    version: Optional[int] = None
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "inventory": {"quantity": 25},
+                    "version": 3,
+                }
+            ]
+        }
+    }
+
+
 class ProductResponseDTO(BaseModel):
     id: Optional[UUID]
+    version: Optional[int] = None
     sku: str
     name: str
     description: str
@@ -53,3 +80,52 @@ class ProductResponseDTO(BaseModel):
     price: Optional[PriceDTO] = None
     inventory: Optional[InventoryDTO] = None
     category: Optional[CategoryDTO] = None
+
+
+class InventoryItemDTO(BaseModel):
+    sku: str
+    quantity: int
+
+
+class InventoryAdjustmentRequestDTO(BaseModel):
+    items: List[InventoryItemDTO]
+
+
+class InventoryLevelDTO(BaseModel):
+    sku: str
+    quantity: int
+    reserved: int
+
+
+class InventoryAdjustmentResponseDTO(BaseModel):
+    items: List[InventoryLevelDTO]
+
+
+class CategoryRepriceRequestDTO(BaseModel):
+    discount_percent: float
+
+
+class CategoryRepriceResponseDTO(BaseModel):
+    category: str
+    discount_percent: float
+    repriced: int
+
+
+class ProductImportResultDTO(BaseModel):
+    sku: str
+    status: str
+    message: Optional[str] = None
+
+
+class ProductLookupRequestDTO(BaseModel):
+    skus: List[str]
+
+
+class ProductLookupResponseDTO(BaseModel):
+    products: List[ProductResponseDTO]
+    missing: List[str]
+
+
+class ProductPageResponseDTO(BaseModel):
+    products: List[ProductResponseDTO]
+    next_cursor: Optional[str] = None
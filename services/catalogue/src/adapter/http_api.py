@@ -1,17 +1,31 @@
+import base64
+import binascii
 import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from src.adapter.dto import (
-    CategoryDTO,
-    InventoryDTO,
-    PriceDTO,
+    CategoryRepriceRequestDTO,
+    CategoryRepriceResponseDTO,
+    InventoryAdjustmentRequestDTO,
+    InventoryAdjustmentResponseDTO,
+    ProductImportResultDTO,
+    ProductLookupRequestDTO,
+    ProductLookupResponseDTO,
+    ProductPageResponseDTO,
+    ProductPatchRequestDTO,
     ProductRequestDTO,
     ProductResponseDTO,
 )
 from src.config import get_config
 from src.domain.entities import Category, Product
+from src.domain.enums import InventoryOperation, ProductImportStatus
 from src.domain.exceptions import (
+    CategoryNotFound,
     DuplicatedProduct,
+    InsufficientInventory,
     InvalidDescription,
     InvalidImageUrl,
     InvalidInventory,
@@ -21,9 +35,11 @@ from src.domain.exceptions import (
     OutdatedProduct,
     ProductAlreadyExist,
     ProductNotFound,
+    TooManySkus,
 )
 from src.domain.services import CatalogueService
-from src.domain.value_objects import Inventory, Price
+from src.domain.value_objects import Inventory, Price, ProductImportResult
+from src.serialization import dumps
 
 config = get_config()
 logger = logging.getLogger("app")
@@ -34,19 +50,85 @@ class HTTPApiAdapter:
         self.__catalogue_service = catalogue_service
         self.router = APIRouter()
         self.router.add_api_route(
-            "/product", self.create_product, methods=["POST"]
+            "/product",
+            self.create_product,
+            methods=["POST"],
+            response_model=ProductResponseDTO,
         )
         self.router.add_api_route(
-            "/product/{sku}", self.get_product_by_sku, methods=["GET"]
+            "/products:bulk",
+            self.create_products,
+            methods=["POST"],
+            response_model=List[ProductImportResultDTO],
         )
         self.router.add_api_route(
-            "/product/{sku}", self.update_product, methods=["PUT"]
+            "/products",
+            self.list_products,
+            methods=["GET"],
+            response_model=ProductPageResponseDTO,
+        )
+        self.router.add_api_route(
+            "/products/export", self.export_products, methods=["GET"]
+        )
+        self.router.add_api_route(
+            "/products:batch",
+            self.get_products_by_skus,
+            methods=["GET"],
+            response_model=ProductLookupResponseDTO,
+        )
+        self.router.add_api_route(
+            "/products:batch",
+            self.lookup_products,
+            methods=["POST"],
+            response_model=ProductLookupResponseDTO,
+        )
+        self.router.add_api_route(
+            "/product/{sku}",
+            self.get_product_by_sku,
+            methods=["GET"],
+            response_model=ProductResponseDTO,
+        )
+        self.router.add_api_route(
+            "/product/{sku}",
+            self.update_product,
+            methods=["PUT"],
+            response_model=ProductResponseDTO,
+        )
+        self.router.add_api_route(
+            "/product/{sku}",
+            self.patch_product,
+            methods=["PATCH"],
+            response_model=ProductResponseDTO,
         )
         self.router.add_api_route(
             "/product/{sku}", self.delete_product, methods=["DELETE"]
         )
+        self.router.add_api_route(
+            "/category/{name}:reprice",
+            self.reprice_category,
+            methods=["POST"],
+            response_model=CategoryRepriceResponseDTO,
+        )
+        self.router.add_api_route(
+            "/inventory:reserve",
+            self.reserve_inventory,
+            methods=["POST"],
+            response_model=InventoryAdjustmentResponseDTO,
+        )
+        self.router.add_api_route(
+            "/inventory:release",
+            self.release_inventory,
+            methods=["POST"],
+            response_model=InventoryAdjustmentResponseDTO,
+        )
+        self.router.add_api_route(
+            "/inventory:commit",
+            self.commit_inventory,
+            methods=["POST"],
+            response_model=InventoryAdjustmentResponseDTO,
+        )
 
-    def create_product(self, product: ProductRequestDTO) -> ProductResponseDTO:
+    async def create_product(self, product: ProductRequestDTO) -> Response:
         try:
             inventory = None
             price = None
@@ -65,43 +147,20 @@ class HTTPApiAdapter:
             if product.category is not None:
                 category = Category(name=product.category.name)
 
-            created_product: Product = self.__catalogue_service.create_product(
-                sku=product.sku,
-                name=product.name,
-                description=product.description,
-                image_url=product.image_url,
-                price=price,
-                inventory=inventory,
-                category=category,
-            )
-
-            inventory_dto = None
-            price_dto = None
-            category_dto = None
-            if created_product.price:
-                price_dto = PriceDTO(
-                    value=created_product.price.value,
-                    discount_percent=created_product.price.discount_percent,
-                )
-            if created_product.inventory:
-                inventory_dto = InventoryDTO(
-                    quantity=created_product.inventory.quantity,
-                    reserved=created_product.inventory.reserved,
+            created_product: Product = (
+                await self.__catalogue_service.create_product(
+                    sku=product.sku,
+                    name=product.name,
+                    description=product.description,
+                    image_url=product.image_url,
+                    price=price,
+                    inventory=inventory,
+                    category=category,
                 )
-            if created_product.category:
-                category_dto = CategoryDTO(name=created_product.category.name)
-
-            return ProductResponseDTO(
-                id=created_product.id,
-                sku=created_product.sku,
-                name=created_product.name,
-                description=created_product.description,
-                image_url=created_product.image_url,
-                price=price_dto,
-                inventory=inventory_dto,
-                category=category_dto,
             )
 
+            return self.__json_response(self.__to_document(created_product))
+
         except (
             InvalidSku,
             InvalidDescription,
@@ -125,33 +184,102 @@ class HTTPApiAdapter:
                 status_code=500, detail=f"Error creating product: {error}"
             )
 
-    def get_product_by_sku(self, sku: str) -> ProductResponseDTO:
+    async def create_products(
+        self, products: List[Any] = Body(...)
+    ) -> Response:
+        # Items are validated one by one, a malformed item is reported as
+        # invalid instead of rejecting the whole import.
+        results: List[Optional[ProductImportResult]] = []
+        valid_products: List[Dict[str, Any]] = []
+        for product in products:
+            try:
+                valid_products.append(
+                    ProductRequestDTO.model_validate(product).model_dump()
+                )
+                results.append(None)
+            except ValidationError as error:
+                results.append(self.__invalid_import_result(product, error))
         try:
-            product = self.__catalogue_service.get_product_by_sku(sku=sku)
-            price = None
-            inventory = None
-            category = None
-            if product.price:
-                price = PriceDTO(
-                    value=product.price.value,
-                    discount_percent=product.price.discount_percent,
+            created = iter(
+                await self.__catalogue_service.create_products(
+                    products=valid_products
                 )
-            if product.inventory:
-                inventory = InventoryDTO(
-                    quantity=product.inventory.quantity,
-                    reserved=product.inventory.reserved,
+            )
+            return self.__json_response(
+                [(result or next(created)).to_dict() for result in results]
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error importing products: {error}"
+            )
+
+    @staticmethod
+    def __invalid_import_result(
+        product: Any, error: ValidationError
+    ) -> ProductImportResult:
+        sku = product.get("sku") if isinstance(product, dict) else None
+        message = "; ".join(
+            f"{'.'.join(str(loc) for loc in detail['loc']) or 'product'}: "
+            f"{detail['msg']}"
+            for detail in error.errors()
+        )
+        return ProductImportResult(
+            sku=sku if isinstance(sku, str) else "",
+            status=ProductImportStatus.INVALID,
+            message=message,
+        )
+
+    @staticmethod
+    def __etag(version: Optional[int]) -> Optional[str]:
+        return None if version is None else f'"{version}"'
+
+    @classmethod
+    def __etag_header(cls, version: Optional[int]) -> Dict[str, str]:
+        etag = cls.__etag(version)
+        return {} if etag is None else {"ETag": etag}
+
+    @staticmethod
+    def __etag_matches(if_none_match: str, etag: str) -> bool:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match uses the weak comparison, a W/ prefix is ignored.
+        return "*" in tags or any(
+            tag[2:] == etag if tag.startswith("W/") else tag == etag
+            for tag in tags
+        )
+
+    @staticmethod
+    def __if_match_version(if_match: Optional[str]) -> Optional[int]:
+        """Return the version an If-Match header expects, if any."""
+        if if_match is None or if_match.strip() == "*":
+            return None
+        tag = if_match.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            return int(tag[1:-1])
+        raise HTTPException(
+            status_code=400,
+            detail=f"Error updating product: invalid If-Match {if_match}",
+        )
+
+    async def get_product_by_sku(
+        self, sku: str, if_none_match: Optional[str] = Header(None)
+    ) -> Response:
+        try:
+            if if_none_match is not None:
+                # Revalidation only needs the version, not the product.
+                etag = self.__etag(
+                    await self.__catalogue_service.get_product_version(sku=sku)
                 )
-            if product.category:
-                category = CategoryDTO(name=product.category.name)
-            return ProductResponseDTO(
-                id=product.id,
-                sku=product.sku,
-                name=product.name,
-                description=product.description,
-                image_url=product.image_url,
-                price=price,
-                inventory=inventory,
-                category=category,
+                if etag is not None and self.__etag_matches(
+                    if_none_match, etag
+                ):
+                    return Response(status_code=304, headers={"ETag": etag})
+            product = await self.__catalogue_service.get_product_by_sku(
+                sku=sku
+            )
+            return self.__json_response(
+                self.__to_document(product),
+                headers=self.__etag_header(product.version),
             )
         except InvalidSku as error:
             logger.error(error)
@@ -169,9 +297,140 @@ class HTTPApiAdapter:
                 status_code=500, detail=f"Error getting product: {error}"
             )
 
-    def update_product(
-        self, sku: str, product: ProductRequestDTO
-    ) -> ProductResponseDTO:
+    @staticmethod
+    def __encode_cursor(sku: str) -> str:
+        return base64.urlsafe_b64encode(sku.encode("utf8")).decode("ascii")
+
+    @staticmethod
+    def __decode_cursor(cursor: str) -> str:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf8")
+
+    async def list_products(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = Query(default=100, ge=1, le=config.PRODUCT_PAGE_MAX_SIZE),
+    ) -> Response:
+        try:
+            after_sku = None
+            if cursor:
+                after_sku = self.__decode_cursor(cursor)
+        except (binascii.Error, UnicodeError, ValueError) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Invalid cursor: {cursor}"
+            )
+        try:
+            products, last_sku = await self.__catalogue_service.list_products(
+                after_sku=after_sku, limit=limit
+            )
+            return self.__json_response(
+                {
+                    "products": [
+                        self.__to_document(product) for product in products
+                    ],
+                    "next_cursor": (
+                        self.__encode_cursor(last_sku) if last_sku else None
+                    ),
+                }
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error listing products: {error}"
+            )
+
+    async def export_products(self) -> StreamingResponse:
+        async def ndjson_lines() -> AsyncIterator[bytes]:
+            async for product in self.__catalogue_service.export_products():
+                yield dumps(self.__to_document(product)) + b"\n"
+
+        return StreamingResponse(
+            ndjson_lines(), media_type="application/x-ndjson"
+        )
+
+    async def get_products_by_skus(
+        self, sku: List[str] = Query(default=[])
+    ) -> Response:
+        return await self.__lookup_products(skus=sku)
+
+    async def lookup_products(
+        self, lookup: ProductLookupRequestDTO
+    ) -> Response:
+        return await self.__lookup_products(skus=lookup.skus)
+
+    async def __lookup_products(self, skus: List[str]) -> Response:
+        try:
+            products, missing = (
+                await self.__catalogue_service.get_products_by_skus(skus=skus)
+            )
+            return self.__json_response(
+                {
+                    "products": [
+                        self.__to_document(product) for product in products
+                    ],
+                    "missing": missing,
+                }
+            )
+        except (InvalidSku, TooManySkus) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error getting products: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error getting products: {error}"
+            )
+
+    @staticmethod
+    def __to_document(product: Product) -> Dict[str, Any]:
+        """Build the ProductResponseDTO shape as plain JSON types."""
+        price = None
+        inventory = None
+        category = None
+        if product.price:
+            price = {
+                "value": float(product.price.value),
+                "discount_percent": float(product.price.discount_percent),
+            }
+        if product.inventory:
+            inventory = {
+                "quantity": product.inventory.quantity,
+                "reserved": product.inventory.reserved,
+            }
+        if product.category:
+            category = {"name": product.category.name}
+        return {
+            "id": product.id,
+            "version": product.version,
+            "sku": product.sku,
+            "name": product.name,
+            "description": product.description,
+            "image_url": product.image_url,
+            "price": price,
+            "inventory": inventory,
+            "category": category,
+        }
+
+    @staticmethod
+    def __json_response(
+        document: Any, headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        # Already encoded, FastAPI sends the bytes without validating the
+        # response model again.
+        return Response(
+            content=dumps(document),
+            media_type="application/json",
+            headers=headers,
+        )
+
+    async def update_product(
+        self,
+        sku: str,
+        product: ProductRequestDTO,
+        if_match: Optional[str] = Header(None),
+    ) -> Response:
+        version = self.__if_match_version(if_match)
         try:
             inventory = None
             price = None
@@ -188,39 +447,21 @@ class HTTPApiAdapter:
                 )
             if product.category is not None:
                 category = Category(name=product.category.name)
-            updated_product: Product = self.__catalogue_service.update_product(
-                sku=sku,
-                name=product.name,
-                description=product.description,
-                image_url=product.image_url,
-                price=price,
-                inventory=inventory,
-                category=category,
-            )
-            inventory_dto = None
-            price_dto = None
-            category_dto = None
-            if updated_product.inventory:
-                inventory_dto = InventoryDTO(
-                    quantity=updated_product.inventory.quantity,
-                    reserved=updated_product.inventory.reserved,
-                )
-            if updated_product.price:
-                price_dto = PriceDTO(
-                    value=updated_product.price.value,
-                    discount_percent=updated_product.price.discount_percent,
+            updated_product: Product = (
+                await self.__catalogue_service.update_product(
+                    sku=sku,
+                    name=product.name,
+                    description=product.description,
+                    image_url=product.image_url,
+                    price=price,
+                    inventory=inventory,
+                    category=category,
+                    version=version,
                 )
-            if updated_product.category:
-                category_dto = CategoryDTO(name=updated_product.category.name)
-            return ProductResponseDTO(
-                id=updated_product.id,
-                name=updated_product.name,
-                description=updated_product.description,
-                image_url=updated_product.image_url,
-                inventory=inventory_dto,
-                price=price_dto,
-                category=category_dto,
-                sku=updated_product.sku,
+            )
+            return self.__json_response(
+                self.__to_document(updated_product),
+                headers=self.__etag_header(updated_product.version),
             )
         except (
             InvalidSku,
@@ -240,6 +481,67 @@ class HTTPApiAdapter:
             raise HTTPException(
                 status_code=404, detail=f"Error updating product: {error}"
             )
+        except OutdatedProduct as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=412 if version is not None else 409,
+                detail=f"Error updating product: {error}",
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error updating product: {error}"
+            )
+
+    async def patch_product(
+        self, sku: str, patch: ProductPatchRequestDTO
+    ) -> Response:
+        try:
+            # Only fields sent with a value are changed, nulls are ignored.
+            changes: Dict[str, Any] = patch.model_dump(
+                include={"name", "description", "image_url"},
+                exclude_unset=True,
+                exclude_none=True,
+            )
+            if patch.price is not None:
+                changes["price"] = Price(
+                    value=patch.price.value,
+                    discount_percent=patch.price.discount_percent,
+                )
+            if patch.inventory is not None:
+                # Only the inventory fields sent are changed, a quantity
+                # patch keeps the stored reservations.
+                inventory = patch.inventory.model_dump(
+                    exclude_unset=True, exclude_none=True
+                )
+                if inventory:
+                    changes["inventory"] = inventory
+            if patch.category is not None:
+                changes["category"] = Category(name=patch.category.name)
+            patched_product = await self.__catalogue_service.patch_product(
+                sku=sku, changes=changes, version=patch.version
+            )
+            return self.__json_response(
+                self.__to_document(patched_product),
+                headers=self.__etag_header(patched_product.version),
+            )
+        except (
+            InvalidSku,
+            InvalidPrice,
+            InvalidName,
+            InvalidInventory,
+            InvalidImageUrl,
+            InvalidDescription,
+        ) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error updating product: {error}"
+            )
+        except ProductNotFound as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=404, detail=f"Error updating product: {error}"
+            )
         except OutdatedProduct as error:
             logger.error(error)
             raise HTTPException(
@@ -251,9 +553,9 @@ class HTTPApiAdapter:
                 status_code=500, detail=f"Error updating product: {error}"
             )
 
-    def delete_product(self, sku: str) -> bool:
+    async def delete_product(self, sku: str) -> bool:
         try:
-            self.__catalogue_service.delete_product(sku)
+            await self.__catalogue_service.delete_product(sku)
             return True
         except InvalidSku as error:
             logger.error(error)
@@ -270,3 +572,115 @@ class HTTPApiAdapter:
             raise HTTPException(
                 status_code=500, detail=f"Error deleting product: {error}"
             )
+
+    async def reprice_category(
+        self, name: str, reprice: CategoryRepriceRequestDTO
+    ) -> Response:
+        try:
+            skus = await self.__catalogue_service.reprice_category(
+                category_name=name,
+                discount_percent=reprice.discount_percent,
+            )
+            return self.__json_response(
+                {
+                    "category": name,
+                    "discount_percent": reprice.discount_percent,
+                    "repriced": len(skus),
+                }
+            )
+        except (InvalidName, InvalidPrice) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error repricing category: {error}"
+            )
+        except CategoryNotFound as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=404, detail=f"Error repricing category: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error repricing category: {error}"
+            )
+
+    async def reserve_inventory(
+        self, adjustment: InventoryAdjustmentRequestDTO
+    ) -> Response:
+        return await self.__adjust_inventory(
+            InventoryOperation.RESERVE, adjustment
+        )
+
+    async def release_inventory(
+        self, adjustment: InventoryAdjustmentRequestDTO
+    ) -> Response:
+        return await self.__adjust_inventory(
+            InventoryOperation.RELEASE, adjustment
+        )
+
+    async def commit_inventory(
+        self, adjustment: InventoryAdjustmentRequestDTO
+    ) -> Response:
+        return await self.__adjust_inventory(
+            InventoryOperation.COMMIT, adjustment
+        )
+
+    async def __adjust_inventory(
+        self,
+        operation: InventoryOperation,
+        adjustment: InventoryAdjustmentRequestDTO,
+    ) -> Response:
+        try:
+            inventories = await self.__catalogue_service.adjust_inventory(
+                operation=operation,
+                items=[item.model_dump() for item in adjustment.items],
+            )
+            return self.__json_response(
+                {
+                    "items": [
+                        {
+                            "sku": sku,
+                            "quantity": inventory.quantity,
+                            "reserved": inventory.reserved,
+                        }
+                        for sku, inventory in inventories.items()
+                    ]
+                }
+            )
+        except (InvalidSku, InvalidInventory, TooManySkus) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error updating inventory: {error}"
+            )
+        except ProductNotFound as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=404, detail=f"Error updating inventory: {error}"
+            )
+        except InsufficientInventory as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=409, detail=f"Error updating inventory: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error updating inventory: {error}"
+            )
+
+
+class MetricsHTTPApiAdapter:
+    def __init__(
+        self, metrics_sources: Dict[str, Callable[[], Dict[str, Any]]]
+    ) -> None:
+        self.__metrics_sources = metrics_sources
+        self.router = APIRouter()
+        self.router.add_api_route(
+            "/metrics", self.get_metrics, methods=["GET"]
+        )
+
+    async def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: metrics_source()
+            for name, metrics_source in self.__metrics_sources.items()
+        }
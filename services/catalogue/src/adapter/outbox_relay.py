@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from src.domain.services import CatalogueService
+
+logger = logging.getLogger("app")
+
+
+class OutboxRelayAdapter:
+    """
+    Background task draining the product outbox to the event publisher.
+
+    Full batches are relayed back to back, the relay only sleeps for
+    ``poll_interval`` once the outbox is empty or after a failure.
+    """
+
+    def __init__(
+        self,
+        catalogue_service: CatalogueService,
+        batch_size: int,
+        poll_interval: float,
+    ) -> None:
+        self.__catalogue_service = catalogue_service
+        self.__batch_size = batch_size
+        self.__poll_interval = poll_interval
+        self.__task: Optional["asyncio.Task[None]"] = None
+        self.__relayed_rows = 0
+        self.__failed_batches = 0
+
+    def start(self) -> None:
+        self.__task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    async def relay_once(self) -> int:
+        try:
+            relayed_rows = await self.__catalogue_service.relay_product_events(
+                batch_size=self.__batch_size
+            )
+        except Exception as error:
+            logger.error(f"Error relaying product events: {error}")
+            self.__failed_batches += 1
+            return 0
+        self.__relayed_rows += relayed_rows
+        return relayed_rows
+
+    async def run(self) -> None:
+        while True:
+            relayed_rows = await self.relay_once()
+            if relayed_rows < self.__batch_size:
+                await asyncio.sleep(self.__poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "relayed_rows": self.__relayed_rows,
+            "failed_batches": self.__failed_batches,
+        }
@@ -1,25 +1,67 @@
+import asyncio
 import logging
+import time
+import uuid
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 from sqlalchemy import (
+    CTE,
     UUID,
+    BigInteger,
     Column,
-    Float,
+    ColumnElement,
+    DateTime,
     ForeignKey,
+    FromClause,
+    Identity,
+    Index,
+    Insert,
     Integer,
     MetaData,
+    Numeric,
+    Row,
+    Select,
     String,
     Table,
     Text,
-    create_engine,
+    any_,
+    bindparam,
+    column,
+    exists,
+    func,
     insert,
+    literal,
+    or_,
     select,
     update,
+    values,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 from src.adapter.exceptions import DatabaseException
 from src.config import get_config
 from src.domain.entities import Category, Product
+from src.domain.enums import (
+    InventoryOperation,
+    ProductEventType,
+    ProductImportStatus,
+)
+from src.domain.events import ProductEvent
 from src.domain.value_objects import Inventory, Price
 from src.port.repositories import ProductRepository
 
@@ -27,9 +69,58 @@ config = get_config()
 logger = logging.getLogger("app")
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started_at
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
 class ProductPostgresAdapter(ProductRepository):
-    def __init__(self, database_url) -> None:
-        self.__engine = create_engine(database_url)
+    def __init__(
+        self,
+        database_url,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        statement_timeout: Optional[int] = None,
+        read_model: bool = False,
+    ) -> None:
+        self.__read_model = read_model
+        connect_args = {}
+        if statement_timeout:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(statement_timeout)
+            }
+        self.__engine = create_async_engine(
+            self.async_url(database_url),
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            connect_args=connect_args,
+        )
         self._metadata = MetaData()
 
         self.__inventory_table = Table(
@@ -44,8 +135,8 @@ class ProductPostgresAdapter(ProductRepository):
             "Price",
             self._metadata,
             Column("id", UUID, primary_key=True),
-            Column("value", Float, nullable=False),
-            Column("discount_percent", Float, nullable=False),
+            Column("value", Numeric(12, 2), nullable=False),
+            Column("discount_percent", Numeric(5, 4), nullable=False),
         )
 
         self.__category_table = Table(
@@ -53,6 +144,7 @@ class ProductPostgresAdapter(ProductRepository):
             self._metadata,
             Column("id", UUID, primary_key=True),
             Column("name", String(255), nullable=False, unique=True),
+            Index("ix_Category_name_lower", func.lower(column("name"))),
         )
 
         self.__product_table = Table(
@@ -64,87 +156,425 @@ class ProductPostgresAdapter(ProductRepository):
             Column("name", String(255), nullable=False),
             Column("description", Text, nullable=False),
             Column("image_url", String(255), nullable=False),
-            Column("price_id", UUID, ForeignKey("Price.id")),
-            Column("inventory_id", UUID, ForeignKey("Inventory.id")),
-            Column("category_id", UUID, ForeignKey("Category.id")),
+            Column("price_id", UUID, ForeignKey("Price.id"), index=True),
+            Column(
+                "inventory_id", UUID, ForeignKey("Inventory.id"), index=True
+            ),
+            Column("category_id", UUID, ForeignKey("Category.id"), index=True),
+        )
+
+        self.__outbox_table = Table(
+            "ProductOutbox",
+            self._metadata,
+            Column("id", BigInteger, Identity(), primary_key=True),
+            Column("event_type", String(20), nullable=False),
+            Column("sku", String(50), nullable=False),
+            # Only kept for deleted events, the product row is gone when
+            # they are relayed.
+            Column("product_id", UUID),
+            Column("version", Integer),
+            Column(
+                "created_at",
+                DateTime(timezone=True),
+                nullable=False,
+                server_default=func.now(),
+            ),
+        )
+
+        self.__product_read_table = Table(
+            "ProductRead",
+            self._metadata,
+            Column("sku", String(50), primary_key=True),
+            Column("product_id", UUID, nullable=False),
+            Column("version", Integer, nullable=False),
+            Column("name", String(255), nullable=False),
+            Column("description", Text, nullable=False),
+            Column("image_url", String(255), nullable=False),
+            Column("price_id", UUID),
+            Column("inventory_id", UUID),
+            Column("category_id", UUID),
+            Column("price_value", Numeric(12, 2)),
+            Column("price_discount_percent", Numeric(5, 4)),
+            Column("inventory_quantity", Integer),
+            Column("inventory_reserved", Integer),
+            Column("category_name", String(255)),
+        )
+
+        self.__session = async_sessionmaker(
+            bind=self.__engine, expire_on_commit=False
         )
+        self.__category_ids: Dict[str, uuid.UUID] = {}
 
-        self.__session = sessionmaker(autocommit=False, bind=self.__engine)
+    @staticmethod
+    def async_url(database_url: str) -> str:
+        """Point plain ``postgresql://`` urls to the asyncpg driver."""
+        if database_url and database_url.startswith("postgresql://"):
+            return database_url.replace(
+                "postgresql://", "postgresql+asyncpg://", 1
+            )
+        return database_url
 
     @property
     def metadata(self) -> MetaData:
         return self._metadata
 
-    def create_product(
-        self,
-        product: Product,
-        on_duplicate_sku: Exception,
-        on_not_found: Exception,
-    ) -> Product:
+    def pool_status(self) -> Dict[str, Any]:
+        # The engine is always created with this pool class.
+        pool = cast(InstrumentedQueuePool, self.__engine.pool)
+        checkouts = pool.checkouts
+        wait_seconds_total = pool.wait_seconds_total
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkouts": checkouts,
+            "checkout_timeouts": pool.checkout_timeouts,
+            "wait_seconds_total": wait_seconds_total,
+            "wait_seconds_avg": (
+                wait_seconds_total / checkouts if checkouts else 0.0
+            ),
+            "wait_seconds_max": pool.wait_seconds_max,
+        }
+
+    async def dispose(self) -> None:
+        await self.__engine.dispose()
+
+    async def warm_category_cache(self) -> int:
+        """Load every category name and id into the in-process map."""
         session = self.__session()
         try:
-            session.begin()
-            price_id = None
-            inventory_id = None
-            category_id = None
-            if product.price:
-                insert_price = insert(self.__price_table).values(
+            rows = (
+                await session.execute(
+                    select(
+                        self.__category_table.c.id,
+                        self.__category_table.c.name,
+                    )
+                )
+            ).fetchall()
+            self.__category_ids = {row.name: row.id for row in rows}
+            return len(rows)
+        finally:
+            await session.close()
+
+    async def sync_read_model(self) -> int:
+        """
+        Bring ProductRead up to date with the normalized tables.
+
+        Writes only maintain ProductRead while the read model is enabled,
+        so the rows of products changed while it was off are refreshed,
+        going by their id and version, and the rows of deleted products
+        removed. Returns how many rows were refreshed.
+        """
+        product = self.__product_table
+        read = self.__product_read_table
+        session = self.__session()
+        try:
+            await session.execute(
+                read.delete().where(
+                    ~exists().where(product.c.sku == read.c.sku)
+                )
+            )
+            outdated = (
+                self.__select_products()
+                .where(
+                    ~exists().where(
+                        read.c.sku == product.c.sku,
+                        read.c.product_id == product.c.id,
+                        read.c.version == product.c.version,
+                    )
+                )
+                .order_by(product.c.sku)
+            )
+            result = await session.execute(self.__upsert_read_model(outdated))
+            await session.commit()
+            return result.rowcount
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def __category_ids_for(
+        self, categories: List[Category]
+    ) -> Dict[str, uuid.UUID]:
+        """
+        Map category names to ids, upserting the names not cached yet.
+
+        Misses are upserted in their own committed transaction, so the
+        map never holds the id of a category rolled back with a failed
+        product write. Concurrent upserts of the same name return the
+        same id.
+        """
+        missing = {
+            category.name: category
+            for category in categories
+            if category.name not in self.__category_ids
+        }
+        if missing:
+            upsert_categories = postgresql_insert(
+                self.__category_table
+            ).values(
+                [
+                    {"id": category.id, "name": category.name}
+                    for category in missing.values()
+                ]
+            )
+            upsert_categories = upsert_categories.on_conflict_do_update(
+                index_elements=[self.__category_table.c.name],
+                set_={"name": upsert_categories.excluded.name},
+            ).returning(
+                self.__category_table.c.id, self.__category_table.c.name
+            )
+            session = self.__session()
+            try:
+                rows = (await session.execute(upsert_categories)).fetchall()
+                await session.commit()
+            finally:
+                await session.close()
+            for row in rows:
+                self.__category_ids[row.name] = row.id
+        return {
+            category.name: self.__category_ids[category.name]
+            for category in categories
+        }
+
+    def __product_columns(
+        self,
+        product: FromClause,
+        price: FromClause,
+        inventory: FromClause,
+        category: FromClause,
+    ) -> Tuple[ColumnElement[Any], ...]:
+        return (
+            product.c.id.label("product_id"),
+            product.c.version.label("product_version"),
+            product.c.sku.label("product_sku"),
+            product.c.name.label("product_name"),
+            product.c.description.label("product_description"),
+            product.c.image_url.label("product_image_url"),
+            product.c.price_id,
+            product.c.inventory_id,
+            product.c.category_id,
+            price.c.value.label("price_value"),
+            price.c.discount_percent.label("price_discount_percent"),
+            inventory.c.quantity.label("inventory_quantity"),
+            inventory.c.reserved.label("inventory_reserved"),
+            category.c.name.label("category_name"),
+        )
+
+    @staticmethod
+    def __row_to_product(row: Row[Any]) -> Product:
+        inventory = None
+        if row.inventory_id is not None:
+            inventory = Inventory(
+                id=row.inventory_id,
+                quantity=row.inventory_quantity,
+                reserved=row.inventory_reserved,
+            )
+        price = None
+        if row.price_id is not None:
+            price = Price(
+                id=row.price_id,
+                value=row.price_value,
+                discount_percent=row.price_discount_percent,
+            )
+        category = None
+        if row.category_id is not None:
+            category = Category(id=row.category_id, name=row.category_name)
+        return Product(
+            id=row.product_id,
+            version=row.product_version,
+            sku=row.product_sku,
+            name=row.product_name,
+            description=row.product_description,
+            image_url=row.product_image_url,
+            price=price,
+            inventory=inventory,
+            category=category,
+        )
+
+    def __select_joined_products(
+        self,
+        product: FromClause,
+        price: FromClause,
+        inventory: FromClause,
+        category: FromClause,
+    ) -> Select[Any]:
+        return select(
+            *self.__product_columns(product, price, inventory, category)
+        ).select_from(
+            product.outerjoin(price, product.c.price_id == price.c.id)
+            .outerjoin(inventory, product.c.inventory_id == inventory.c.id)
+            .outerjoin(category, product.c.category_id == category.c.id)
+        )
+
+    def __select_products(self) -> Select[Any]:
+        return self.__select_joined_products(
+            self.__product_table,
+            self.__price_table,
+            self.__inventory_table,
+            self.__category_table,
+        )
+
+    def __select_read_products(self) -> Select[Any]:
+        read = self.__product_read_table
+        return select(
+            read.c.product_id,
+            read.c.version.label("product_version"),
+            read.c.sku.label("product_sku"),
+            read.c.name.label("product_name"),
+            read.c.description.label("product_description"),
+            read.c.image_url.label("product_image_url"),
+            read.c.price_id,
+            read.c.inventory_id,
+            read.c.category_id,
+            read.c.price_value,
+            read.c.price_discount_percent,
+            read.c.inventory_quantity,
+            read.c.inventory_reserved,
+            read.c.category_name,
+        )
+
+    def __product_source(self) -> Tuple[Select[Any], ColumnElement[str]]:
+        """
+        Return the select used by product reads and its sku column.
+
+        Reads come from the ProductRead table when the read model is
+        enabled and from the four table join otherwise.
+        """
+        if self.__read_model:
+            return (
+                self.__select_read_products(),
+                self.__product_read_table.c.sku,
+            )
+        return self.__select_products(), self.__product_table.c.sku
+
+    def __sku_in(
+        self,
+        skus: List[str],
+        sku_column: Optional[ColumnElement[str]] = None,
+    ) -> ColumnElement[bool]:
+        if sku_column is None:
+            sku_column = self.__product_table.c.sku
+        return sku_column == any_(bindparam("skus", skus, type_=ARRAY(String)))
+
+    def __upsert_read_model(self, products: Select[Any]) -> Insert:
+        """
+        Upsert ProductRead rows from ``products``, a select with the
+        columns of ``__select_products``.
+
+        Writes only run it while the read model is enabled, as part of
+        their transaction so the read model commits or rolls back together
+        with the change. A row is never overwritten by an older version of
+        the same product.
+        """
+        read = self.__product_read_table
+        refresh = postgresql_insert(read).from_select(
+            [
+                "product_id",
+                "version",
+                "sku",
+                "name",
+                "description",
+                "image_url",
+                "price_id",
+                "inventory_id",
+                "category_id",
+                "price_value",
+                "price_discount_percent",
+                "inventory_quantity",
+                "inventory_reserved",
+                "category_name",
+            ],
+            products,
+        )
+        return refresh.on_conflict_do_update(
+            index_elements=[read.c.sku],
+            set_={
+                column.name: refresh.excluded[column.name]
+                for column in read.c
+                if column.name != "sku"
+            },
+            where=or_(
+                read.c.product_id != refresh.excluded.product_id,
+                read.c.version <= refresh.excluded.version,
+            ),
+        )
+
+    def __refresh_read_model_statement(self, skus: List[str]) -> Insert:
+        return self.__upsert_read_model(
+            self.__select_products().where(self.__sku_in(skus))
+        )
+
+    def __outbox_statement(
+        self, products: FromClause, event_type: ProductEventType
+    ) -> CTE:
+        return (
+            insert(self.__outbox_table)
+            .from_select(
+                ["event_type", "sku"],
+                select(literal(event_type.string), products.c.sku),
+            )
+            .cte("product_outbox")
+        )
+
+    def __create_product_statement(
+        self, product: Product, category_id: Optional[uuid.UUID]
+    ) -> Select[Any]:
+        """
+        Build a single statement inserting the whole product aggregate.
+
+        Price and Inventory are inserted through data-modifying CTEs and
+        the Product row references their RETURNING ids and the already
+        resolved ``category_id``. The outbox row, and the ProductRead row
+        when the read model is enabled, are written by the same
+        statement. The outer select joins the returned rows so the
+        created product can be built without querying it again.
+        """
+        price_id = None
+        inventory_id = None
+        price = self.__price_table
+        inventory = self.__inventory_table
+        category = self.__category_table
+
+        if product.price:
+            price = (
+                insert(self.__price_table)
+                .values(
                     id=product.price.id,
                     value=product.price.value,
                     discount_percent=product.price.discount_percent,
                 )
-                price_result = session.execute(insert_price)
-                if not hasattr(price_result, "inserted_primary_key"):
-                    raise DatabaseException(
-                        {
-                            "code": "database.error.insert",
-                            "message": "Error inserting price",
-                        }
-                    )
-                price_id = price_result.inserted_primary_key[0]
+                .returning(
+                    self.__price_table.c.id,
+                    self.__price_table.c.value,
+                    self.__price_table.c.discount_percent,
+                )
+                .cte("inserted_price")
+            )
+            price_id = select(price.c.id).scalar_subquery()
 
-            if product.inventory:
-                insert_inventory = insert(self.__inventory_table).values(
+        if product.inventory:
+            inventory = (
+                insert(self.__inventory_table)
+                .values(
                     id=product.inventory.id,
                     quantity=product.inventory.quantity,
                     reserved=product.inventory.reserved,
                 )
-                inventory_result = session.execute(insert_inventory)
-                if not hasattr(inventory_result, "inserted_primary_key"):
-                    raise DatabaseException(
-                        {
-                            "code": "database.error.insert",
-                            "message": "Error inserting inventory",
-                        }
-                    )
-                inventory_id = inventory_result.inserted_primary_key[0]
-
-            if product.category:
-                get_category = select(self.__category_table.c.id).where(
-                    self.__category_table.c.name == product.category.name
-                )
-                category_id = None
-                category_result = session.execute(get_category).fetchone()
-                if category_result:
-                    category_id = category_result[0]
-                if category_id is None:
-                    insert_category = insert(self.__category_table).values(
-                        id=product.category.id, name=product.category.name
-                    )
-                    category_result_row = session.execute(insert_category)
-                    if not hasattr(
-                        category_result_row, "inserted_primary_key"
-                    ):
-                        raise DatabaseException(
-                            {
-                                "code": "database.error.insert",
-                                "message": "Error inserting category",
-                            }
-                        )
-                    category_id = category_result_row.inserted_primary_key[0]
+                .returning(
+                    self.__inventory_table.c.id,
+                    self.__inventory_table.c.quantity,
+                    self.__inventory_table.c.reserved,
+                )
+                .cte("inserted_inventory")
+            )
+            inventory_id = select(inventory.c.id).scalar_subquery()
 
-            logger.info("Inserting")
-            insert_product = insert(self.__product_table).values(
+        inserted_product = (
+            insert(self.__product_table)
+            .values(
                 id=product.id,
                 version=0,
                 sku=product.sku,
@@ -155,19 +585,60 @@ class ProductPostgresAdapter(ProductRepository):
                 inventory_id=inventory_id,
                 category_id=category_id,
             )
-            session.execute(insert_product)
-            session.commit()
-            logger.info(f"Product sku {product.sku} created")
-            return self.get_product_by_sku(
-                product.sku, on_not_found=on_not_found
+            .returning(*self.__product_table.c)
+            .cte("inserted_product")
+        )
+
+        created_product = self.__select_joined_products(
+            inserted_product, price, inventory, category
+        )
+        statement = created_product.add_cte(
+            self.__outbox_statement(inserted_product, ProductEventType.CREATED)
+        )
+        if self.__read_model:
+            statement = statement.add_cte(
+                self.__upsert_read_model(created_product).cte("created_read")
             )
+        return statement
+
+    async def create_product(
+        self,
+        product: Product,
+        on_duplicate_sku: Exception,
+        on_not_found: Exception,
+    ) -> Product:
+        session = self.__session()
+        try:
+            logger.info("Inserting")
+            category_id = None
+            if product.category:
+                category_ids = await self.__category_ids_for(
+                    [product.category]
+                )
+                category_id = category_ids[product.category.name]
+            result = (
+                await session.execute(
+                    self.__create_product_statement(product, category_id)
+                )
+            ).fetchone()
+            if result is None:
+                raise DatabaseException(
+                    {
+                        "code": "database.error.insert",
+                        "message": "Error inserting product",
+                    }
+                )
+            created_product = self.__row_to_product(result)
+            await session.commit()
+            logger.info(f"Product sku {product.sku} created")
+            return created_product
         except IntegrityError as error:
             logger.error(error)
-            session.rollback()
+            await session.rollback()
             raise on_duplicate_sku
         except Exception as error:
             logger.error(error)
-            session.rollback()
+            await session.rollback()
             if type(error) is type(on_duplicate_sku):
                 raise
             raise DatabaseException(
@@ -177,87 +648,229 @@ class ProductPostgresAdapter(ProductRepository):
                 }
             )
         finally:
-            session.close()
-
-    def get_product_by_sku(self, sku: str, on_not_found: Exception) -> Product:
-        query = (
-            select(
-                self.__product_table.c.id.label("product_id"),
-                self.__product_table.c.version.label("product_version"),
-                self.__product_table.c.sku.label("product_sku"),
-                self.__product_table.c.name.label("product_name"),
-                self.__product_table.c.description.label(
-                    "product_description"
-                ),
-                self.__product_table.c.image_url.label("product_image_url"),
-                self.__product_table.c.price_id,
-                self.__product_table.c.inventory_id,
-                self.__product_table.c.category_id,
-                self.__price_table.c.value.label("price_value"),
-                self.__price_table.c.discount_percent.label(
-                    "price_discount_percent"
-                ),
-                self.__inventory_table.c.quantity.label("inventory_quantity"),
-                self.__inventory_table.c.reserved.label("inventory_reserved"),
-                self.__category_table.c.name.label("category_name"),
+            await session.close()
+
+    async def create_products(
+        self, products: List[Product], batch_size: int
+    ) -> List[ProductImportStatus]:
+        statuses: List[ProductImportStatus] = []
+        for start in range(0, len(products), batch_size):
+            batch = products[start : start + batch_size]
+            statuses.extend(await self.__create_products_batch(batch))
+        return statuses
+
+    async def __create_products_batch(
+        self, products: List[Product]
+    ) -> List[ProductImportStatus]:
+        """
+        Insert a batch of products inside a single transaction.
+
+        Each table receives one multi-row insert. Products whose SKU
+        already exists, either in the database or earlier in the batch,
+        are reported as duplicates instead of failing the whole batch.
+        """
+        statuses = [ProductImportStatus.DUPLICATE] * len(products)
+        session = self.__session()
+        try:
+            existing_skus = {
+                row[0]
+                for row in await session.execute(
+                    select(self.__product_table.c.sku).where(
+                        self.__product_table.c.sku.in_(
+                            [product.sku for product in products]
+                        )
+                    )
+                )
+            }
+            pending: Dict[str, int] = {}
+            for index, product in enumerate(products):
+                if product.sku in existing_skus or product.sku in pending:
+                    continue
+                pending[product.sku] = index
+            if not pending:
+                await session.commit()
+                return statuses
+
+            new_products = [products[index] for index in pending.values()]
+
+            category_ids: Dict[str, Any] = {}
+            categories: Dict[str, Category] = {}
+            for product in new_products:
+                if product.category:
+                    categories.setdefault(
+                        product.category.name, product.category
+                    )
+            if categories:
+                category_ids = await self.__category_ids_for(
+                    list(categories.values())
+                )
+
+            prices = [
+                {
+                    "id": product.price.id,
+                    "value": product.price.value,
+                    "discount_percent": product.price.discount_percent,
+                }
+                for product in new_products
+                if product.price
+            ]
+            if prices:
+                await session.execute(insert(self.__price_table), prices)
+
+            inventories = [
+                {
+                    "id": product.inventory.id,
+                    "quantity": product.inventory.quantity,
+                    "reserved": product.inventory.reserved,
+                }
+                for product in new_products
+                if product.inventory
+            ]
+            if inventories:
+                await session.execute(
+                    insert(self.__inventory_table), inventories
+                )
+
+            insert_products = (
+                postgresql_insert(self.__product_table)
+                .values(
+                    [
+                        {
+                            "id": product.id,
+                            "version": 0,
+                            "sku": product.sku,
+                            "name": product.name,
+                            "description": product.description,
+                            "image_url": product.image_url,
+                            "price_id": (
+                                product.price.id if product.price else None
+                            ),
+                            "inventory_id": (
+                                product.inventory.id
+                                if product.inventory
+                                else None
+                            ),
+                            "category_id": (
+                                category_ids[product.category.name]
+                                if product.category
+                                else None
+                            ),
+                        }
+                        for product in new_products
+                    ]
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[self.__product_table.c.sku]
+                )
+                .returning(*self.__product_table.c)
+                .cte("inserted_products")
             )
-            .select_from(
-                self.__product_table.outerjoin(
-                    self.__price_table,
-                    self.__product_table.c.price_id == self.__price_table.c.id,
+            insert_statement = select(insert_products.c.sku).add_cte(
+                self.__outbox_statement(
+                    insert_products, ProductEventType.CREATED
                 )
-                .outerjoin(
-                    self.__inventory_table,
-                    self.__product_table.c.inventory_id
-                    == self.__inventory_table.c.id,
+            )
+            if self.__read_model:
+                # Price and Inventory rows were inserted by the earlier
+                # statements, only the products come from the CTE.
+                insert_statement = insert_statement.add_cte(
+                    self.__upsert_read_model(
+                        self.__select_joined_products(
+                            insert_products,
+                            self.__price_table,
+                            self.__inventory_table,
+                            self.__category_table,
+                        )
+                    ).cte("inserted_read")
                 )
-                .outerjoin(
-                    self.__category_table,
-                    self.__product_table.c.category_id
-                    == self.__category_table.c.id,
+            inserted_skus = {
+                row[0] for row in await session.execute(insert_statement)
+            }
+
+            # SKUs inserted concurrently by another transaction leave their
+            # price and inventory rows orphaned, so remove them here.
+            conflicted = [
+                product
+                for product in new_products
+                if product.sku not in inserted_skus
+            ]
+            orphan_price_ids = [
+                product.price.id for product in conflicted if product.price
+            ]
+            if orphan_price_ids:
+                await session.execute(
+                    self.__price_table.delete().where(
+                        self.__price_table.c.id.in_(orphan_price_ids)
+                    )
+                )
+            orphan_inventory_ids = [
+                product.inventory.id
+                for product in conflicted
+                if product.inventory
+            ]
+            if orphan_inventory_ids:
+                await session.execute(
+                    self.__inventory_table.delete().where(
+                        self.__inventory_table.c.id.in_(orphan_inventory_ids)
+                    )
                 )
+
+            await session.commit()
+            for sku in inserted_skus:
+                statuses[pending[sku]] = ProductImportStatus.CREATED
+            logger.info(
+                f"{len(inserted_skus)} of {len(products)} products created"
             )
-            .where(self.__product_table.c.sku == sku)
-        )
+            return statuses
+        except Exception as error:
+            logger.error(f"Error inserting products batch: {error}")
+            await session.rollback()
+            return [ProductImportStatus.FAILED] * len(products)
+        finally:
+            await session.close()
+
+    async def get_product_version(
+        self, sku: str, on_not_found: Exception
+    ) -> int:
+        """Read only the version of a product, without the joins."""
+        session = self.__session()
+        try:
+            result = (
+                await session.execute(
+                    select(self.__product_table.c.version).where(
+                        self.__product_table.c.sku == sku
+                    )
+                )
+            ).fetchone()
+            if result is None:
+                raise on_not_found
+            return cast(int, result[0])
+        except Exception as error:
+            logger.error(error)
+            if type(error) is type(on_not_found):
+                raise
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error reading product version: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def get_product_by_sku(
+        self, sku: str, on_not_found: Exception
+    ) -> Product:
+        query, sku_column = self.__product_source()
+        query = query.where(sku_column == sku)
         session = self.__session()
         try:
-            session.begin()
-            result = session.execute(query).fetchone()
+            result = (await session.execute(query)).fetchone()
             if result is None:
                 logger.error(f"Product not found for {sku}")
                 raise on_not_found
 
-            inventory = None
-            if hasattr(result, "inventory_id"):
-                inventory = Inventory(
-                    id=result.inventory_id,
-                    quantity=result.inventory_quantity,
-                    reserved=result.inventory_reserved,
-                )
-            price = None
-            if hasattr(result, "price_id"):
-                price = Price(
-                    id=result.price_id,
-                    value=result.price_value,
-                    discount_percent=result.price_discount_percent,
-                )
-            category = None
-            if hasattr(result, "category_id"):
-                category = Category(
-                    id=result.category_id, name=result.category_name
-                )
-            product = Product(
-                id=result.product_id,
-                version=result.product_version,
-                sku=result.product_sku,
-                name=result.product_name,
-                description=result.product_description,
-                image_url=result.product_image_url,
-                price=price,
-                inventory=inventory,
-                category=category,
-            )
-            return product
+            return self.__row_to_product(result)
 
         except NoResultFound as error:
             logger.error(error)
@@ -273,8 +886,71 @@ class ProductPostgresAdapter(ProductRepository):
                     "message": f"Error searching product by sku :{error}",
                 }
             )
+        finally:
+            await session.close()
+
+    async def get_products_by_skus(self, skus: List[str]) -> List[Product]:
+        query, sku_column = self.__product_source()
+        query = query.where(self.__sku_in(skus, sku_column))
+        session = self.__session()
+        try:
+            result = await session.execute(query)
+            return [self.__row_to_product(row) for row in result]
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error searching products by skus: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def list_products(
+        self, after_sku: Optional[str], limit: int
+    ) -> List[Product]:
+        query, sku_column = self.__product_source()
+        query = query.order_by(sku_column).limit(limit)
+        if after_sku is not None:
+            query = query.where(sku_column > after_sku)
+        session = self.__session()
+        try:
+            result = await session.execute(query)
+            return [self.__row_to_product(row) for row in result]
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error listing products: {error}",
+                }
+            )
+        finally:
+            await session.close()
 
-    def update_product(
+    async def stream_products(self, batch_size: int) -> AsyncIterator[Product]:
+        query, sku_column = self.__product_source()
+        query = query.order_by(sku_column).execution_options(
+            yield_per=batch_size
+        )
+        session = self.__session()
+        try:
+            result = await session.stream(query)
+            async for row in result:
+                yield self.__row_to_product(row)
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error streaming products: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def update_product(
         self,
         product: Product,
         on_not_found: Exception,
@@ -283,36 +959,48 @@ class ProductPostgresAdapter(ProductRepository):
     ) -> Product:
         session = self.__session()
         try:
-            session.begin()
-            query = select(self.__product_table.c.version).where(
-                self.__product_table.c.sku == product.sku
-            )
-            result = session.execute(query).fetchone()
-
-            if result is None:
-                raise on_not_found
-            version = result[0]
-            new_version = version + 1
+            product_values = {}
+            if product.category:
+                category_ids = await self.__category_ids_for(
+                    [product.category]
+                )
+                product_values["category_id"] = category_ids[
+                    product.category.name
+                ]
 
+            conditions = [self.__product_table.c.sku == product.sku]
+            if product.version is not None:
+                # The version the caller last read, a concurrent update
+                # makes this one miss instead of overwriting it.
+                conditions.append(
+                    self.__product_table.c.version == product.version
+                )
             update_product_query = (
                 update(self.__product_table)
-                .where(
-                    self.__product_table.c.sku == product.sku,
-                    self.__product_table.c.version == version,
-                )
+                .where(*conditions)
                 .values(
                     name=product.name,
                     description=product.description,
                     image_url=product.image_url,
-                    version=new_version,
+                    version=self.__product_table.c.version + 1,
+                    **product_values,
                 )
             )
-            product_result = session.execute(update_product_query)
+            product_result = await session.execute(update_product_query)
 
             if (
                 hasattr(product_result, "rowcount")
                 and product_result.rowcount == 0
             ):
+                found = (
+                    await session.execute(
+                        select(self.__product_table.c.version).where(
+                            self.__product_table.c.sku == product.sku
+                        )
+                    )
+                ).fetchone()
+                if found is None:
+                    raise on_not_found
                 raise on_outdated_version
 
             if product.price:
@@ -329,7 +1017,7 @@ class ProductPostgresAdapter(ProductRepository):
                         discount_percent=product.price.discount_percent,
                     )
                 )
-                session.execute(price_update_query)
+                await session.execute(price_update_query)
 
             if product.inventory:
                 inventory_update_query = (
@@ -345,31 +1033,23 @@ class ProductPostgresAdapter(ProductRepository):
                         reserved=product.inventory.reserved,
                     )
                 )
-                session.execute(inventory_update_query)
-            if product.category:
-                get_category = select(self.__category_table.c.id).where(
-                    self.__category_table.c.name == product.category.name
-                )
-                category_id = None
-                category_result = session.execute(get_category).fetchone()
-                if category_result:
-                    category_id = category_result[0]
-                if category_id is None:
-                    insert_category = insert(self.__category_table).values(
-                        id=product.category.id, name=product.category.name
-                    )
-                    category_result_row = session.execute(insert_category)
-                    if not hasattr(
-                        category_result_row, "inserted_primary_key"
-                    ):
-                        raise on_not_found
-                    category_id = category_result_row.inserted_primary_key[0]
-            session.commit()
-            return self.get_product_by_sku(
+                await session.execute(inventory_update_query)
+            await session.execute(
+                insert(self.__outbox_table).values(
+                    event_type=ProductEventType.UPDATED.string,
+                    sku=product.sku,
+                )
+            )
+            if self.__read_model:
+                await session.execute(
+                    self.__refresh_read_model_statement([product.sku])
+                )
+            await session.commit()
+            return await self.get_product_by_sku(
                 sku=product.sku, on_not_found=on_not_found
             )
         except IntegrityError as error:
-            session.rollback()
+            await session.rollback()
             error_orig = error.orig
             if not error_orig:
                 raise
@@ -380,7 +1060,7 @@ class ProductPostgresAdapter(ProductRepository):
             logger.error(f"SQL Error code: {error_orig.args[0]}")
             raise
         except Exception as error:
-            session.rollback()
+            await session.rollback()
             if (
                 type(error) is type(on_not_found)
                 or type(error) is type(on_outdated_version)
@@ -394,46 +1074,255 @@ class ProductPostgresAdapter(ProductRepository):
                 }
             )
         finally:
-            session.close()
+            await session.close()
+
+    def __patch_product_statement(
+        self,
+        sku: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int],
+        category_id: Optional[uuid.UUID],
+    ) -> Select[Any]:
+        """
+        Build a single statement applying a partial product update.
+
+        Only the Product row and the child rows present in ``changes``
+        are written, a missing Price or Inventory row is created. The
+        inventory change only holds the fields sent and an inventory
+        ending with more reserved than quantity is not written, leaving
+        its columns empty in the returned row. A category change points
+        the product at ``category_id``. The
+        version check sits in the WHERE clause and the statement also
+        records the outbox event. The patched product is returned from
+        the rows the statement wrote, joined with the untouched ones, and
+        upserted into ProductRead when the read model is enabled.
+        """
+        product = self.__product_table
+        price_source: FromClause = self.__price_table
+        inventory_source: FromClause = self.__inventory_table
+        product_values: Dict[str, Any] = {"version": product.c.version + 1}
+        ctes = []
+        for field in ("name", "description", "image_url"):
+            if field in changes:
+                product_values[field] = changes[field]
+
+        if changes.get("category") is not None:
+            product_values["category_id"] = category_id
+
+        price = changes.get("price")
+        if price is not None:
+            product_values["price_id"] = func.coalesce(
+                product.c.price_id, price.id
+            )
+        inventory = changes.get("inventory")
+        # A missing row is created with the fields not sent at zero.
+        quantity = reserved = 0
+        if inventory is not None:
+            quantity = inventory.get("quantity", 0)
+            reserved = inventory.get("reserved", 0)
+        if inventory is not None and reserved <= quantity:
+            # Otherwise no row is created, the product keeps no inventory.
+            product_values["inventory_id"] = func.coalesce(
+                product.c.inventory_id, uuid.uuid4()
+            )
+
+        conditions = [product.c.sku == sku]
+        if expected_version is not None:
+            conditions.append(product.c.version == expected_version)
+        updated_product = (
+            update(product)
+            .where(*conditions)
+            .values(**product_values)
+            .returning(*product.c)
+            .cte("updated_product")
+        )
+
+        if price is not None:
+            upserted_price = postgresql_insert(self.__price_table).from_select(
+                ["id", "value", "discount_percent"],
+                select(
+                    updated_product.c.price_id,
+                    literal(price.value),
+                    literal(price.discount_percent),
+                ),
+            )
+            price_source = (
+                upserted_price.on_conflict_do_update(
+                    index_elements=[self.__price_table.c.id],
+                    set_={
+                        "value": upserted_price.excluded.value,
+                        "discount_percent": (
+                            upserted_price.excluded.discount_percent
+                        ),
+                    },
+                )
+                .returning(*self.__price_table.c)
+                .cte("upserted_price")
+            )
+            ctes.append(price_source)
+        if inventory is not None:
+            stored = self.__inventory_table
+            new_inventory = select(
+                updated_product.c.inventory_id,
+                literal(quantity),
+                literal(reserved),
+            )
+            if reserved > quantity:
+                # Only valid against a stored quantity, never for a new row.
+                new_inventory = new_inventory.where(
+                    exists().where(
+                        stored.c.id == updated_product.c.inventory_id
+                    )
+                )
+            upserted_inventory = postgresql_insert(stored).from_select(
+                ["id", "quantity", "reserved"], new_inventory
+            )
+            # Only the fields sent are set, checked against the stored
+            # values of the others under the row lock, so a quantity
+            # patch keeps concurrent reservations.
+            patched = {
+                field: upserted_inventory.excluded[field]
+                for field in inventory
+            }
+            inventory_source = (
+                upserted_inventory.on_conflict_do_update(
+                    index_elements=[stored.c.id],
+                    set_=patched,
+                    where=patched.get("quantity", stored.c.quantity)
+                    >= patched.get("reserved", stored.c.reserved),
+                )
+                .returning(*self.__inventory_table.c)
+                .cte("upserted_inventory")
+            )
+            ctes.append(inventory_source)
+
+        # The other CTEs cannot see the rows written in this statement,
+        # so the changed children come from their RETURNING clauses.
+        patched_product = self.__select_joined_products(
+            updated_product,
+            price_source,
+            inventory_source,
+            self.__category_table,
+        )
+        statement = patched_product.add_cte(
+            self.__outbox_statement(updated_product, ProductEventType.UPDATED)
+        )
+        if self.__read_model:
+            ctes.append(
+                self.__upsert_read_model(patched_product).cte("patched_read")
+            )
+        for cte in ctes:
+            statement = statement.add_cte(cte)
+        return statement
+
+    async def patch_product(
+        self,
+        sku: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int],
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        on_invalid_inventory: Exception,
+    ) -> Product:
+        session = self.__session()
+        try:
+            category_id = None
+            if changes.get("category") is not None:
+                category = changes["category"]
+                category_ids = await self.__category_ids_for([category])
+                category_id = category_ids[category.name]
+            row = (
+                await session.execute(
+                    self.__patch_product_statement(
+                        sku, changes, expected_version, category_id
+                    )
+                )
+            ).fetchone()
+            if row is None:
+                await session.rollback()
+                found = (
+                    await session.execute(
+                        select(self.__product_table.c.version).where(
+                            self.__product_table.c.sku == sku
+                        )
+                    )
+                ).fetchone()
+                if found is None:
+                    raise on_not_found
+                raise on_outdated_version
+            if "inventory" in changes and row.inventory_quantity is None:
+                raise on_invalid_inventory
+            await session.commit()
+            return self.__row_to_product(row)
+        except Exception as error:
+            await session.rollback()
+            if (
+                type(error) is type(on_not_found)
+                or type(error) is type(on_outdated_version)
+                or type(error) is type(on_invalid_inventory)
+            ):
+                raise
+            raise DatabaseException(
+                {
+                    "code": "database.error.update",
+                    "message": f"Error updating the product: {error}",
+                }
+            )
+        finally:
+            await session.close()
 
-    def delete_product(self, sku, on_not_found: Exception) -> bool:
+    async def delete_product(self, sku, on_not_found: Exception) -> bool:
         session = self.__session()
         try:
-            session.begin()
             query = select(
                 self.__product_table.c.id,
+                self.__product_table.c.version,
                 self.__product_table.c.inventory_id,
                 self.__product_table.c.price_id,
                 self.__product_table.c.category_id,
             ).where(self.__product_table.c.sku == sku)
-            result = session.execute(query).fetchone()
+            result = (await session.execute(query)).fetchone()
             if result is None:
                 raise on_not_found
 
-            product_id, inventory_id, price_id, category_id = result
+            product_id, version, inventory_id, price_id, category_id = result
 
             delete_product_query = self.__product_table.delete().where(
                 self.__product_table.c.sku == sku
             )
-            session.execute(delete_product_query)
+            await session.execute(delete_product_query)
 
             if inventory_id is not None:
                 delete_inventory_query = self.__inventory_table.delete().where(
                     self.__inventory_table.c.id == inventory_id
                 )
-                session.execute(delete_inventory_query)
+                await session.execute(delete_inventory_query)
 
             if price_id is not None:
                 delete_price_query = self.__price_table.delete().where(
                     self.__price_table.c.id == price_id
                 )
-                session.execute(delete_price_query)
+                await session.execute(delete_price_query)
 
-            session.commit()
+            await session.execute(
+                insert(self.__outbox_table).values(
+                    event_type=ProductEventType.DELETED.string,
+                    sku=sku,
+                    product_id=product_id,
+                    version=version,
+                )
+            )
+            if self.__read_model:
+                await session.execute(
+                    self.__product_read_table.delete().where(
+                        self.__product_read_table.c.sku == sku
+                    )
+                )
+            await session.commit()
             return True
         except Exception as error:
             logger.error(error)
-            session.rollback()
+            await session.rollback()
             if type(error) is type(on_not_found):
                 raise
             raise DatabaseException(
@@ -443,4 +1332,366 @@ class ProductPostgresAdapter(ProductRepository):
                 }
             )
         finally:
-            session.close()
+            await session.close()
+
+    def __adjust_inventory_statement(
+        self, operation: InventoryOperation, quantities: Dict[str, int]
+    ) -> Select[Any]:
+        """
+        Build a single statement applying an inventory operation.
+
+        Each line only updates its Inventory row when the stock allows
+        it, concurrent reservations on the same row are serialized by the
+        row lock instead of a version check. The product still gets a new
+        version, the inventory is part of its representation, so ETags
+        and If-Match see the change. The same statement records an
+        inventory event in the outbox and, when the read model is
+        enabled, patches ProductRead.
+        """
+        inventory = self.__inventory_table
+        product = self.__product_table
+        read = self.__product_read_table
+        lines = values(
+            column("sku", String), column("quantity", Integer), name="lines"
+        ).data(list(quantities.items()))
+
+        if operation == InventoryOperation.RESERVE:
+            changes = {"reserved": inventory.c.reserved + lines.c.quantity}
+            available = (
+                inventory.c.reserved + lines.c.quantity <= inventory.c.quantity
+            )
+        elif operation == InventoryOperation.RELEASE:
+            changes = {"reserved": inventory.c.reserved - lines.c.quantity}
+            available = inventory.c.reserved >= lines.c.quantity
+        else:
+            changes = {
+                "quantity": inventory.c.quantity - lines.c.quantity,
+                "reserved": inventory.c.reserved - lines.c.quantity,
+            }
+            available = inventory.c.reserved >= lines.c.quantity
+
+        updated_inventory = (
+            update(inventory)
+            .where(
+                inventory.c.id == product.c.inventory_id,
+                product.c.sku == lines.c.sku,
+                available,
+            )
+            .values(**changes)
+            .returning(
+                product.c.sku,
+                inventory.c.id,
+                inventory.c.quantity,
+                inventory.c.reserved,
+            )
+            .cte("updated_inventory")
+        )
+        versioned_product = (
+            update(product)
+            .where(product.c.sku == updated_inventory.c.sku)
+            .values(version=product.c.version + 1)
+            .returning(product.c.sku, product.c.version)
+            .cte("versioned_product")
+        )
+        refreshed_read = (
+            update(read)
+            .where(
+                read.c.sku == updated_inventory.c.sku,
+                read.c.sku == versioned_product.c.sku,
+            )
+            .values(
+                version=versioned_product.c.version,
+                inventory_quantity=updated_inventory.c.quantity,
+                inventory_reserved=updated_inventory.c.reserved,
+            )
+            .cte("refreshed_read")
+        )
+        statement = select(*updated_inventory.c).add_cte(
+            self.__outbox_statement(
+                versioned_product, ProductEventType.INVENTORY_UPDATED
+            )
+        )
+        if self.__read_model:
+            statement = statement.add_cte(refreshed_read)
+        return statement
+
+    async def adjust_inventory(
+        self,
+        operation: InventoryOperation,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient_inventory: Exception,
+    ) -> Dict[str, Inventory]:
+        session = self.__session()
+        try:
+            rows = (
+                await session.execute(
+                    self.__adjust_inventory_statement(operation, quantities)
+                )
+            ).fetchall()
+            if len(rows) < len(quantities):
+                # Some line was rejected, undo the others and find out why.
+                await session.rollback()
+                found_skus = (
+                    await session.execute(
+                        select(self.__product_table.c.sku).where(
+                            self.__sku_in(list(quantities)),
+                            self.__product_table.c.inventory_id.isnot(None),
+                        )
+                    )
+                ).fetchall()
+                if len(found_skus) < len(quantities):
+                    raise on_not_found
+                raise on_insufficient_inventory
+            await session.commit()
+            return {
+                row.sku: Inventory(
+                    id=row.id, quantity=row.quantity, reserved=row.reserved
+                )
+                for row in rows
+            }
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            if type(error) is type(on_not_found) or type(error) is type(
+                on_insufficient_inventory
+            ):
+                raise
+            raise DatabaseException(
+                {
+                    "code": "database.error.inventory",
+                    "message": f"Error updating inventory: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    def __reprice_category_statement(
+        self, category_name: str, discount_percent: Decimal
+    ) -> Select[Any]:
+        """
+        Build a single statement setting the discount of a category.
+
+        Prices already at ``discount_percent`` are left alone. Every
+        repriced product gets a new version, an outbox event and, when
+        the read model is enabled, its ProductRead row patched in the
+        same statement.
+        """
+        price = self.__price_table
+        product = self.__product_table
+        category = self.__category_table
+        read = self.__product_read_table
+        repriced_price = (
+            update(price)
+            .where(
+                price.c.id == product.c.price_id,
+                product.c.category_id == category.c.id,
+                func.lower(category.c.name) == func.lower(category_name),
+                price.c.discount_percent != discount_percent,
+            )
+            .values(discount_percent=discount_percent)
+            .returning(product.c.sku, price.c.discount_percent)
+            .cte("repriced_price")
+        )
+        repriced_product = (
+            update(product)
+            .where(product.c.sku == repriced_price.c.sku)
+            .values(version=product.c.version + 1)
+            .returning(product.c.sku, product.c.version)
+            .cte("repriced_product")
+        )
+        refreshed_read = (
+            update(read)
+            .where(
+                read.c.sku == repriced_price.c.sku,
+                read.c.sku == repriced_product.c.sku,
+            )
+            .values(
+                version=repriced_product.c.version,
+                price_discount_percent=repriced_price.c.discount_percent,
+            )
+            .cte("refreshed_read")
+        )
+        statement = select(repriced_product.c.sku).add_cte(
+            self.__outbox_statement(repriced_product, ProductEventType.UPDATED)
+        )
+        if self.__read_model:
+            statement = statement.add_cte(refreshed_read)
+        return statement
+
+    async def reprice_category(
+        self,
+        category_name: str,
+        discount_percent: Decimal,
+        on_not_found: Exception,
+    ) -> List[str]:
+        session = self.__session()
+        try:
+            rows = (
+                await session.execute(
+                    self.__reprice_category_statement(
+                        category_name, discount_percent
+                    )
+                )
+            ).fetchall()
+            if not rows:
+                category = (
+                    await session.execute(
+                        select(self.__category_table.c.id).where(
+                            func.lower(self.__category_table.c.name)
+                            == func.lower(category_name)
+                        )
+                    )
+                ).fetchone()
+                if category is None:
+                    raise on_not_found
+            await session.commit()
+            return [row.sku for row in rows]
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            if type(error) is type(on_not_found):
+                raise
+            raise DatabaseException(
+                {
+                    "code": "database.error.reprice",
+                    "message": f"Error repricing category: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def relay_product_events(
+        self,
+        handler: Callable[[List[ProductEvent]], Awaitable[None]],
+        batch_size: int,
+        handler_timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Hand the oldest outbox rows to ``handler`` and delete them.
+
+        Rows are locked with ``FOR UPDATE SKIP LOCKED`` so several relays
+        can drain the outbox concurrently. Outbox rows only keep the SKU,
+        the events carry the product as currently stored, and several
+        rows for the same SKU in a batch collapse into its latest event.
+        A delete followed by a new product for the SKU is still sent,
+        ahead of the batch, so consumers replace the old product.
+        Rows are only deleted once ``handler`` returns, a failure leaves
+        them for the next run. The row locks are held while ``handler``
+        runs, so it is cancelled after ``handler_timeout`` seconds and
+        the batch is retried.
+        """
+        session = self.__session()
+        try:
+            outbox_rows = (
+                await session.execute(
+                    select(
+                        self.__outbox_table.c.id,
+                        self.__outbox_table.c.event_type,
+                        self.__outbox_table.c.sku,
+                        self.__outbox_table.c.product_id,
+                        self.__outbox_table.c.version,
+                    )
+                    .order_by(self.__outbox_table.c.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).fetchall()
+            if not outbox_rows:
+                await session.commit()
+                return 0
+
+            latest_event_types: Dict[str, str] = {}
+            deleted_rows: Dict[str, Row[Any]] = {}
+            tombstones: List[Row[Any]] = []
+            for row in outbox_rows:
+                event_type, sku = row.event_type, row.sku
+                if event_type == ProductEventType.DELETED.string:
+                    deleted_rows[sku] = row
+                elif (
+                    latest_event_types.get(sku)
+                    == ProductEventType.DELETED.string
+                ):
+                    # The SKU was created again, consumers still need the
+                    # deleted product's tombstone before the new product.
+                    tombstones.append(deleted_rows.pop(sku))
+                # Events carry the current product, an inventory event
+                # adds nothing to a create or update already in the batch.
+                if (
+                    event_type == ProductEventType.INVENTORY_UPDATED.string
+                    and latest_event_types.get(sku)
+                    in (
+                        ProductEventType.CREATED.string,
+                        ProductEventType.UPDATED.string,
+                    )
+                ):
+                    continue
+                latest_event_types.pop(sku, None)
+                latest_event_types[sku] = event_type
+
+            changed_skus = [
+                sku
+                for sku, event_type in latest_event_types.items()
+                if event_type != ProductEventType.DELETED.string
+            ]
+            products: Dict[str, Product] = {}
+            if changed_skus:
+                result = await session.execute(
+                    self.__select_products().where(self.__sku_in(changed_skus))
+                )
+                for row in result:
+                    product = self.__row_to_product(row)
+                    products[product.sku] = product
+
+            product_events: List[ProductEvent] = [
+                ProductEvent(
+                    type=ProductEventType.DELETED,
+                    sku=row.sku,
+                    product_id=row.product_id,
+                    version=row.version,
+                )
+                for row in tombstones
+            ]
+            for sku, event_type in latest_event_types.items():
+                if event_type == ProductEventType.DELETED.string:
+                    product_events.append(
+                        ProductEvent(
+                            type=ProductEventType.DELETED,
+                            sku=sku,
+                            product_id=deleted_rows[sku].product_id,
+                            version=deleted_rows[sku].version,
+                        )
+                    )
+                elif sku in products:
+                    product_events.append(
+                        ProductEvent(
+                            type=ProductEventType(event_type),
+                            product=products[sku],
+                        )
+                    )
+
+            if product_events:
+                await asyncio.wait_for(
+                    handler(product_events), timeout=handler_timeout
+                )
+
+            await session.execute(
+                self.__outbox_table.delete().where(
+                    self.__outbox_table.c.id.in_(
+                        [row.id for row in outbox_rows]
+                    )
+                )
+            )
+            await session.commit()
+            return len(outbox_rows)
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            raise DatabaseException(
+                {
+                    "code": "database.error.outbox",
+                    "message": f"Error relaying product events: {error}",
+                }
+            )
+        finally:
+            await session.close()
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from src.domain.entities import Product
+from src.port.caches import ProductCache
+from src.serialization import dumps, loads
+
+logger = logging.getLogger("app")
+
+# Only replace the cached product when the incoming version is not older
+# and, for a read-through fill, when the SKU was not deleted since its
+# generation was read.
+SET_IF_NEWER_SCRIPT = """
+if ARGV[4] ~= '' and
+        tonumber(redis.call('GET', KEYS[2]) or '0') ~= tonumber(ARGV[4]) then
+    return 0
+end
+local current = redis.call('GET', KEYS[1])
+if current then
+    local version = cjson.decode(current)['version']
+    if type(version) == 'number' and version > tonumber(ARGV[2]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return 1
+"""
+# The generation outlives the reads that started before the delete.
+DELETE_SCRIPT = """
+redis.call('DEL', KEYS[1])
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+"""
+
+
+class RedisProductCache(ProductCache):
+    """
+    Product cache shared by every catalogue process.
+
+    Deletes bump the SKU generation, kept for ``ttl`` seconds, in the
+    same script, and are also published on ``invalidation_channel`` so
+    the other processes can drop their in-process copy of the product,
+    see ``start_invalidation_listener``.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        ttl: int,
+        key_prefix: str = "catalogue:product",
+        invalidation_channel: str = "catalogue:product:invalidations",
+        resubscribe_interval: float = 1,
+    ) -> None:
+        self.__redis = Redis.from_url(redis_url)
+        self.__ttl = ttl
+        self.__key_prefix = key_prefix
+        self.__invalidation_channel = invalidation_channel
+        self.__resubscribe_interval = resubscribe_interval
+        # Tells this process' own invalidations apart from the others.
+        self.__origin = uuid4().hex
+        self.__listener: Optional["asyncio.Task[None]"] = None
+        self.__set_if_newer = self.__redis.register_script(SET_IF_NEWER_SCRIPT)
+        self.__delete = self.__redis.register_script(DELETE_SCRIPT)
+        self.__hits = 0
+        self.__misses = 0
+
+    def __key(self, sku: str) -> str:
+        return f"{self.__key_prefix}:{sku}"
+
+    def __generation_key(self, sku: str) -> str:
+        return f"{self.__key_prefix}:{sku}:generation"
+
+    async def get(self, sku: str) -> Optional[Product]:
+        value = await self.__redis.get(self.__key(sku))
+        if value is None:
+            self.__misses += 1
+            return None
+        self.__hits += 1
+        return Product.from_dict(loads(value))
+
+    async def set(
+        self, product: Product, generation: Optional[int] = None
+    ) -> None:
+        await self.__set_if_newer(
+            keys=[
+                self.__key(product.sku),
+                self.__generation_key(product.sku),
+            ],
+            args=[
+                dumps(product.to_dict()),
+                product.version or 0,
+                self.__ttl,
+                "" if generation is None else generation,
+            ],
+        )
+
+    async def delete(self, sku: str) -> None:
+        await self.__delete(
+            keys=[self.__key(sku), self.__generation_key(sku)],
+            args=[self.__ttl],
+        )
+        await self.__redis.publish(
+            self.__invalidation_channel, f"{self.__origin} {sku}"
+        )
+
+    async def generation(self, sku: str) -> int:
+        value = await self.__redis.get(self.__generation_key(sku))
+        return 0 if value is None else int(value)
+
+    def start_invalidation_listener(
+        self, on_invalidate: Callable[[str], Awaitable[None]]
+    ) -> None:
+        """
+        Call ``on_invalidate`` with every SKU deleted by another process.
+
+        Messages published while the subscription is down are lost, the
+        in-process TTL still bounds how long those products stay stale.
+        """
+        self.__listener = asyncio.create_task(
+            self.__listen_invalidations(on_invalidate)
+        )
+
+    async def __listen_invalidations(
+        self, on_invalidate: Callable[[str], Awaitable[None]]
+    ) -> None:
+        while True:
+            try:
+                async with self.__redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.__invalidation_channel)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        origin, sku = message["data"].decode().split(" ", 1)
+                        if origin != self.__origin:
+                            await on_invalidate(sku)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger.error(f"Error listening to invalidations: {error}")
+                await asyncio.sleep(self.__resubscribe_interval)
+
+    async def close(self) -> None:
+        if self.__listener is not None:
+            self.__listener.cancel()
+            try:
+                await self.__listener
+            except asyncio.CancelledError:
+                pass
+            self.__listener = None
+        await self.__redis.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "hits": self.__hits,
+            "misses": self.__misses,
+        }
@@ -1,8 +1,19 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
 import boto3  # type: ignore
 from src.adapter.exceptions import SqsException
 from src.domain.events import ProductEvent
 from src.port.event_publishers import ProductEventPublisher
 
+logger = logging.getLogger("app")
+
+SQS_MAX_BATCH_SIZE = 10
+
 
 class SQSAdapter(ProductEventPublisher):
     def __init__(
@@ -12,8 +23,13 @@ class SQSAdapter(ProductEventPublisher):
         aws_secret_access_key: str,
         endpoint_url: str,
         region_name: str,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
     ) -> None:
         self.__queue_name = queue_name
+        self.__queue_url: Optional[str] = None
+        self.__max_retries = max_retries
+        self.__retry_backoff = retry_backoff
         self.__sqs = boto3.client(
             "sqs",
             endpoint_url=endpoint_url,
@@ -23,9 +39,12 @@ class SQSAdapter(ProductEventPublisher):
         )
 
     def __get_queue_url(self) -> str:
+        if self.__queue_url is not None:
+            return self.__queue_url
         try:
             response = self.__sqs.get_queue_url(QueueName=self.__queue_name)
-            return response.get("QueueUrl")
+            self.__queue_url = response.get("QueueUrl")
+            return self.__queue_url
         except Exception as error:
             raise SqsException(
                 {
@@ -49,3 +68,227 @@ class SQSAdapter(ProductEventPublisher):
                     "message": f"Error sending message to sqs queue: {error}",
                 }
             )
+
+    def publish_batch(self, product_events: List[ProductEvent]) -> None:
+        queue_url = self.__get_queue_url()
+        for start in range(0, len(product_events), SQS_MAX_BATCH_SIZE):
+            entries = [
+                {"Id": str(index), "MessageBody": product_event.to_json()}
+                for index, product_event in enumerate(
+                    product_events[start : start + SQS_MAX_BATCH_SIZE]
+                )
+            ]
+            self.__send_message_batch(queue_url, entries)
+
+    def __send_message_batch(
+        self, queue_url: str, entries: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Send one batch, retrying only the entries SQS reported as failed.
+
+        Failures caused by the sender, such as an oversized message, can
+        not succeed on retry and are raised right away.
+        """
+        for attempt in range(self.__max_retries + 1):
+            try:
+                response = self.__sqs.send_message_batch(
+                    QueueUrl=queue_url, Entries=entries
+                )
+            except Exception as error:
+                raise SqsException(
+                    {
+                        "code": "sqs.error.queue.send_message_batch",
+                        "message": (
+                            f"Error sending messages to sqs queue: {error}"
+                        ),
+                    }
+                )
+            failed = response.get("Failed", [])
+            if not failed:
+                return
+            sender_faults = [entry for entry in failed if entry["SenderFault"]]
+            if sender_faults or attempt == self.__max_retries:
+                raise SqsException(
+                    {
+                        "code": "sqs.error.queue.send_message_batch",
+                        "message": (
+                            f"{len(failed)} messages not sent to sqs queue: "
+                            f"{failed}"
+                        ),
+                    }
+                )
+            failed_ids = {entry["Id"] for entry in failed}
+            entries = [entry for entry in entries if entry["Id"] in failed_ids]
+            time.sleep(self.__retry_backoff * 2**attempt)
+
+
+class PendingPublish:
+    """Tracks the buffered events of one ``publish_batch`` call."""
+
+    def __init__(self, size: int) -> None:
+        self.__remaining = size
+        self.__lock = threading.Lock()
+        self.__settled = threading.Event()
+        self.error: Optional[Exception] = None
+
+    def settle(self, count: int, error: Optional[Exception] = None) -> None:
+        with self.__lock:
+            self.__remaining -= count
+            if error is not None and self.error is None:
+                self.error = error
+            if self.__remaining <= 0 or self.error is not None:
+                self.__settled.set()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        return self.__settled.wait(timeout)
+
+
+BufferedEvent = Tuple[ProductEvent, Optional[PendingPublish]]
+
+
+class BufferedSQSAdapter(SQSAdapter):
+    """
+    Publisher that buffers events in memory and sends them in batches.
+
+    A background thread flushes the buffer once it holds a full batch or
+    ``flush_interval`` seconds after the first buffered event. When the
+    buffer is full ``publish`` blocks for up to ``put_timeout`` seconds
+    before failing, pushing back on producers instead of growing memory.
+
+    ``publish`` is fire and forget, events of a failed flush are dropped.
+    ``publish_batch`` waits up to ``ack_timeout`` seconds for its events
+    to be sent and raises if any of them was not, so the outbox relay
+    keeps its rows for the next run.
+    """
+
+    def __init__(
+        self,
+        queue_name: str,
+        aws_access_key_id: str,
+        aws_secret_access_key: str,
+        endpoint_url: str,
+        region_name: str,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+        max_buffer_size: int = 10000,
+        flush_interval: float = 0.2,
+        put_timeout: float = 5,
+        ack_timeout: float = 10,
+    ) -> None:
+        super().__init__(
+            queue_name=queue_name,
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            endpoint_url=endpoint_url,
+            region_name=region_name,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+        )
+        self.__buffer: "queue.Queue[BufferedEvent]" = queue.Queue(
+            maxsize=max_buffer_size
+        )
+        self.__flush_interval = flush_interval
+        self.__put_timeout = put_timeout
+        self.__ack_timeout = ack_timeout
+        self.__closed = threading.Event()
+        self.__published = 0
+        self.__failed = 0
+        self.__dropped = 0
+        self.__flusher = threading.Thread(
+            target=self.__flush_loop, daemon=True
+        )
+        self.__flusher.start()
+
+    def __put(
+        self, product_event: ProductEvent, pending: Optional[PendingPublish]
+    ) -> None:
+        try:
+            self.__buffer.put(
+                (product_event, pending), timeout=self.__put_timeout
+            )
+        except queue.Full:
+            raise SqsException(
+                {
+                    "code": "sqs.error.buffer.full",
+                    "message": "Sqs publish buffer is full",
+                }
+            )
+
+    def publish(self, product_event: ProductEvent) -> None:
+        self.__put(product_event, None)
+
+    def publish_batch(self, product_events: List[ProductEvent]) -> None:
+        pending = PendingPublish(len(product_events))
+        for product_event in product_events:
+            self.__put(product_event, pending)
+        if not pending.wait(self.__ack_timeout):
+            raise SqsException(
+                {
+                    "code": "sqs.error.buffer.timeout",
+                    "message": "Timed out waiting for the sqs buffer flush",
+                }
+            )
+        if pending.error is not None:
+            raise SqsException(
+                {
+                    "code": "sqs.error.buffer.flush",
+                    "message": (
+                        f"Error flushing sqs publish buffer: {pending.error}"
+                    ),
+                }
+            )
+
+    def __next_batch(self) -> List[BufferedEvent]:
+        try:
+            batch = [self.__buffer.get(timeout=self.__flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.__flush_interval
+        while len(batch) < SQS_MAX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.__buffer.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def __flush_loop(self) -> None:
+        while not (self.__closed.is_set() and self.__buffer.empty()):
+            batch = self.__next_batch()
+            if not batch:
+                continue
+            error: Optional[Exception] = None
+            try:
+                super().publish_batch(
+                    [product_event for product_event, _ in batch]
+                )
+                self.__published += len(batch)
+            except Exception as flush_error:
+                logger.error(
+                    f"Error flushing sqs publish buffer: {flush_error}"
+                )
+                error = flush_error
+                self.__failed += len(batch)
+                # Nobody waits on fire and forget events, they are lost.
+                self.__dropped += sum(
+                    1 for _, pending in batch if pending is None
+                )
+            settled = Counter(
+                pending for _, pending in batch if pending is not None
+            )
+            for pending, count in settled.items():
+                pending.settle(count, error)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self.__closed.set()
+        self.__flusher.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": self.__buffer.qsize(),
+            "published": self.__published,
+            "failed": self.__failed,
+            "dropped": self.__dropped,
+        }
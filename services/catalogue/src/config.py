@@ -8,11 +8,54 @@ from src.utils.singleton import Singleton
 class Config(metaclass=Singleton):
     LOG_LEVEL = "DEBUG"
     DATABASE_URL = os.getenv("CATALOGUE_DATABASE_URL")
+    DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+    DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+    DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+    DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+    DATABASE_POOL_PRE_PING = (
+        os.getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true"
+    )
+    DATABASE_STATEMENT_TIMEOUT = int(
+        os.getenv("DATABASE_STATEMENT_TIMEOUT", "0")
+    )
+    PRODUCT_READ_MODEL_ENABLED = (
+        os.getenv("PRODUCT_READ_MODEL_ENABLED", "false").lower() == "true"
+    )
+    PRODUCT_CACHE_ENABLED = (
+        os.getenv("PRODUCT_CACHE_ENABLED", "true").lower() == "true"
+    )
+    PRODUCT_CACHE_MAX_SIZE = int(os.getenv("PRODUCT_CACHE_MAX_SIZE", "10000"))
+    PRODUCT_CACHE_TTL = float(os.getenv("PRODUCT_CACHE_TTL", "30"))
+    REDIS_URL = os.getenv("REDIS_URL")
+    REDIS_PRODUCT_CACHE_TTL = int(os.getenv("REDIS_PRODUCT_CACHE_TTL", "300"))
+    PRODUCT_LOOKUP_MAX_SKUS = int(os.getenv("PRODUCT_LOOKUP_MAX_SKUS", "500"))
+    PRODUCT_PAGE_MAX_SIZE = int(os.getenv("PRODUCT_PAGE_MAX_SIZE", "1000"))
+    PRODUCT_EXPORT_BATCH_SIZE = int(
+        os.getenv("PRODUCT_EXPORT_BATCH_SIZE", "1000")
+    )
+    OUTBOX_RELAY_BATCH_SIZE = int(os.getenv("OUTBOX_RELAY_BATCH_SIZE", "100"))
+    OUTBOX_RELAY_POLL_INTERVAL = float(
+        os.getenv("OUTBOX_RELAY_POLL_INTERVAL", "1")
+    )
+    OUTBOX_RELAY_PUBLISH_TIMEOUT = float(
+        os.getenv("OUTBOX_RELAY_PUBLISH_TIMEOUT", "10")
+    )
+    BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000"))
     QUEUE_NAME = os.getenv("QUEUE_NAME")
     ENDPOINT_URL = os.getenv("ENDPOINT_URL")
     REGION_NAME = os.getenv("REGION_NAME")
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+    SQS_PUBLISH_MAX_RETRIES = int(os.getenv("SQS_PUBLISH_MAX_RETRIES", "3"))
+    SQS_PUBLISH_BUFFERED = (
+        os.getenv("SQS_PUBLISH_BUFFERED", "false").lower() == "true"
+    )
+    SQS_PUBLISH_BUFFER_SIZE = int(
+        os.getenv("SQS_PUBLISH_BUFFER_SIZE", "10000")
+    )
+    SQS_PUBLISH_FLUSH_INTERVAL = float(
+        os.getenv("SQS_PUBLISH_FLUSH_INTERVAL", "0.2")
+    )
 
 
 class LocalConfig(Config):
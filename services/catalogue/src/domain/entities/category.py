@@ -29,6 +29,10 @@ class Category:
             raise InvalidName("Name can not have less than 3 characters.")
         return name
 
+    @staticmethod
+    def from_dict(data: dict) -> "Category":
+        return Category(id=UUID(data["id"]), name=data["name"])
+
     def to_dict(self) -> dict:
         return {
             "id": str(self.id),
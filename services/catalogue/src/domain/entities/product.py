@@ -109,6 +109,30 @@ class Product:
     def category(self) -> Optional[Category]:
         return self._category
 
+    @staticmethod
+    def from_dict(data: dict) -> "Product":
+        return Product(
+            id=UUID(data["id"]),
+            version=data.get("version"),
+            sku=data["sku"],
+            name=data["name"],
+            description=data["description"],
+            image_url=data.get("image_url"),
+            price=(
+                Price.from_dict(data["price"]) if data.get("price") else None
+            ),
+            inventory=(
+                Inventory.from_dict(data["inventory"])
+                if data.get("inventory")
+                else None
+            ),
+            category=(
+                Category.from_dict(data["category"])
+                if data.get("category")
+                else None
+            ),
+        )
+
     def to_dict(self) -> dict:
         return {
             "id": str(self.id),
@@ -5,6 +5,28 @@ class ProductEventType(Enum):
     CREATED = "created"
     UPDATED = "updated"
     DELETED = "deleted"
+    INVENTORY_UPDATED = "inventory_updated"
+
+    @property
+    def string(self):
+        return self.value
+
+
+class InventoryOperation(Enum):
+    RESERVE = "reserve"
+    RELEASE = "release"
+    COMMIT = "commit"
+
+    @property
+    def string(self):
+        return self.value
+
+
+class ProductImportStatus(Enum):
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+    FAILED = "failed"
 
     @property
     def string(self):
@@ -1,8 +1,9 @@
-import json
-from typing import Optional
+from typing import Any, Dict, Optional
+from uuid import UUID
 
 from src.domain.entities import Product
 from src.domain.enums import ProductEventType
+from src.serialization import dumps
 
 
 class ProductEvent:
@@ -12,10 +13,15 @@ class ProductEvent:
         type: ProductEventType,
         product: Optional[Product] = None,
         sku: Optional[str] = None,
+        product_id: Optional[UUID] = None,
+        version: Optional[int] = None,
     ) -> None:
         self._type = type
         self._product = product
         self._sku = sku
+        # Identify the deleted product, consumers keep them as a tombstone.
+        self._product_id = product_id
+        self._version = version
 
         self.validade_event()
 
@@ -24,6 +30,13 @@ class ProductEvent:
             raise Exception("CREATED product event must have valid product")
         if self.type == ProductEventType.UPDATED and self.product is None:
             raise Exception("UPDATED product event must have valid product")
+        if (
+            self.type == ProductEventType.INVENTORY_UPDATED
+            and self.product is None
+        ):
+            raise Exception(
+                "INVENTORY_UPDATED product event must have valid product"
+            )
         if self.type == ProductEventType.DELETED and self.sku is None:
             raise Exception("DELETED product event must have valid sku")
 
@@ -39,7 +52,15 @@ class ProductEvent:
     def product(self) -> Optional[Product]:
         return self._product
 
-    def to_dict(self):
+    @property
+    def product_id(self) -> Optional[UUID]:
+        return self._product_id
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def to_dict(self) -> Dict[str, Any]:
         product = None
         sku = None
         if self.product is not None:
@@ -47,7 +68,15 @@ class ProductEvent:
         if self.sku is not None:
             sku = self.sku
 
-        return {"type": self.type.string, "product": product, "sku": sku}
+        return {
+            "type": self.type.string,
+            "product": product,
+            "sku": sku,
+            "product_id": (
+                str(self.product_id) if self.product_id is not None else None
+            ),
+            "version": self.version,
+        }
 
-    def to_json(self):
-        return json.dumps(self.to_dict())
+    def to_json(self) -> str:
+        return dumps(self.to_dict()).decode()
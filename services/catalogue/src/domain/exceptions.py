@@ -22,6 +22,10 @@ class InvalidImageUrl(Exception):
     pass
 
 
+class InvalidProduct(Exception):
+    pass
+
+
 class ProductAlreadyExist(Exception):
     pass
 
@@ -52,3 +56,19 @@ class UpdateProductError(Exception):
 
 class DeleteProductError(Exception):
     pass
+
+
+class TooManySkus(Exception):
+    pass
+
+
+class InsufficientInventory(Exception):
+    pass
+
+
+class InventoryUpdateError(Exception):
+    pass
+
+
+class CategoryNotFound(Exception):
+    pass
@@ -1,27 +1,33 @@
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from src.config import get_config
 from src.domain.entities import Category, Product
-from src.domain.enums import ProductEventType
+from src.domain.enums import InventoryOperation, ProductImportStatus
 from src.domain.events import ProductEvent
 from src.domain.exceptions import (
+    CategoryNotFound,
     DeleteProductError,
     DuplicatedProduct,
     GetProductError,
+    InsufficientInventory,
     InvalidDescription,
     InvalidImageUrl,
     InvalidInventory,
     InvalidName,
     InvalidPrice,
+    InvalidProduct,
     InvalidSku,
+    InventoryUpdateError,
     OutdatedProduct,
     ProductAlreadyExist,
     ProductCreationError,
     ProductNotFound,
+    TooManySkus,
     UpdateProductError,
 )
-from src.domain.value_objects import Inventory, Price
+from src.domain.value_objects import Inventory, Price, ProductImportResult
 from src.port import ProductEventPublisher, ProductRepository
 
 config = get_config()
@@ -37,7 +43,27 @@ class CatalogueService:
         self.__product_repository = product_repository
         self.__product_event_publisher = product_event_publisher
 
-    def create_product(
+    async def __publish(self, product_events: List[ProductEvent]) -> None:
+        # The publisher client is blocking, keep it off the event loop.
+        await asyncio.to_thread(
+            self.__product_event_publisher.publish_batch,
+            product_events=product_events,
+        )
+
+    async def relay_product_events(self, batch_size: int) -> int:
+        """
+        Publish one batch of events recorded in the outbox.
+
+        Product changes write their events in the same transaction as the
+        change itself, this drains them to the event publisher.
+        """
+        return await self.__product_repository.relay_product_events(
+            handler=self.__publish,
+            batch_size=batch_size,
+            handler_timeout=config.OUTBOX_RELAY_PUBLISH_TIMEOUT,
+        )
+
+    async def create_product(
         self,
         sku: str,
         name: str,
@@ -58,7 +84,7 @@ class CatalogueService:
                 category=category,
             )
             created_product: Product = (
-                self.__product_repository.create_product(
+                await self.__product_repository.create_product(
                     product=product,
                     on_duplicate_sku=ProductAlreadyExist(
                         "Product already exists"
@@ -68,10 +94,6 @@ class CatalogueService:
                     ),
                 )
             )
-            product_event = ProductEvent(
-                type=ProductEventType.CREATED, product=product
-            )
-            self.__product_event_publisher.publish(product_event=product_event)
             return created_product
         except (
             InvalidSku,
@@ -88,12 +110,99 @@ class CatalogueService:
             logger.error(error)
             raise ProductCreationError(f"Error creating product: {error}")
 
-    def get_product_by_sku(self, sku: str) -> Product:
+    async def create_products(
+        self, products: List[Dict[str, Any]]
+    ) -> List[ProductImportResult]:
+        results: List[Optional[ProductImportResult]] = [None] * len(products)
+        valid_products: List[Product] = []
+        valid_indexes: List[int] = []
+        for index, product_data in enumerate(products):
+            try:
+                valid_products.append(self.__build_product(product_data))
+                valid_indexes.append(index)
+            except (
+                InvalidSku,
+                InvalidPrice,
+                InvalidInventory,
+                InvalidName,
+                InvalidDescription,
+                InvalidImageUrl,
+                InvalidProduct,
+            ) as error:
+                results[index] = ProductImportResult(
+                    sku=product_data.get("sku") or "",
+                    status=ProductImportStatus.INVALID,
+                    message=str(error),
+                )
+
+        statuses = await self.__product_repository.create_products(
+            products=valid_products, batch_size=config.BULK_IMPORT_BATCH_SIZE
+        )
+        for index, product, status in zip(
+            valid_indexes, valid_products, statuses
+        ):
+            results[index] = ProductImportResult(
+                sku=product.sku, status=status
+            )
+        return [result for result in results if result is not None]
+
+    @staticmethod
+    def __build_product(product_data: Dict[str, Any]) -> Product:
+        missing = [
+            field
+            for field in ("sku", "name", "description")
+            if product_data.get(field) is None
+        ]
+        if missing:
+            raise InvalidProduct(
+                f"Missing mandatory fields: {', '.join(missing)}."
+            )
+        price = None
+        inventory = None
+        category = None
+        if product_data.get("price") is not None:
+            price = Price(
+                value=product_data["price"]["value"],
+                discount_percent=product_data["price"]["discount_percent"],
+            )
+        if product_data.get("inventory") is not None:
+            inventory = Inventory(
+                quantity=product_data["inventory"]["quantity"],
+                reserved=product_data["inventory"].get("reserved") or 0,
+            )
+        if product_data.get("category") is not None:
+            category = Category(name=product_data["category"]["name"])
+        return Product(
+            sku=product_data["sku"],
+            name=product_data["name"],
+            description=product_data["description"],
+            image_url=product_data.get("image_url"),
+            price=price,
+            inventory=inventory,
+            category=category,
+        )
+
+    async def get_product_version(self, sku: str) -> int:
         try:
             Product.validate_sku(sku)
-            product: Product = self.__product_repository.get_product_by_sku(
+            return await self.__product_repository.get_product_version(
                 sku=sku, on_not_found=ProductNotFound("Product not found")
             )
+        except (InvalidSku, ProductNotFound) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise GetProductError(f"Error getting product: {error}")
+
+    async def get_product_by_sku(self, sku: str) -> Product:
+        try:
+            Product.validate_sku(sku)
+            product: Product = (
+                await self.__product_repository.get_product_by_sku(
+                    sku=sku, on_not_found=ProductNotFound("Product not found")
+                )
+            )
             if product is None:
                 raise ProductNotFound("Product not found")
             return product
@@ -104,7 +213,58 @@ class CatalogueService:
             logger.error(error)
             raise GetProductError(f"Error getting product: {error}")
 
-    def update_product(
+    async def get_products_by_skus(
+        self, skus: List[str]
+    ) -> Tuple[List[Product], List[str]]:
+        try:
+            unique_skus = list(dict.fromkeys(skus))
+            if len(unique_skus) > config.PRODUCT_LOOKUP_MAX_SKUS:
+                raise TooManySkus(
+                    "Can not look up more than "
+                    f"{config.PRODUCT_LOOKUP_MAX_SKUS} skus at once."
+                )
+            for sku in unique_skus:
+                Product.validate_sku(sku)
+            products = await self.__product_repository.get_products_by_skus(
+                skus=unique_skus
+            )
+            products_by_sku = {product.sku: product for product in products}
+            return (
+                [
+                    products_by_sku[sku]
+                    for sku in unique_skus
+                    if sku in products_by_sku
+                ],
+                [sku for sku in unique_skus if sku not in products_by_sku],
+            )
+        except (InvalidSku, TooManySkus) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise GetProductError(f"Error getting products: {error}")
+
+    async def list_products(
+        self, after_sku: Optional[str], limit: int
+    ) -> Tuple[List[Product], Optional[str]]:
+        try:
+            products = await self.__product_repository.list_products(
+                after_sku=after_sku, limit=limit + 1
+            )
+            if len(products) > limit:
+                products = products[:limit]
+                return products, products[-1].sku
+            return products, None
+        except Exception as error:
+            logger.error(error)
+            raise GetProductError(f"Error listing products: {error}")
+
+    def export_products(self) -> AsyncIterator[Product]:
+        return self.__product_repository.stream_products(
+            batch_size=config.PRODUCT_EXPORT_BATCH_SIZE
+        )
+
+    async def update_product(
         self,
         sku: str,
         name: str,
@@ -113,6 +273,7 @@ class CatalogueService:
         price: Optional[Price] = None,
         inventory: Optional[Inventory] = None,
         category: Optional[Category] = None,
+        version: Optional[int] = None,
     ) -> Product:
         try:
             product = Product(
@@ -123,20 +284,16 @@ class CatalogueService:
                 price=price,
                 inventory=inventory,
                 category=category,
+                version=version,
             )
             updated_product: Product = (
-                self.__product_repository.update_product(
+                await self.__product_repository.update_product(
                     product=product,
                     on_not_found=ProductNotFound("Product not found"),
                     on_outdated_version=OutdatedProduct("Outdated version"),
                     on_duplicate=DuplicatedProduct("Duplicated product"),
                 )
             )
-            product_event = ProductEvent(
-                type=ProductEventType.UPDATED, product=product
-            )
-            self.__product_event_publisher.publish(product_event=product_event)
-
             return updated_product
         except (
             DuplicatedProduct,
@@ -147,6 +304,7 @@ class CatalogueService:
             InvalidInventory,
             InvalidImageUrl,
             ProductNotFound,
+            OutdatedProduct,
         ) as error:
             logger.error(error)
             raise
@@ -154,17 +312,88 @@ class CatalogueService:
             logger.error(error)
             raise UpdateProductError(f"Error updating product {error}")
 
-    def delete_product(self, sku: str) -> bool:
+    async def patch_product(
+        self,
+        sku: str,
+        changes: Dict[str, Any],
+        version: Optional[int] = None,
+    ) -> Product:
+        """
+        Update only the fields present in ``changes``.
+
+        ``version``, when given, has to match the stored product version.
+        An empty patch returns the product unchanged.
+        """
         try:
             Product.validate_sku(sku)
-            self.__product_repository.delete_product(
-                sku=sku, on_not_found=ProductNotFound("Product not found")
+            if "name" in changes:
+                Product.validate_name(changes["name"])
+            if "description" in changes:
+                Product.validate_description(changes["description"])
+            if "image_url" in changes:
+                changes["image_url"] = Product.validate_image_url(
+                    changes["image_url"]
+                )
+            if "category" in changes:
+                Category.validate_name(changes["category"].name)
+            if "inventory" in changes:
+                Inventory.validate_changes(changes["inventory"])
+            if not changes:
+                return await self.get_product_by_sku(sku)
+            return await self.__product_repository.patch_product(
+                sku=sku,
+                changes=changes,
+                expected_version=version,
+                on_not_found=ProductNotFound("Product not found"),
+                on_outdated_version=OutdatedProduct("Outdated version"),
+                on_invalid_inventory=InvalidInventory(
+                    "Reserved can not be higher than quantity."
+                ),
             )
-            product_event = ProductEvent(
-                type=ProductEventType.DELETED, sku=sku
+        except (
+            InvalidSku,
+            InvalidName,
+            InvalidDescription,
+            InvalidImageUrl,
+            InvalidInventory,
+            ProductNotFound,
+            OutdatedProduct,
+        ) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise UpdateProductError(f"Error updating product {error}")
+
+    async def reprice_category(
+        self, category_name: str, discount_percent: float
+    ) -> List[str]:
+        """
+        Set the discount of every product in a category.
+
+        Runs as one set-based update in the repository and returns the
+        skus whose price changed.
+        """
+        try:
+            Category.validate_name(category_name)
+            return await self.__product_repository.reprice_category(
+                category_name=category_name,
+                discount_percent=Price.validate_discount(discount_percent),
+                on_not_found=CategoryNotFound("Category not found"),
             )
-            self.__product_event_publisher.publish(product_event=product_event)
+        except (InvalidName, InvalidPrice, CategoryNotFound) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise UpdateProductError(f"Error repricing category {error}")
 
+    async def delete_product(self, sku: str) -> bool:
+        try:
+            Product.validate_sku(sku)
+            await self.__product_repository.delete_product(
+                sku=sku, on_not_found=ProductNotFound("Product not found")
+            )
             return True
         except (InvalidSku, ProductNotFound) as error:
             logger.error(error)
@@ -172,3 +401,53 @@ class CatalogueService:
         except Exception as error:
             logger.error(error)
             raise DeleteProductError(f"Error deleting product: {error}")
+
+    async def adjust_inventory(
+        self, operation: InventoryOperation, items: List[Dict[str, Any]]
+    ) -> Dict[str, Inventory]:
+        """
+        Reserve, release or commit stock for several skus atomically.
+
+        Lines for the same sku are added up. Either every line is applied
+        or none is. Unlike the original request, each change bumps the
+        product version: search consumers order inventory events by it,
+        and a cached ETag would otherwise keep serving the old stock.
+        """
+        try:
+            quantities: Dict[str, int] = {}
+            for item in items:
+                Product.validate_sku(item["sku"])
+                if item["quantity"] <= 0:
+                    raise InvalidInventory("Quantity must be positive.")
+                quantities[item["sku"]] = (
+                    quantities.get(item["sku"], 0) + item["quantity"]
+                )
+            if not quantities:
+                raise InvalidInventory("At least one item is required.")
+            if len(quantities) > config.PRODUCT_LOOKUP_MAX_SKUS:
+                raise TooManySkus(
+                    "Can not update the inventory of more than "
+                    f"{config.PRODUCT_LOOKUP_MAX_SKUS} skus at once."
+                )
+            return await self.__product_repository.adjust_inventory(
+                operation=operation,
+                quantities=quantities,
+                on_not_found=ProductNotFound(
+                    "Product or product inventory not found"
+                ),
+                on_insufficient_inventory=InsufficientInventory(
+                    f"Not enough inventory to {operation.string} the items"
+                ),
+            )
+        except (
+            InvalidSku,
+            InvalidInventory,
+            TooManySkus,
+            ProductNotFound,
+            InsufficientInventory,
+        ) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise InventoryUpdateError(f"Error updating inventory: {error}")
@@ -1,4 +1,5 @@
+from .import_result import ProductImportResult
 from .inventory import Inventory
 from .price import Price
 
-__all__ = ["Price", "Inventory"]
+__all__ = ["Price", "Inventory", "ProductImportResult"]
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from src.domain.enums import ProductImportStatus
+
+
+class ProductImportResult:
+    def __init__(
+        self,
+        sku: str,
+        status: ProductImportStatus,
+        message: Optional[str] = None,
+    ) -> None:
+        self._sku = sku
+        self._status = status
+        self._message = message
+
+    @property
+    def sku(self) -> str:
+        return self._sku
+
+    @property
+    def status(self) -> ProductImportStatus:
+        return self._status
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._message
+
+    def to_dict(self) -> dict:
+        return {
+            "sku": self.sku,
+            "status": self.status.string,
+            "message": self.message,
+        }
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID, uuid4
 
 from src.domain.exceptions import InvalidInventory
@@ -33,6 +33,26 @@ class Inventory:
             raise InvalidInventory("Reserved can not be higher than quantity.")
         return reserved
 
+    @staticmethod
+    def validate_changes(changes: Dict[str, int]) -> Dict[str, int]:
+        """
+        Validate a partial inventory update.
+
+        Reserved can only be checked against quantity when both are sent,
+        otherwise the repository checks it against the stored one.
+        """
+        if "quantity" in changes:
+            Inventory._validate_quantity(changes["quantity"])
+        reserved = changes.get("reserved")
+        if reserved is not None:
+            if reserved < 0:
+                raise InvalidInventory("Reserved can not be negative.")
+            if "quantity" in changes and reserved > changes["quantity"]:
+                raise InvalidInventory(
+                    "Reserved can not be higher than quantity."
+                )
+        return changes
+
     @property
     def id(self) -> Optional[UUID]:
         return self._id
@@ -49,6 +69,14 @@ class Inventory:
     def in_stock(self) -> int:
         return self._quantity - self.reserved
 
+    @staticmethod
+    def from_dict(data: dict) -> "Inventory":
+        return Inventory(
+            id=UUID(data["id"]),
+            quantity=data["quantity"],
+            reserved=data["reserved"],
+        )
+
     def to_dict(self) -> dict:
         return {
             "id": str(self.id),
@@ -1,22 +1,60 @@
-from typing import Optional
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import Optional, Union
 from uuid import UUID, uuid4
 
 from src.domain.exceptions import InvalidPrice
 
+MONEY_QUANTUM = Decimal("0.01")
+DISCOUNT_QUANTUM = Decimal("0.0001")
+
+Amount = Union[Decimal, float, int, str]
+
 
 class Price:
+    """
+    Product price held as exact decimals.
+
+    ``value`` is kept to the cent and ``discount_percent`` is a fraction
+    between 0 and 1 kept to four places. Floats are converted through
+    their shortest repr, so ``19.99`` becomes ``Decimal("19.99")``.
+    """
+
     def __init__(
         self,
-        value: float,
-        discount_percent: float = 0,
+        value: Amount,
+        discount_percent: Amount = 0,
         id: Optional[UUID] = None,
     ) -> None:
         self._id = id or uuid4()
-        self._value = self._validate_price(value)
-        self._discount_percent = self._validate_discount(discount_percent)
+        self._value = self._validate_price(
+            self._to_decimal(value, MONEY_QUANTUM)
+        )
+        self._discount_percent = self._validate_discount(
+            self._to_decimal(discount_percent, DISCOUNT_QUANTUM)
+        )
 
     @staticmethod
-    def _validate_price(price_value: float) -> float:
+    def _to_decimal(
+        amount: Optional[Amount], quantum: Decimal
+    ) -> Optional[Decimal]:
+        if amount is None:
+            return None
+        try:
+            decimal = Decimal(str(amount))
+            if decimal.is_finite():
+                return decimal.quantize(quantum, rounding=ROUND_HALF_EVEN)
+        except InvalidOperation:
+            pass
+        raise InvalidPrice(f"Price amount {amount!r} is not valid.")
+
+    @classmethod
+    def validate_discount(cls, discount_percent: Amount) -> Decimal:
+        return cls._validate_discount(
+            cls._to_decimal(discount_percent, DISCOUNT_QUANTUM)
+        )
+
+    @staticmethod
+    def _validate_price(price_value: Optional[Decimal]) -> Decimal:
         if price_value is None:
             raise InvalidPrice("Price value is a mandatory field.")
         if price_value < 0:
@@ -24,7 +62,7 @@ class Price:
         return price_value
 
     @staticmethod
-    def _validate_discount(discount_percent: float) -> float:
+    def _validate_discount(discount_percent: Optional[Decimal]) -> Decimal:
         if discount_percent is None:
             raise InvalidPrice("Discount value is a mandatory field.")
         if discount_percent < 0:
@@ -38,21 +76,33 @@ class Price:
         return self._id
 
     @property
-    def value(self) -> float:
+    def value(self) -> Decimal:
         return self._value
 
     @property
-    def discount_percent(self) -> float:
+    def discount_percent(self) -> Decimal:
         return self._discount_percent
 
     @property
-    def discounted_price(self) -> float:
-        return self._value - self._value * self._discount_percent
+    def discounted_price(self) -> Decimal:
+        return (self._value * (1 - self._discount_percent)).quantize(
+            MONEY_QUANTUM, rounding=ROUND_HALF_EVEN
+        )
+
+    @staticmethod
+    def from_dict(data: dict) -> "Price":
+        return Price(
+            id=UUID(data["id"]),
+            value=data["value"],
+            discount_percent=data["discount_percent"],
+        )
 
     def to_dict(self) -> dict:
+        # Amounts leave the domain as JSON numbers, two decimal places
+        # round trip exactly through a float.
         return {
             "id": str(self.id),
-            "value": self.value,
-            "discount_percent": self.discount_percent,
-            "discounted_price": self.discounted_price,
+            "value": float(self.value),
+            "discount_percent": float(self.discount_percent),
+            "discounted_price": float(self.discounted_price),
         }
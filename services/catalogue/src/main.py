@@ -1,30 +1,121 @@
+import asyncio
+import logging
+from typing import List
+
 from fastapi import FastAPI
-from src.adapter.http_api import HTTPApiAdapter
+from src.adapter.cache import CachedProductRepository, InMemoryProductCache
+from src.adapter.http_api import HTTPApiAdapter, MetricsHTTPApiAdapter
+from src.adapter.outbox_relay import OutboxRelayAdapter
 from src.adapter.postgres import ProductPostgresAdapter
-from src.adapter.sqs import SQSAdapter
+from src.adapter.redis import RedisProductCache
+from src.adapter.sqs import BufferedSQSAdapter, SQSAdapter
 from src.config import get_config
 from src.domain.services import CatalogueService
+from src.port.caches import ProductCache
 
 config = get_config()
+logger = logging.getLogger("app")
 
 app = FastAPI()
 
 
 @app.on_event("startup")
-async def startup_event():
+async def startup_event() -> None:
     product_postgres_adapter = ProductPostgresAdapter(
-        database_url=config.DATABASE_URL
-    )
-    sqs_adapter = SQSAdapter(
-        queue_name=config.QUEUE_NAME,
-        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
-        endpoint_url=config.ENDPOINT_URL,
-        region_name=config.REGION_NAME,
+        database_url=config.DATABASE_URL,
+        pool_size=config.DATABASE_POOL_SIZE,
+        max_overflow=config.DATABASE_MAX_OVERFLOW,
+        pool_timeout=config.DATABASE_POOL_TIMEOUT,
+        pool_recycle=config.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=config.DATABASE_POOL_PRE_PING,
+        statement_timeout=config.DATABASE_STATEMENT_TIMEOUT,
+        read_model=config.PRODUCT_READ_MODEL_ENABLED,
     )
+    try:
+        categories = await product_postgres_adapter.warm_category_cache()
+        logger.info(f"Category cache warmed with {categories} categories")
+    except Exception as error:
+        # Writes fill the cache on their first miss instead.
+        logger.error(f"Error warming the category cache: {error}")
+    if config.PRODUCT_READ_MODEL_ENABLED:
+        # Catch up on the writes made while the read model was disabled.
+        refreshed = await product_postgres_adapter.sync_read_model()
+        logger.info(f"Read model synced, {refreshed} products refreshed")
+    metrics_sources = {
+        "database_pool": product_postgres_adapter.pool_status,
+    }
+    sqs_adapter: SQSAdapter
+    if config.SQS_PUBLISH_BUFFERED:
+        sqs_adapter = BufferedSQSAdapter(
+            queue_name=config.QUEUE_NAME,
+            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+            endpoint_url=config.ENDPOINT_URL,
+            region_name=config.REGION_NAME,
+            max_retries=config.SQS_PUBLISH_MAX_RETRIES,
+            max_buffer_size=config.SQS_PUBLISH_BUFFER_SIZE,
+            flush_interval=config.SQS_PUBLISH_FLUSH_INTERVAL,
+        )
+        metrics_sources["event_publisher"] = sqs_adapter.stats
+    else:
+        sqs_adapter = SQSAdapter(
+            queue_name=config.QUEUE_NAME,
+            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+            endpoint_url=config.ENDPOINT_URL,
+            region_name=config.REGION_NAME,
+            max_retries=config.SQS_PUBLISH_MAX_RETRIES,
+        )
+    product_repository = product_postgres_adapter
+    app.state.redis_product_cache = None
+    if config.PRODUCT_CACHE_ENABLED:
+        in_memory_product_cache = InMemoryProductCache(
+            max_size=config.PRODUCT_CACHE_MAX_SIZE,
+            ttl=config.PRODUCT_CACHE_TTL,
+        )
+        product_caches: List[ProductCache] = [in_memory_product_cache]
+        if config.REDIS_URL:
+            app.state.redis_product_cache = RedisProductCache(
+                redis_url=config.REDIS_URL, ttl=config.REDIS_PRODUCT_CACHE_TTL
+            )
+            # Drop this worker's copy when another worker changes it.
+            app.state.redis_product_cache.start_invalidation_listener(
+                in_memory_product_cache.delete
+            )
+            product_caches.append(app.state.redis_product_cache)
+        product_repository = CachedProductRepository(
+            product_repository=product_postgres_adapter,
+            product_caches=product_caches,
+        )
+        metrics_sources["product_cache"] = product_repository.stats
     catalogue_service = CatalogueService(
         product_event_publisher=sqs_adapter,
-        product_repository=product_postgres_adapter,
+        product_repository=product_repository,
     )
     http_api_adapter = HTTPApiAdapter(catalogue_service=catalogue_service)
     app.include_router(http_api_adapter.router)
+    outbox_relay_adapter = OutboxRelayAdapter(
+        catalogue_service=catalogue_service,
+        batch_size=config.OUTBOX_RELAY_BATCH_SIZE,
+        poll_interval=config.OUTBOX_RELAY_POLL_INTERVAL,
+    )
+    outbox_relay_adapter.start()
+    metrics_sources["outbox_relay"] = outbox_relay_adapter.stats
+    metrics_http_api_adapter = MetricsHTTPApiAdapter(
+        metrics_sources=metrics_sources
+    )
+    app.include_router(metrics_http_api_adapter.router)
+    app.state.product_postgres_adapter = product_postgres_adapter
+    app.state.outbox_relay_adapter = outbox_relay_adapter
+    app.state.sqs_adapter = sqs_adapter
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await app.state.outbox_relay_adapter.stop()
+    if isinstance(app.state.sqs_adapter, BufferedSQSAdapter):
+        # Joins the flush thread, keep it off the event loop.
+        await asyncio.to_thread(app.state.sqs_adapter.close)
+    await app.state.product_postgres_adapter.dispose()
+    if app.state.redis_product_cache is not None:
+        await app.state.redis_product_cache.close()
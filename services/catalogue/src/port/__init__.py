@@ -1,4 +1,5 @@
+from .caches import ProductCache
 from .event_publishers import ProductEventPublisher
 from .repositories import ProductRepository
 
-__all__ = ["ProductEventPublisher", "ProductRepository"]
+__all__ = ["ProductCache", "ProductEventPublisher", "ProductRepository"]
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from src.domain.entities.product import Product
+
+
+class ProductCache(ABC):
+    @abstractmethod
+    async def get(self, sku: str) -> Optional[Product]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(
+        self, product: Product, generation: Optional[int] = None
+    ) -> None:
+        """
+        Cache ``product``, only if the SKU was not invalidated since
+        ``generation`` was read when it is given.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, sku: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def generation(self, sku: str) -> int:
+        """Return a value that changes every time ``sku`` is deleted."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
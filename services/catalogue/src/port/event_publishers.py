@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 from src.domain.events import ProductEvent
 
@@ -7,3 +8,7 @@ class ProductEventPublisher(ABC):
     @abstractmethod
     def publish(self, product_event: ProductEvent) -> None:
         raise NotImplementedError
+
+    @abstractmethod
+    def publish_batch(self, product_events: List[ProductEvent]) -> None:
+        raise NotImplementedError
@@ -1,11 +1,24 @@
 from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
 
 from src.domain.entities.product import Product
+from src.domain.enums import InventoryOperation, ProductImportStatus
+from src.domain.events import ProductEvent
+from src.domain.value_objects import Inventory
 
 
 class ProductRepository(ABC):
     @abstractmethod
-    def create_product(
+    async def create_product(
         self,
         product: Product,
         on_duplicate_sku: Exception,
@@ -14,11 +27,39 @@ class ProductRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_product_by_sku(self, sku: str, on_not_found: Exception) -> Product:
+    async def create_products(
+        self, products: List[Product], batch_size: int
+    ) -> List[ProductImportStatus]:
         raise NotImplementedError
 
     @abstractmethod
-    def update_product(
+    async def get_product_version(
+        self, sku: str, on_not_found: Exception
+    ) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_product_by_sku(
+        self, sku: str, on_not_found: Exception
+    ) -> Product:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_products_by_skus(self, skus: List[str]) -> List[Product]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_products(
+        self, after_sku: Optional[str], limit: int
+    ) -> List[Product]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_products(self, batch_size: int) -> AsyncIterator[Product]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_product(
         self,
         product: Product,
         on_not_found: Exception,
@@ -28,5 +69,45 @@ class ProductRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def delete_product(self, sku, on_not_found: Exception) -> bool:
+    async def patch_product(
+        self,
+        sku: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int],
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        on_invalid_inventory: Exception,
+    ) -> Product:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reprice_category(
+        self,
+        category_name: str,
+        discount_percent: Decimal,
+        on_not_found: Exception,
+    ) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_product(self, sku, on_not_found: Exception) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def adjust_inventory(
+        self,
+        operation: InventoryOperation,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient_inventory: Exception,
+    ) -> Dict[str, Inventory]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def relay_product_events(
+        self,
+        handler: Callable[[List[ProductEvent]], Awaitable[None]],
+        batch_size: int,
+        handler_timeout: Optional[float] = None,
+    ) -> int:
         raise NotImplementedError
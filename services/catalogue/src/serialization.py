@@ -0,0 +1,25 @@
+from decimal import Decimal
+from typing import Any, Union
+
+import orjson
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode ``value`` as JSON bytes.
+
+    Shared by the HTTP responses and the published events. UUIDs and
+    datetimes are encoded natively, Decimals as JSON numbers.
+    """
+    return orjson.dumps(value, default=_default)
+
+
+def loads(value: Union[bytes, str]) -> Any:
+    """Decode JSON written by ``dumps``, Decimals come back as floats."""
+    return orjson.loads(value)
@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import Mock, patch
 from uuid import uuid4
@@ -11,16 +12,20 @@ from src.adapter.dto import (
     ProductRequestDTO,
     ProductResponseDTO,
 )
-from src.adapter.http_api import HTTPApiAdapter
+from src.adapter.http_api import HTTPApiAdapter, MetricsHTTPApiAdapter
 from src.domain.entities import Category, Product
+from src.domain.enums import InventoryOperation, ProductImportStatus
 from src.domain.exceptions import (
+    CategoryNotFound,
+    InsufficientInventory,
     InvalidSku,
     OutdatedProduct,
     ProductAlreadyExist,
     ProductNotFound,
+    TooManySkus,
 )
 from src.domain.services import CatalogueService
-from src.domain.value_objects import Inventory, Price
+from src.domain.value_objects import Inventory, Price, ProductImportResult
 
 
 class TestHTTPApiAdapter(unittest.TestCase):
@@ -142,6 +147,77 @@ class TestHTTPApiAdapter(unittest.TestCase):
         )
         mock_logger_error.assert_called_once()
 
+    def test_should_create_products(self) -> None:
+        products_request = [
+            ProductRequestDTO(
+                sku="123456",
+                name="test_name",
+                description="test_description",
+            ).model_dump(),
+            ProductRequestDTO(
+                sku="1",
+                name="test_name",
+                description="test_description",
+            ).model_dump(),
+        ]
+        self.catalogue_service_mock.create_products.return_value = [
+            ProductImportResult(
+                sku="123456", status=ProductImportStatus.CREATED
+            ),
+            ProductImportResult(
+                sku="1",
+                status=ProductImportStatus.INVALID,
+                message="Sku can not have less than 3 characters.",
+            ),
+        ]
+
+        response = self.client.post("/products:bulk", json=products_request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            [
+                {"sku": "123456", "status": "created", "message": None},
+                {
+                    "sku": "1",
+                    "status": "invalid",
+                    "message": "Sku can not have less than 3 characters.",
+                },
+            ],
+        )
+        self.catalogue_service_mock.create_products.assert_called_once_with(
+            products=products_request
+        )
+
+    def test_should_report_malformed_products_as_invalid(self) -> None:
+        valid_product = ProductRequestDTO(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+        ).model_dump()
+        products_request = [
+            {"sku": "654321", "description": "test_description"},
+            valid_product,
+            "not a product",
+        ]
+        self.catalogue_service_mock.create_products.return_value = [
+            ProductImportResult(
+                sku="123456", status=ProductImportStatus.CREATED
+            ),
+        ]
+
+        response = self.client.post("/products:bulk", json=products_request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["sku"], row["status"]) for row in response.json()],
+            [("654321", "invalid"), ("123456", "created"), ("", "invalid")],
+        )
+        self.assertIn("name", response.json()[0]["message"])
+        self.catalogue_service_mock.create_products.assert_called_once_with(
+            products=[valid_product]
+        )
+
     def test_should_get_product_by_sku(self) -> None:
         id_ = uuid4()
         product = Product(
@@ -175,6 +251,173 @@ class TestHTTPApiAdapter(unittest.TestCase):
             {**expected_response, "id": str(expected_response["id"])},
         )
 
+    def test_should_send_etag_with_product(self) -> None:
+        self.catalogue_service_mock.get_product_by_sku.return_value = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+            version=3,
+        )
+
+        response = self.client.get("/product/123456")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], '"3"')
+        self.assertEqual(response.json()["version"], 3)
+
+    def test_should_encode_decimal_price_as_json_number(self) -> None:
+        self.catalogue_service_mock.get_product_by_sku.return_value = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+            price=Price(value="19.99", discount_percent="0.1"),
+        )
+
+        response = self.client.get("/product/123456")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertEqual(
+            response.json()["price"],
+            {"value": 19.99, "discount_percent": 0.1},
+        )
+
+    def test_should_answer_not_modified_from_version(self) -> None:
+        self.catalogue_service_mock.get_product_version.return_value = 3
+
+        response = self.client.get(
+            "/product/123456", headers={"If-None-Match": 'W/"3"'}
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], '"3"')
+        self.catalogue_service_mock.get_product_by_sku.assert_not_called()
+
+    def test_should_return_changed_product_for_stale_etag(self) -> None:
+        self.catalogue_service_mock.get_product_version.return_value = 4
+        self.catalogue_service_mock.get_product_by_sku.return_value = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+            version=4,
+        )
+
+        response = self.client.get(
+            "/product/123456", headers={"If-None-Match": '"3"'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], '"4"')
+
+    def test_should_get_products_by_skus(self) -> None:
+        product = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+        )
+        self.catalogue_service_mock.get_products_by_skus.return_value = (
+            [product],
+            ["654321"],
+        )
+
+        response = self.client.get("/products:batch?sku=123456&sku=654321")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["sku"] for item in response.json()["products"]], ["123456"]
+        )
+        self.assertEqual(response.json()["missing"], ["654321"])
+        get_products_by_skus = self.catalogue_service_mock.get_products_by_skus
+        get_products_by_skus.assert_called_once_with(skus=["123456", "654321"])
+
+    def test_should_lookup_products(self) -> None:
+        self.catalogue_service_mock.get_products_by_skus.return_value = (
+            [],
+            ["123456"],
+        )
+
+        response = self.client.post(
+            "/products:batch", json={"skus": ["123456"]}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"products": [], "missing": ["123456"]}
+        )
+
+    @patch("logging.Logger.error")
+    def test_lookup_products_should_raise_too_many_skus(
+        self, mock_logger_error: Mock
+    ) -> None:
+        self.catalogue_service_mock.get_products_by_skus.side_effect = (
+            TooManySkus("Too many skus")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            self.client.post("/products:batch", json={"skus": ["123456"]})
+
+        self.assertEqual(context.exception.status_code, 400)
+        mock_logger_error.assert_called_once()
+
+    def test_should_list_products(self) -> None:
+        product = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+        )
+        self.catalogue_service_mock.list_products.return_value = (
+            [product],
+            "123456",
+        )
+
+        first_page = self.client.get("/products?limit=1")
+        next_cursor = first_page.json()["next_cursor"]
+        self.client.get(f"/products?limit=1&cursor={next_cursor}")
+
+        self.assertEqual(first_page.status_code, 200)
+        self.assertEqual(
+            [item["sku"] for item in first_page.json()["products"]],
+            ["123456"],
+        )
+        self.catalogue_service_mock.list_products.assert_called_with(
+            after_sku="123456", limit=1
+        )
+
+    @patch("logging.Logger.error")
+    def test_list_products_should_raise_invalid_cursor(
+        self, mock_logger_error: Mock
+    ) -> None:
+        with self.assertRaises(HTTPException) as context:
+            self.client.get("/products?cursor=not-base64!")
+
+        self.assertEqual(context.exception.status_code, 400)
+        self.catalogue_service_mock.list_products.assert_not_called()
+
+    def test_should_export_products(self) -> None:
+        products = [
+            Product(sku=sku, name="test_name", description="test_description")
+            for sku in ["123456", "654321"]
+        ]
+
+        async def export_products():
+            for product in products:
+                yield product
+
+        self.catalogue_service_mock.export_products.return_value = (
+            export_products()
+        )
+
+        response = self.client.get("/products/export")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["content-type"], "application/x-ndjson"
+        )
+        lines = response.text.splitlines()
+        self.assertEqual(
+            [json.loads(line)["sku"] for line in lines], ["123456", "654321"]
+        )
+
     @patch("logging.Logger.error")
     def test_get_product_by_sku_should_raise_not_found(
         self, mock_logger_error: Mock
@@ -292,6 +535,74 @@ class TestHTTPApiAdapter(unittest.TestCase):
         self.assertIn("Product not found", context.exception.detail)
         mock_logger_error.assert_called_once()
 
+    def test_should_patch_product(self) -> None:
+        updated_product = Product(
+            sku="123456",
+            name="updated_name",
+            description="description",
+            inventory=Inventory(quantity=25, reserved=0),
+        )
+        self.catalogue_service_mock.patch_product.return_value = (
+            updated_product
+        )
+
+        response = self.client.patch(
+            "/product/123456",
+            json={"inventory": {"quantity": 25}, "version": 3},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inventory"]["quantity"], 25)
+        call = self.catalogue_service_mock.patch_product.call_args.kwargs
+        self.assertEqual(call["sku"], "123456")
+        self.assertEqual(call["version"], 3)
+        self.assertEqual(list(call["changes"]), ["inventory"])
+        self.assertEqual(call["changes"]["inventory"], {"quantity": 25})
+
+    @patch("logging.Logger.error")
+    def test_patch_product_should_raise_outdated_version(
+        self, mock_logger_error: Mock
+    ) -> None:
+        self.catalogue_service_mock.patch_product.side_effect = (
+            OutdatedProduct("Outdated version")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            self.client.patch(
+                "/product/123456", json={"name": "new_name", "version": 1}
+            )
+
+        self.assertEqual(context.exception.status_code, 409)
+        mock_logger_error.assert_called_once()
+
+    @patch("logging.Logger.error")
+    def test_update_product_should_fail_precondition(
+        self, mock_logger_error: Mock
+    ) -> None:
+        product_request = ProductRequestDTO(
+            sku="123456",
+            name="updated_name",
+            description="updated_description",
+        )
+        self.catalogue_service_mock.update_product.side_effect = (
+            OutdatedProduct("Outdated version")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            self.client.put(
+                "/product/123456",
+                json=product_request.model_dump(),
+                headers={"If-Match": '"3"'},
+            )
+
+        self.assertEqual(context.exception.status_code, 412)
+        self.assertEqual(
+            self.catalogue_service_mock.update_product.call_args.kwargs[
+                "version"
+            ],
+            3,
+        )
+
     @patch("logging.Logger.error")
     def test_update_product_should_raise_invalid_sku(
         self, mock_logger_error: Mock
@@ -364,6 +675,88 @@ class TestHTTPApiAdapter(unittest.TestCase):
         )
         mock_logger_error.assert_called_once()
 
+    def test_should_reprice_category(self) -> None:
+        self.catalogue_service_mock.reprice_category.return_value = [
+            "123456",
+            "654321",
+        ]
+
+        response = self.client.post(
+            "/category/electronics:reprice", json={"discount_percent": 0.15}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "category": "electronics",
+                "discount_percent": 0.15,
+                "repriced": 2,
+            },
+        )
+        self.catalogue_service_mock.reprice_category.assert_called_once_with(
+            category_name="electronics", discount_percent=0.15
+        )
+
+    @patch("logging.Logger.error")
+    def test_reprice_category_should_raise_not_found(
+        self, mock_logger_error: Mock
+    ) -> None:
+        self.catalogue_service_mock.reprice_category.side_effect = (
+            CategoryNotFound("Category not found")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            self.client.post(
+                "/category/unknown:reprice", json={"discount_percent": 0.15}
+            )
+
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_should_reserve_inventory(self) -> None:
+        self.catalogue_service_mock.adjust_inventory.return_value = {
+            "123456": Inventory(quantity=10, reserved=3)
+        }
+
+        response = self.client.post(
+            "/inventory:reserve",
+            json={
+                "items": [
+                    {"sku": "123456", "quantity": 2},
+                    {"sku": "123456", "quantity": 1},
+                ]
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"items": [{"sku": "123456", "quantity": 10, "reserved": 3}]},
+        )
+        self.catalogue_service_mock.adjust_inventory.assert_called_once_with(
+            operation=InventoryOperation.RESERVE,
+            items=[
+                {"sku": "123456", "quantity": 2},
+                {"sku": "123456", "quantity": 1},
+            ],
+        )
+
+    @patch("logging.Logger.error")
+    def test_reserve_inventory_should_raise_insufficient_inventory(
+        self, mock_logger_error: Mock
+    ) -> None:
+        self.catalogue_service_mock.adjust_inventory.side_effect = (
+            InsufficientInventory("Not enough inventory")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            self.client.post(
+                "/inventory:commit",
+                json={"items": [{"sku": "123456", "quantity": 2}]},
+            )
+
+        self.assertEqual(context.exception.status_code, 409)
+
     def test_delete_product(self):
         response = self.client.delete("/product/123456")
 
@@ -412,5 +805,20 @@ class TestHTTPApiAdapter(unittest.TestCase):
         mock_logger_error.assert_called_once()
 
 
+class TestMetricsHTTPApiAdapter(unittest.TestCase):
+    def test_should_get_metrics(self) -> None:
+        metrics_api_adapter = MetricsHTTPApiAdapter(
+            metrics_sources={"database_pool": lambda: {"checked_out": 2}}
+        )
+        client = TestClient(metrics_api_adapter.router)
+
+        response = client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"database_pool": {"checked_out": 2}}
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,355 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.adapter.cache import CachedProductRepository, InMemoryProductCache
+from src.domain.entities import Product
+from src.domain.enums import InventoryOperation
+from src.port.caches import ProductCache
+from src.port.repositories import ProductRepository
+from tests.helpers.product import ProductHelper
+
+
+class TestInMemoryProductCache(unittest.IsolatedAsyncioTestCase):
+    async def test_should_get_cached_product(self):
+        # Arrange
+        cache = InMemoryProductCache(max_size=10, ttl=60)
+        mock_product = ProductHelper.create_product()
+        await cache.set(mock_product)
+
+        # Act
+        product = await cache.get(mock_product.sku)
+
+        # Assert
+        self.assertIs(product, mock_product)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    async def test_should_evict_least_recently_used_product(self):
+        # Arrange
+        cache = InMemoryProductCache(max_size=1, ttl=60)
+        first_product = ProductHelper.create_product()
+        second_product = Product(
+            sku="other_sku", name="Other Product", description="Other"
+        )
+
+        # Act
+        await cache.set(first_product)
+        await cache.set(second_product)
+
+        # Assert
+        self.assertIsNone(await cache.get(first_product.sku))
+        self.assertIs(await cache.get(second_product.sku), second_product)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    @patch("src.adapter.cache.time.monotonic")
+    async def test_should_expire_product(self, mock_monotonic: Mock):
+        # Arrange
+        cache = InMemoryProductCache(max_size=10, ttl=60)
+        mock_product = ProductHelper.create_product()
+        mock_monotonic.return_value = 0
+        await cache.set(mock_product)
+        mock_monotonic.return_value = 61
+
+        # Act
+        product = await cache.get(mock_product.sku)
+
+        # Assert
+        self.assertIsNone(product)
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    async def test_should_drop_fill_read_before_delete(self):
+        # Arrange
+        cache = InMemoryProductCache(max_size=1, ttl=60)
+        mock_product = ProductHelper.create_product()
+        generation = await cache.generation(mock_product.sku)
+        await cache.delete(mock_product.sku)
+        await cache.delete("other_sku")
+
+        # Act
+        await cache.set(mock_product, generation=generation)
+
+        # Assert
+        self.assertIsNone(await cache.get(mock_product.sku))
+        self.assertNotEqual(
+            await cache.generation(mock_product.sku), generation
+        )
+
+    async def test_should_keep_newer_product_version(self):
+        # Arrange
+        cache = InMemoryProductCache(max_size=10, ttl=60)
+        newer_product = Product(
+            sku="test_sku", name="Newer", description="Newer", version=2
+        )
+        older_product = Product(
+            sku="test_sku", name="Older", description="Older", version=1
+        )
+        await cache.set(newer_product)
+
+        # Act
+        await cache.set(older_product)
+
+        # Assert
+        self.assertIs(await cache.get("test_sku"), newer_product)
+
+
+class TestCachedProductRepository(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.product_repository = AsyncMock(spec=ProductRepository)
+        self.local_cache = InMemoryProductCache(max_size=10, ttl=60)
+        self.shared_cache = AsyncMock(spec=ProductCache)
+        self.shared_cache.get.return_value = None
+        self.shared_cache.generation.return_value = 0
+        self.repository = CachedProductRepository(
+            product_repository=self.product_repository,
+            product_caches=[self.local_cache, self.shared_cache],
+        )
+
+    async def test_should_read_through_on_miss(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.product_repository.get_product_by_sku.return_value = mock_product
+
+        # Act
+        first = await self.repository.get_product_by_sku(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+        second = await self.repository.get_product_by_sku(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+
+        # Assert
+        self.assertIs(first, mock_product)
+        self.assertIs(second, mock_product)
+        self.product_repository.get_product_by_sku.assert_called_once()
+        self.shared_cache.set.assert_called_once_with(
+            mock_product, generation=0
+        )
+
+    async def test_should_not_fill_product_invalidated_during_read(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+
+        async def read_racing_a_write(sku, on_not_found):
+            await self.local_cache.delete(sku)
+            self.shared_cache.generation.return_value = 1
+            return mock_product
+
+        self.product_repository.get_product_by_sku.side_effect = (
+            read_racing_a_write
+        )
+
+        # Act
+        product = await self.repository.get_product_by_sku(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+
+        # Assert
+        self.assertIs(product, mock_product)
+        self.assertIsNone(await self.local_cache.get(mock_product.sku))
+        self.shared_cache.set.assert_called_once_with(
+            mock_product, generation=0
+        )
+
+    async def test_should_backfill_local_cache_from_shared_cache(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.shared_cache.get.return_value = mock_product
+
+        # Act
+        product = await self.repository.get_product_by_sku(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+
+        # Assert
+        self.assertIs(product, mock_product)
+        self.product_repository.get_product_by_sku.assert_not_called()
+        self.assertIs(await self.local_cache.get(mock_product.sku), product)
+
+    async def test_should_ignore_failing_cache(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.shared_cache.get.side_effect = Exception("Redis down")
+        self.product_repository.get_product_by_sku.return_value = mock_product
+
+        # Act
+        product = await self.repository.get_product_by_sku(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+
+        # Assert
+        self.assertIs(product, mock_product)
+
+    async def test_should_get_only_uncached_products_from_repository(self):
+        # Arrange
+        cached_product = ProductHelper.create_product()
+        other_product = Product(
+            sku="other_sku", name="Other Product", description="Other"
+        )
+        await self.local_cache.set(cached_product)
+        self.product_repository.get_products_by_skus.return_value = [
+            other_product
+        ]
+
+        # Act
+        products = await self.repository.get_products_by_skus(
+            skus=[cached_product.sku, other_product.sku]
+        )
+
+        # Assert
+        self.assertEqual(products, [cached_product, other_product])
+        self.product_repository.get_products_by_skus.assert_called_once_with(
+            skus=[other_product.sku]
+        )
+
+    async def test_should_invalidate_on_delete(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        await self.local_cache.set(mock_product)
+        self.product_repository.delete_product.return_value = True
+
+        # Act
+        await self.repository.delete_product(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+
+        # Assert
+        self.assertIsNone(await self.local_cache.get(mock_product.sku))
+        self.shared_cache.delete.assert_called_once_with(mock_product.sku)
+        self.assertEqual(self.repository.stats()["invalidations"], 1)
+
+    async def test_should_refresh_cache_on_patch(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.product_repository.patch_product.return_value = mock_product
+
+        # Act
+        await self.repository.patch_product(
+            sku=mock_product.sku,
+            changes={"name": mock_product.name},
+            expected_version=None,
+            on_not_found=Exception,
+            on_outdated_version=Exception,
+            on_invalid_inventory=Exception,
+        )
+
+        # Assert
+        self.shared_cache.delete.assert_called_once_with(mock_product.sku)
+        self.assertEqual(
+            await self.local_cache.get(mock_product.sku), mock_product
+        )
+
+    async def test_should_invalidate_repriced_products(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        await self.local_cache.set(mock_product)
+        self.product_repository.reprice_category.return_value = [
+            mock_product.sku
+        ]
+
+        # Act
+        await self.repository.reprice_category(
+            category_name="Test Category",
+            discount_percent=Decimal("0.15"),
+            on_not_found=Exception,
+        )
+
+        # Assert
+        self.assertIsNone(await self.local_cache.get(mock_product.sku))
+        self.shared_cache.delete.assert_called_once_with(mock_product.sku)
+
+    async def test_should_read_version_from_cache(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        cached_product = Product(
+            sku=mock_product.sku,
+            name=mock_product.name,
+            description=mock_product.description,
+            version=2,
+        )
+        await self.local_cache.set(cached_product)
+
+        # Act
+        version = await self.repository.get_product_version(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+
+        # Assert
+        self.assertEqual(version, 2)
+        self.product_repository.get_product_version.assert_not_called()
+
+    async def test_should_invalidate_on_inventory_adjustment(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        await self.local_cache.set(mock_product)
+        self.product_repository.adjust_inventory.side_effect = ValueError()
+
+        # Act
+        with self.assertRaises(ValueError):
+            await self.repository.adjust_inventory(
+                operation=InventoryOperation.RESERVE,
+                quantities={mock_product.sku: 1},
+                on_not_found=KeyError(),
+                on_insufficient_inventory=ValueError(),
+            )
+
+        # Assert
+        self.assertIsNone(await self.local_cache.get(mock_product.sku))
+        self.shared_cache.delete.assert_called_once_with(mock_product.sku)
+
+    async def test_should_revalidate_version_after_reservation(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        cached_product = Product(
+            sku=mock_product.sku,
+            name=mock_product.name,
+            description=mock_product.description,
+            version=3,
+        )
+        await self.local_cache.set(cached_product)
+        self.product_repository.get_product_version.return_value = 4
+
+        # Act
+        await self.repository.adjust_inventory(
+            operation=InventoryOperation.RESERVE,
+            quantities={mock_product.sku: 1},
+            on_not_found=KeyError(),
+            on_insufficient_inventory=ValueError(),
+        )
+        version = await self.repository.get_product_version(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+
+        # Assert
+        self.assertEqual(version, 4)
+        self.product_repository.get_product_version.assert_called_once()
+
+    async def test_should_refresh_cache_on_update(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        updated_product = Product(
+            sku=mock_product.sku,
+            name="Updated",
+            description="Updated",
+            version=1,
+        )
+        await self.local_cache.set(mock_product)
+        self.product_repository.update_product.return_value = updated_product
+
+        # Act
+        await self.repository.update_product(
+            product=updated_product,
+            on_not_found=Exception,
+            on_outdated_version=Exception,
+            on_duplicate=Exception,
+        )
+
+        # Assert
+        self.assertIs(
+            await self.local_cache.get(mock_product.sku), updated_product
+        )
+        self.shared_cache.delete.assert_called_once_with(mock_product.sku)
+        self.shared_cache.set.assert_called_once_with(updated_product)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ from pydantic import ValidationError
 from src.adapter.dto import (
     CategoryDTO,
     InventoryDTO,
+    InventoryPatchDTO,
     PriceDTO,
     ProductRequestDTO,
     ProductResponseDTO,
@@ -19,6 +20,15 @@ class TestDTOs(unittest.TestCase):
         self.assertEqual(inventory.quantity, 10)
         self.assertEqual(inventory.reserved, 5)
 
+    def test_inventory_patch_dto_should_only_hold_sent_fields(self):
+        # Arrange
+        inventory = InventoryPatchDTO(quantity=10)
+        # Assert
+        self.assertIsNone(inventory.reserved)
+        self.assertEqual(
+            inventory.model_dump(exclude_unset=True), {"quantity": 10}
+        )
+
     def test_price_dto(self):
         # Arrange
         price = PriceDTO(value=99.99, discount_percent=10.0)
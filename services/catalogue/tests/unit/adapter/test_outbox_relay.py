@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+from src.adapter.outbox_relay import OutboxRelayAdapter
+from src.domain.services import CatalogueService
+
+
+class TestOutboxRelayAdapter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.catalogue_service_mock = Mock(spec=CatalogueService)
+        self.outbox_relay_adapter = OutboxRelayAdapter(
+            catalogue_service=self.catalogue_service_mock,
+            batch_size=10,
+            poll_interval=0,
+        )
+
+    async def test_should_relay_once(self) -> None:
+        # Arrange
+        self.catalogue_service_mock.relay_product_events.return_value = 3
+
+        # Act
+        relayed_rows = await self.outbox_relay_adapter.relay_once()
+
+        # Assert
+        self.assertEqual(relayed_rows, 3)
+        relay_product_events = self.catalogue_service_mock.relay_product_events
+        relay_product_events.assert_called_once_with(batch_size=10)
+        self.assertEqual(self.outbox_relay_adapter.stats()["relayed_rows"], 3)
+
+    async def test_should_count_failed_batches(self) -> None:
+        # Arrange
+        self.catalogue_service_mock.relay_product_events.side_effect = (
+            Exception("Database down")
+        )
+
+        # Act
+        relayed_rows = await self.outbox_relay_adapter.relay_once()
+
+        # Assert
+        self.assertEqual(relayed_rows, 0)
+        self.assertEqual(
+            self.outbox_relay_adapter.stats()["failed_batches"], 1
+        )
+
+    async def test_should_run_until_stopped(self) -> None:
+        # Arrange
+        self.catalogue_service_mock.relay_product_events.return_value = 0
+
+        # Act
+        self.outbox_relay_adapter.start()
+        await asyncio.sleep(0.01)
+        await self.outbox_relay_adapter.stop()
+        calls = self.catalogue_service_mock.relay_product_events.call_count
+        await asyncio.sleep(0.01)
+
+        # Assert
+        self.assertGreater(calls, 0)
+        self.assertEqual(
+            self.catalogue_service_mock.relay_product_events.call_count, calls
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,28 +1,61 @@
+import asyncio
 import unittest
-from unittest.mock import Mock, patch
+from collections import namedtuple
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from uuid import uuid4
 
-from sqlalchemy.engine.cursor import CursorResult
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from src.adapter.exceptions import DatabaseException
 from src.adapter.postgres import ProductPostgresAdapter
+from src.domain.entities import Product
+from src.domain.enums import (
+    InventoryOperation,
+    ProductEventType,
+    ProductImportStatus,
+)
 from tests.helpers.product import ProductHelper
 
+OutboxRow = namedtuple(
+    "OutboxRow",
+    ["id", "event_type", "sku", "product_id", "version"],
+    defaults=[None, None],
+)
+CategoryRow = namedtuple("CategoryRow", ["id", "name"])
+InventoryRow = namedtuple(
+    "InventoryRow", ["sku", "id", "quantity", "reserved"]
+)
 
-class TestProductPostgresAdapter(unittest.TestCase):
 
-    @patch("src.adapter.postgres.create_engine")
+class TestProductPostgresAdapter(unittest.IsolatedAsyncioTestCase):
+
+    @patch("src.adapter.postgres.create_async_engine")
     @patch("src.adapter.postgres.MetaData")
-    @patch("src.adapter.postgres.sessionmaker")
+    @patch("src.adapter.postgres.async_sessionmaker")
     def setUp(self, mock_sessionmaker, mock_metadata, mock_engine):
         self.mock_engine = mock_engine
         self.mock_metadata = mock_metadata
         self.mock_sessionmaker = mock_sessionmaker
+        self.mock_session = AsyncMock()
+        self.mock_session.execute.return_value = MagicMock()
+        mock_sessionmaker.return_value.return_value = self.mock_session
         mock_db_url = "mock_db_url"
         self.adapter = ProductPostgresAdapter(mock_db_url)
 
-    @patch("src.adapter.postgres.create_engine")
+    async def warm_categories(self, *categories) -> None:
+        self.mock_session.execute.return_value.fetchall = Mock(
+            return_value=[
+                CategoryRow(category.id, category.name)
+                for category in categories
+            ]
+        )
+        await self.adapter.warm_category_cache()
+        self.mock_session.reset_mock()
+
+    @patch("src.adapter.postgres.create_async_engine")
     @patch("src.adapter.postgres.MetaData")
-    @patch("src.adapter.postgres.sessionmaker")
+    @patch("src.adapter.postgres.async_sessionmaker")
     def should_init_adapter(
         self, mock_sessionmaker: Mock, mock_metadata: Mock, mock_engine: Mock
     ):
@@ -37,24 +70,50 @@ class TestProductPostgresAdapter(unittest.TestCase):
         mock_metadata.assert_called_once()
         mock_engine.assert_called_once()
 
-    def test_should_create_product(self):
+    def test_should_report_pool_status(self):
+        # Arrange
+        pool = self.mock_engine.return_value.pool
+        pool.size.return_value = 5
+        pool.checkedin.return_value = 3
+        pool.checkedout.return_value = 2
+        pool.overflow.return_value = -3
+        pool.checkouts = 4
+        pool.checkout_timeouts = 0
+        pool.wait_seconds_total = 0.2
+        pool.wait_seconds_max = 0.1
+
+        # Act
+        status = self.adapter.pool_status()
+
+        # Assert
+        self.assertEqual(status["size"], 5)
+        self.assertEqual(status["checked_out"], 2)
+        self.assertEqual(status["checkouts"], 4)
+        self.assertAlmostEqual(status["wait_seconds_avg"], 0.05)
+        self.assertEqual(status["wait_seconds_max"], 0.1)
+
+    async def test_should_create_product(self):
         # Arrange
         mock_product = ProductHelper.create_product()
-        self.mock_sessionmaker.return_value.execute.return_value = Mock(
-            inserted_primary_key=[mock_product.id]
+        await self.warm_categories(mock_product.category)
+        mock_product_tuple = ProductHelper.create_product_tuple(
+            product=mock_product
         )
-        self.adapter.get_product_by_sku = Mock(return_value=mock_product)
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=mock_product_tuple
+        )
+        self.adapter.get_product_by_sku = AsyncMock(return_value=mock_product)
 
         # Act
-        created_product = self.adapter.create_product(
+        created_product = await self.adapter.create_product(
             mock_product, on_duplicate_sku=Exception, on_not_found=Exception
         )
 
         # Assert
-        self.assertEqual(
-            self.mock_sessionmaker.return_value().execute.call_count, 4
-        )
-        self.adapter.get_product_by_sku.assert_called_once()
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+        self.assertEqual(self.mock_session.commit.call_count, 1)
+        self.adapter.get_product_by_sku.assert_not_called()
+        self.assertEqual(created_product.id, mock_product.id)
         self.assertEqual(created_product.sku, mock_product.sku)
         self.assertEqual(created_product.name, mock_product.name)
         self.assertEqual(created_product.description, mock_product.description)
@@ -70,150 +129,152 @@ class TestProductPostgresAdapter(unittest.TestCase):
             created_product.category.name, mock_product.category.name
         )
 
-    def test_should_handle_create_product_insert_price_fail(self):
+    async def test_should_upsert_uncached_category_once(self):
         # Arrange
         mock_product = ProductHelper.create_product()
-        self.mock_sessionmaker.return_value.execute.return_value = Mock(
-            inserted_primary_key=[mock_product.id]
+        category_id = uuid4()
+        self.mock_session.execute.return_value.fetchall = Mock(
+            return_value=[CategoryRow(category_id, mock_product.category.name)]
         )
-        self.adapter.get_product_by_sku = Mock(return_value=mock_product)
-        mock_row = Mock(spec=CursorResult)
-        mock_row.inserted_primary_key = "id"
-
-        self.mock_sessionmaker.return_value().execute.side_effect = [
-            None,
-            mock_row,
-            mock_row,
-            mock_row,
-        ]
-
-        # Act & Assert
-        with self.assertRaises(DatabaseException):
-            self.adapter.create_product(
-                mock_product,
-                on_duplicate_sku=Exception,
-                on_not_found=Exception,
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=ProductHelper.create_product_tuple(
+                product=mock_product
             )
-
-        # Assert
-        self.assertEqual(
-            self.mock_sessionmaker.return_value().execute.call_count, 1
         )
 
-    def test_should_handle_create_product_insert_inventory_fail(self):
-        # Arrange
-        mock_product = ProductHelper.create_product()
-        self.mock_sessionmaker.return_value.execute.return_value = Mock(
-            inserted_primary_key=[mock_product.id]
+        # Act
+        await self.adapter.create_product(
+            mock_product, on_duplicate_sku=Exception, on_not_found=Exception
+        )
+        await self.adapter.create_product(
+            mock_product, on_duplicate_sku=Exception, on_not_found=Exception
         )
-        self.adapter.get_product_by_sku = Mock(return_value=mock_product)
-        mock_row = Mock(spec=CursorResult)
-        mock_row.inserted_primary_key = "id"
-
-        self.mock_sessionmaker.return_value().execute.side_effect = [
-            mock_row,
-            None,
-            mock_row,
-            mock_row,
-        ]
-
-        # Act & Assert
-        with self.assertRaises(DatabaseException):
-            self.adapter.create_product(
-                mock_product,
-                on_duplicate_sku=Exception,
-                on_not_found=Exception,
-            )
 
         # Assert
-        self.assertEqual(
-            self.mock_sessionmaker.return_value().execute.call_count, 2
-        )
+        # The first create upserts the category and commits it on its own,
+        # the second one finds it in the map.
+        self.assertEqual(self.mock_session.execute.call_count, 3)
+        self.assertEqual(self.mock_session.commit.call_count, 3)
 
-    def test_should_handle_create_product_insert_category_fail(self):
+    async def test_should_handle_create_product_without_returned_row(self):
         # Arrange
         mock_product = ProductHelper.create_product()
-        self.mock_sessionmaker.return_value.execute.return_value = Mock(
-            inserted_primary_key=[mock_product.id]
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=None
         )
-        self.adapter.get_product_by_sku = Mock(return_value=mock_product)
-        mock_row = Mock(spec=CursorResult)
-        mock_row.inserted_primary_key = "id"
-
-        self.mock_sessionmaker.return_value().execute.side_effect = [
-            mock_row,
-            mock_row,
-            None,
-            mock_row,
-        ]
 
         # Act & Assert
         with self.assertRaises(DatabaseException):
-            self.adapter.create_product(
+            await self.adapter.create_product(
                 mock_product,
                 on_duplicate_sku=Exception,
                 on_not_found=Exception,
             )
 
-        # Assert
-        self.assertEqual(
-            self.mock_sessionmaker.return_value().execute.call_count, 3
-        )
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
 
-    def test_should_handle_create_product_database_exception(self):
+    async def test_should_handle_create_product_database_exception(self):
         # Arrange
         mock_product = ProductHelper.create_product()
-        fetchone = (
-            self.mock_sessionmaker.return_value().execute.return_value.fetchone
-        )
+        fetchone = self.mock_session.execute.return_value.fetchone
         fetchone.side_effect = Exception("Mock DB Error")
 
         # Act & Assert
         with self.assertRaises(DatabaseException):
-            self.adapter.create_product(
+            await self.adapter.create_product(
                 mock_product,
                 on_duplicate_sku=Exception,
                 on_not_found=Exception,
             )
 
-        self.assertEqual(
-            self.mock_sessionmaker.return_value().rollback.call_count, 1
-        )
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
 
-    def test_should_handle_create_product_integrity_error(self):
+    async def test_should_handle_create_product_integrity_error(self):
         # Arrange
         mock_product = ProductHelper.create_product()
-        fetchone = (
-            self.mock_sessionmaker.return_value().execute.return_value.fetchone
-        )
+        fetchone = self.mock_session.execute.return_value.fetchone
         fetchone.side_effect = IntegrityError(
             params=[], orig=Exception, statement=""
         )
 
         # Act & Assert
         with self.assertRaises(Exception):
-            self.adapter.create_product(
+            await self.adapter.create_product(
                 mock_product,
                 on_duplicate_sku=Exception,
                 on_not_found=Exception,
             )
 
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
+
+    async def test_should_create_products(self):
+        # Arrange
+        first_product = ProductHelper.create_product()
+        duplicated_product = ProductHelper.create_product()
+        await self.warm_categories(first_product.category)
+        self.mock_session.execute.side_effect = [
+            [],
+            None,
+            None,
+            [(first_product.sku,)],
+        ]
+
+        # Act
+        statuses = await self.adapter.create_products(
+            [first_product, duplicated_product], batch_size=10
+        )
+
+        # Assert
         self.assertEqual(
-            self.mock_sessionmaker.return_value().rollback.call_count, 1
+            statuses,
+            [ProductImportStatus.CREATED, ProductImportStatus.DUPLICATE],
+        )
+        self.assertEqual(self.mock_session.execute.call_count, 4)
+        self.assertEqual(self.mock_session.commit.call_count, 1)
+
+    async def test_should_create_products_skip_existing_skus(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.mock_session.execute.side_effect = [
+            [(mock_product.sku,)],
+        ]
+
+        # Act
+        statuses = await self.adapter.create_products(
+            [mock_product], batch_size=10
+        )
+
+        # Assert
+        self.assertEqual(statuses, [ProductImportStatus.DUPLICATE])
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+
+    async def test_should_handle_create_products_database_exception(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.mock_session.execute.side_effect = Exception("Mock DB Error")
+
+        # Act
+        statuses = await self.adapter.create_products(
+            [mock_product], batch_size=10
         )
 
-    def test_should_get_product_by_sku(self):
+        # Assert
+        self.assertEqual(statuses, [ProductImportStatus.FAILED])
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
+
+    async def test_should_get_product_by_sku(self):
         # Arrange
         mock_product = ProductHelper.create_product()
         mock_product_tuple = ProductHelper.create_product_tuple(
             product=mock_product
         )
-        self.mock_sessionmaker.return_value().execute.return_value.fetchone = (
-            Mock(return_value=mock_product_tuple)
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=mock_product_tuple
         )
 
         # Act
-        product = self.adapter.get_product_by_sku(
+        product = await self.adapter.get_product_by_sku(
             sku="test_sku", on_not_found=Exception
         )
 
@@ -231,44 +292,137 @@ class TestProductPostgresAdapter(unittest.TestCase):
         )
         self.assertEqual(product.category.name, mock_product.category.name)
 
-    def test_should_handle_get_product_by_sku_no_result_found(self):
+    @patch("src.adapter.postgres.create_async_engine")
+    @patch("src.adapter.postgres.MetaData")
+    @patch("src.adapter.postgres.async_sessionmaker")
+    async def test_should_get_product_by_sku_from_read_model(
+        self, mock_sessionmaker, mock_metadata, mock_engine
+    ):
         # Arrange
-        fetchone = (
-            self.mock_sessionmaker.return_value().execute.return_value.fetchone
+        mock_sessionmaker.return_value.return_value = self.mock_session
+        adapter = ProductPostgresAdapter("mock_db_url", read_model=True)
+        mock_product = ProductHelper.create_product()
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=ProductHelper.create_product_tuple(
+                product=mock_product
+            )
         )
+
+        # Act
+        product = await adapter.get_product_by_sku(
+            sku=mock_product.sku, on_not_found=Exception
+        )
+
+        # Assert
+        query = self.mock_session.execute.call_args.args[0]
+        self.assertEqual(
+            [table.name for table in query.get_final_froms()],
+            ["ProductRead"],
+        )
+        self.assertEqual(product.sku, mock_product.sku)
+        self.assertEqual(product.category.name, mock_product.category.name)
+
+    async def test_should_get_products_by_skus(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        mock_product_tuple = ProductHelper.create_product_tuple(
+            product=mock_product
+        )
+        self.mock_session.execute.return_value = [mock_product_tuple]
+
+        # Act
+        products = await self.adapter.get_products_by_skus(
+            skus=[mock_product.sku, "missing_sku"]
+        )
+
+        # Assert
+        self.assertEqual(len(products), 1)
+        self.assertEqual(products[0].sku, mock_product.sku)
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+
+    async def test_should_handle_get_products_by_skus_exception(self):
+        # Arrange
+        self.mock_session.execute.side_effect = Exception("Mock DB Error")
+
+        # Act & Assert
+        with self.assertRaises(DatabaseException):
+            await self.adapter.get_products_by_skus(skus=["test_sku"])
+
+    async def test_should_list_products(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        mock_product_tuple = ProductHelper.create_product_tuple(
+            product=mock_product
+        )
+        self.mock_session.execute.return_value = [mock_product_tuple]
+
+        # Act
+        products = await self.adapter.list_products(
+            after_sku="previous_sku", limit=10
+        )
+
+        # Assert
+        self.assertEqual([product.sku for product in products], ["test_sku"])
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+
+    async def test_should_stream_products(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        mock_product_tuple = ProductHelper.create_product_tuple(
+            product=mock_product
+        )
+        mock_result = MagicMock()
+        mock_result.__aiter__.return_value = [
+            mock_product_tuple,
+            mock_product_tuple,
+        ]
+        self.mock_session.stream.return_value = mock_result
+
+        # Act
+        products = [
+            product
+            async for product in self.adapter.stream_products(batch_size=10)
+        ]
+
+        # Assert
+        self.assertEqual(len(products), 2)
+        self.assertEqual(self.mock_session.close.call_count, 1)
+
+    async def test_should_handle_get_product_by_sku_no_result_found(self):
+        # Arrange
+        fetchone = self.mock_session.execute.return_value.fetchone
         fetchone.side_effect = NoResultFound()
 
         # Act & Assert
         with self.assertRaises(Exception):
-            self.adapter.get_product_by_sku(
+            await self.adapter.get_product_by_sku(
                 sku="test_sku",
                 on_not_found=Exception,
             )
 
-    def test_should_handle_get_product_by_sku_generic_exception(self):
+    async def test_should_handle_get_product_by_sku_generic_exception(self):
         # Arrange
-        fetchone = (
-            self.mock_sessionmaker.return_value().execute.return_value.fetchone
-        )
+        fetchone = self.mock_session.execute.return_value.fetchone
         fetchone.side_effect = Exception()
 
         # Act & Assert
         with self.assertRaises(DatabaseException):
-            self.adapter.get_product_by_sku(
+            await self.adapter.get_product_by_sku(
                 sku="test_sku",
                 on_not_found=Exception,
             )
 
-    def test_should_update_product(self):
+    async def test_should_update_product(self):
         # Arrange
         mock_product = ProductHelper.create_product()
-        self.mock_sessionmaker.return_value.execute.return_value.fetchone = (
-            Mock(return_value=(mock_product.version,))
+        await self.warm_categories(mock_product.category)
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=(1,)
         )
-        self.adapter.get_product_by_sku = Mock(return_value=mock_product)
+        self.adapter.get_product_by_sku = AsyncMock(return_value=mock_product)
 
         # Act
-        updated_product = self.adapter.update_product(
+        updated_product = await self.adapter.update_product(
             product=mock_product,
             on_not_found=Exception,
             on_outdated_version=Exception,
@@ -276,9 +430,7 @@ class TestProductPostgresAdapter(unittest.TestCase):
         )
 
         # Assert
-        self.assertEqual(
-            self.mock_sessionmaker.return_value().execute.call_count, 5
-        )
+        self.assertEqual(self.mock_session.execute.call_count, 4)
         self.adapter.get_product_by_sku.assert_called_once()
         self.assertEqual(updated_product.sku, mock_product.sku)
         self.assertEqual(updated_product.name, mock_product.name)
@@ -295,113 +447,611 @@ class TestProductPostgresAdapter(unittest.TestCase):
             updated_product.category.name, mock_product.category.name
         )
 
-    def test_should_handle_update_product_not_found(self):
+    async def test_should_handle_update_product_not_found(self):
         # Arrange
         mock_product = ProductHelper.create_product()
-        fetchone = (
-            self.mock_sessionmaker.return_value().execute.return_value.fetchone
-        )
+        fetchone = self.mock_session.execute.return_value.fetchone
         fetchone.side_effect = Exception("Mock DB Error")
 
         # Act & Assert
         with self.assertRaises(Exception):
-            self.adapter.update_product(
+            await self.adapter.update_product(
                 product=mock_product,
                 on_not_found=Exception,
                 on_outdated_version=Exception,
                 on_duplicate=Exception,
             )
 
-    def test_should_handle_update_product_outdated_version(self):
+    async def test_should_handle_update_product_outdated_version(self):
         # Arrange
         mock_product = ProductHelper.create_product()
-        fetchone = (
-            self.mock_sessionmaker.return_value().execute.return_value.fetchone
-        )
+        fetchone = self.mock_session.execute.return_value.fetchone
         fetchone.side_effect = Exception("Mock DB Error")
         # Act & Assert
         with self.assertRaises(Exception):
-            self.adapter.update_product(
+            await self.adapter.update_product(
                 product=mock_product,
                 on_not_found=Exception,
                 on_outdated_version=Exception,
                 on_duplicate=Exception,
             )
 
-    def test_should_handle_update_product_integrity_error(self):
+    async def test_should_reject_update_with_outdated_expected_version(
+        self,
+    ):
         # Arrange
         mock_product = ProductHelper.create_product()
-        self.mock_sessionmaker.return_value.execute.return_value.fetchone = (
-            Mock(return_value=(mock_product.version,))
+        await self.warm_categories(mock_product.category)
+        product = Product(
+            sku=mock_product.sku,
+            name=mock_product.name,
+            description=mock_product.description,
+            version=3,
         )
-        self.mock_sessionmaker.return_value().execute.side_effect = (
-            IntegrityError(params=[], orig=Exception, statement="")
+        self.mock_session.execute.return_value.rowcount = 0
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=(4,)
+        )
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            await self.adapter.update_product(
+                product=product,
+                on_not_found=KeyError(),
+                on_outdated_version=ValueError(),
+                on_duplicate=Exception(),
+            )
+
+        self.assertEqual(self.mock_session.commit.call_count, 0)
+
+    async def test_should_get_product_version(self):
+        # Arrange
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=(4,)
+        )
+
+        # Act
+        version = await self.adapter.get_product_version(
+            sku="test_sku", on_not_found=KeyError()
+        )
+
+        # Assert
+        self.assertEqual(version, 4)
+        query = self.mock_session.execute.call_args.args[0]
+        self.assertEqual(len(query.selected_columns), 1)
+
+    async def test_should_handle_update_product_integrity_error(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=(1,)
+        )
+        self.mock_session.execute.side_effect = IntegrityError(
+            params=[], orig=Exception, statement=""
         )
 
         # Act & Assert
         with self.assertRaises(Exception):
-            self.adapter.update_product(
+            await self.adapter.update_product(
                 product=mock_product,
                 on_not_found=Exception,
                 on_outdated_version=Exception,
                 on_duplicate=Exception,
             )
 
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
+
+    async def test_should_patch_inventory_in_one_statement(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=ProductHelper.create_product_tuple(
+                product=mock_product
+            )
+        )
+
+        # Act
+        patched_product = await self.adapter.patch_product(
+            sku=mock_product.sku,
+            changes={"inventory": {"quantity": 10}},
+            expected_version=1,
+            on_not_found=KeyError(),
+            on_outdated_version=ValueError(),
+            on_invalid_inventory=TypeError(),
+        )
+
+        # Assert
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+        self.assertEqual(self.mock_session.commit.call_count, 1)
+        self.assertEqual(patched_product.sku, mock_product.sku)
         self.assertEqual(
-            self.mock_sessionmaker.return_value().rollback.call_count, 1
+            patched_product.inventory.quantity,
+            mock_product.inventory.quantity,
         )
 
-    def test_should_delete_product(self):
+    async def test_should_reject_patch_leaving_reserved_above_quantity(
+        self,
+    ):
         # Arrange
         mock_product = ProductHelper.create_product()
-        self.mock_sessionmaker.return_value().execute.return_value.fetchone = (
-            Mock(
-                return_value=(
-                    mock_product.id,
-                    mock_product.inventory.id,
-                    mock_product.price.id,
-                    mock_product.category.id,
-                )
+        row = ProductHelper.create_product_tuple(product=mock_product)
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=row._replace(
+                inventory_quantity=None, inventory_reserved=None
             )
         )
 
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            await self.adapter.patch_product(
+                sku=mock_product.sku,
+                changes={"inventory": {"quantity": 1}},
+                expected_version=None,
+                on_not_found=KeyError(),
+                on_outdated_version=ValueError(),
+                on_invalid_inventory=TypeError(),
+            )
+
+        self.assertEqual(self.mock_session.commit.call_count, 0)
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
+
+    @patch("src.adapter.postgres.create_async_engine")
+    def test_should_keep_reserved_when_patching_quantity(
+        self, mock_engine: Mock
+    ):
+        # Arrange
+        adapter = ProductPostgresAdapter("mock_db_url")
+        reserve = adapter._ProductPostgresAdapter__adjust_inventory_statement(
+            InventoryOperation.RESERVE, {"123456": 2}
+        )
+
+        # Act
+        patch_quantity = (
+            adapter._ProductPostgresAdapter__patch_product_statement(
+                "123456", {"inventory": {"quantity": 25}}, None, None
+            )
+        )
+        reserve_sql = str(reserve.compile(dialect=postgresql.dialect()))
+        sql = str(patch_quantity.compile(dialect=postgresql.dialect()))
+
+        # Assert
+        self.assertIn(
+            'SET reserved=("Inventory".reserved + lines.', reserve_sql
+        )
+        self.assertIn(
+            "DO UPDATE SET quantity = excluded.quantity "
+            'WHERE excluded.quantity >= "Inventory".reserved',
+            sql,
+        )
+        self.assertNotIn("reserved = excluded.reserved", sql)
+
+    @patch("src.adapter.postgres.create_async_engine")
+    def test_should_not_link_inventory_that_will_not_be_created(
+        self, mock_engine: Mock
+    ):
+        # Arrange
+        adapter = ProductPostgresAdapter("mock_db_url")
+
+        # Act
+        patch_reserved = (
+            adapter._ProductPostgresAdapter__patch_product_statement(
+                "123456", {"inventory": {"reserved": 2}}, None, None
+            )
+        )
+        patch_quantity = (
+            adapter._ProductPostgresAdapter__patch_product_statement(
+                "123456", {"inventory": {"quantity": 2}}, None, None
+            )
+        )
+        reserved_sql = str(
+            patch_reserved.compile(dialect=postgresql.dialect())
+        )
+        quantity_sql = str(
+            patch_quantity.compile(dialect=postgresql.dialect())
+        )
+
+        # Assert
+        self.assertNotIn("inventory_id=coalesce", reserved_sql)
+        self.assertIn("inventory_id=coalesce", quantity_sql)
+
+    async def test_should_reject_patch_with_outdated_version(self):
+        # Arrange
+        self.mock_session.execute.return_value.fetchone = Mock(
+            side_effect=[None, (2,)]
+        )
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            await self.adapter.patch_product(
+                sku="test_sku",
+                changes={"name": "New Name"},
+                expected_version=1,
+                on_not_found=KeyError(),
+                on_outdated_version=ValueError(),
+                on_invalid_inventory=TypeError(),
+            )
+
+        self.assertEqual(self.mock_session.commit.call_count, 0)
+
+    async def test_should_reject_patch_of_unknown_product(self):
+        # Arrange
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=None
+        )
+
+        # Act & Assert
+        with self.assertRaises(KeyError):
+            await self.adapter.patch_product(
+                sku="unknown_sku",
+                changes={"name": "New Name"},
+                expected_version=None,
+                on_not_found=KeyError(),
+                on_outdated_version=ValueError(),
+                on_invalid_inventory=TypeError(),
+            )
+
+    async def test_should_reprice_category(self):
+        # Arrange
+        self.mock_session.execute.return_value.fetchall = Mock(
+            return_value=[Mock(sku="test_sku"), Mock(sku="other_sku")]
+        )
+
         # Act
-        result = self.adapter.delete_product(
+        skus = await self.adapter.reprice_category(
+            category_name="Test Category",
+            discount_percent=Decimal("0.15"),
+            on_not_found=KeyError(),
+        )
+
+        # Assert
+        self.assertEqual(skus, ["test_sku", "other_sku"])
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+        self.assertEqual(self.mock_session.commit.call_count, 1)
+
+    async def test_should_reject_repricing_unknown_category(self):
+        # Arrange
+        self.mock_session.execute.return_value.fetchall = Mock(return_value=[])
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=None
+        )
+
+        # Act & Assert
+        with self.assertRaises(KeyError):
+            await self.adapter.reprice_category(
+                category_name="Unknown",
+                discount_percent=Decimal("0.15"),
+                on_not_found=KeyError(),
+            )
+
+        self.assertEqual(self.mock_session.commit.call_count, 0)
+
+    async def test_should_delete_product(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=(
+                mock_product.id,
+                mock_product.version,
+                mock_product.inventory.id,
+                mock_product.price.id,
+                mock_product.category.id,
+            )
+        )
+
+        # Act
+        result = await self.adapter.delete_product(
             sku=mock_product.sku, on_not_found=Exception
         )
 
         # Assert
         self.assertTrue(result)
-        self.assertEqual(
-            self.mock_sessionmaker.return_value().execute.call_count, 4
-        )
+        self.assertEqual(self.mock_session.execute.call_count, 5)
 
-    def test_should_handle_delete_product_not_found(self):
+    async def test_should_handle_delete_product_not_found(self):
         # Arrange
-        self.mock_sessionmaker.return_value.execute.return_value.fetchone = (
-            Mock(return_value=None)
+        self.mock_session.execute.return_value.fetchone = Mock(
+            return_value=None
         )
 
         # Act & Assert
         with self.assertRaises(Exception):
-            self.adapter.delete_product(
+            await self.adapter.delete_product(
                 sku="non_existent_sku", on_not_found=Exception
             )
 
-    def test_should_handle_delete_product_database_exception(self):
+    async def test_should_handle_delete_product_database_exception(self):
         # Arrange
-        self.mock_sessionmaker.return_value.execute.return_value.fetchone = (
-            Mock(side_effect=Exception("Mock DB Error"))
+        self.mock_session.execute.return_value.fetchone = Mock(
+            side_effect=Exception("Mock DB Error")
         )
 
         # Act & Assert
         with self.assertRaises(DatabaseException):
-            self.adapter.delete_product(sku="test_sku", on_not_found=Exception)
+            await self.adapter.delete_product(
+                sku="test_sku", on_not_found=Exception
+            )
+
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
+
+    async def test_should_reserve_inventory(self):
+        # Arrange
+        inventory_id = uuid4()
+        self.mock_session.execute.return_value.fetchall = Mock(
+            return_value=[InventoryRow("test_sku", inventory_id, 10, 3)]
+        )
+
+        # Act
+        inventories = await self.adapter.adjust_inventory(
+            operation=InventoryOperation.RESERVE,
+            quantities={"test_sku": 3},
+            on_not_found=KeyError(),
+            on_insufficient_inventory=ValueError(),
+        )
+
+        # Assert
+        self.assertEqual(inventories["test_sku"].id, inventory_id)
+        self.assertEqual(inventories["test_sku"].reserved, 3)
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+        self.assertEqual(self.mock_session.commit.call_count, 1)
+
+    async def test_should_reject_reservation_without_enough_inventory(self):
+        # Arrange
+        self.mock_session.execute.return_value.fetchall = Mock(
+            side_effect=[
+                [InventoryRow("test_sku", uuid4(), 10, 3)],
+                [("test_sku",), ("other_sku",)],
+            ]
+        )
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            await self.adapter.adjust_inventory(
+                operation=InventoryOperation.RESERVE,
+                quantities={"test_sku": 3, "other_sku": 20},
+                on_not_found=KeyError(),
+                on_insufficient_inventory=ValueError(),
+            )
+
+        self.assertEqual(self.mock_session.commit.call_count, 0)
+        self.assertGreaterEqual(self.mock_session.rollback.call_count, 1)
+
+    async def test_should_reject_reservation_for_unknown_sku(self):
+        # Arrange
+        self.mock_session.execute.return_value.fetchall = Mock(
+            side_effect=[[], []]
+        )
+
+        # Act & Assert
+        with self.assertRaises(KeyError):
+            await self.adapter.adjust_inventory(
+                operation=InventoryOperation.COMMIT,
+                quantities={"unknown_sku": 1},
+                on_not_found=KeyError(),
+                on_insufficient_inventory=ValueError(),
+            )
+
+        self.assertEqual(self.mock_session.commit.call_count, 0)
+
+    @patch("src.adapter.postgres.create_async_engine")
+    def test_inventory_operation_should_bump_product_version(
+        self, mock_engine: Mock
+    ):
+        # Arrange
+        adapter = ProductPostgresAdapter("mock_db_url", read_model=True)
+
+        # Act
+        statement = (
+            adapter._ProductPostgresAdapter__adjust_inventory_statement(
+                InventoryOperation.RESERVE, {"123456": 1}
+            )
+        )
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+
+        # Assert
+        self.assertIn(
+            'UPDATE "Product" SET version=("Product".version + ', sql
+        )
+        self.assertIn('UPDATE "ProductRead" SET version=', sql)
+
+    @patch("src.adapter.postgres.create_async_engine")
+    def test_should_skip_read_model_when_disabled(self, mock_engine: Mock):
+        # Arrange
+        adapter = ProductPostgresAdapter("mock_db_url")
+        mock_product = ProductHelper.create_product()
+
+        # Act
+        statements = [
+            adapter._ProductPostgresAdapter__create_product_statement(
+                mock_product, mock_product.category.id
+            ),
+            adapter._ProductPostgresAdapter__patch_product_statement(
+                mock_product.sku, {"name": "New name"}, None, None
+            ),
+            adapter._ProductPostgresAdapter__adjust_inventory_statement(
+                InventoryOperation.RESERVE, {mock_product.sku: 1}
+            ),
+            adapter._ProductPostgresAdapter__reprice_category_statement(
+                "Category", Decimal("0.1")
+            ),
+        ]
+
+        # Assert
+        for statement in statements:
+            sql = str(statement.compile(dialect=postgresql.dialect()))
+            self.assertNotIn("ProductRead", sql)
+
+    @patch("src.adapter.postgres.create_async_engine")
+    def test_should_return_patched_product_from_written_rows(
+        self, mock_engine: Mock
+    ):
+        # Arrange
+        adapter = ProductPostgresAdapter("mock_db_url", read_model=True)
+
+        # Act
+        statement = adapter._ProductPostgresAdapter__patch_product_statement(
+            "123456",
+            {"inventory": {"quantity": 10, "reserved": 0}},
+            1,
+            None,
+        )
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+
+        # Assert
+        self.assertIn('patched_read AS \n(INSERT INTO "ProductRead"', sql)
+        self.assertIn('FROM updated_product LEFT OUTER JOIN "Price" ', sql)
+        self.assertIn(
+            "LEFT OUTER JOIN upserted_inventory ON "
+            "updated_product.inventory_id = upserted_inventory.id",
+            sql,
+        )
+        self.assertNotIn('UPDATE "ProductRead"', sql)
+
+    async def test_should_sync_read_model(self):
+        # Arrange
+        self.mock_session.execute.return_value.rowcount = 3
+
+        # Act
+        refreshed = await self.adapter.sync_read_model()
+
+        # Assert
+        self.assertEqual(refreshed, 3)
+        self.assertEqual(self.mock_session.execute.call_count, 2)
+        self.assertEqual(self.mock_session.commit.call_count, 1)
 
+    async def test_should_not_collapse_update_into_inventory_event(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        outbox_result = MagicMock()
+        outbox_result.fetchall.return_value = [
+            OutboxRow(1, "updated", mock_product.sku),
+            OutboxRow(2, "inventory_updated", mock_product.sku),
+        ]
+        self.mock_session.execute.side_effect = [
+            outbox_result,
+            [ProductHelper.create_product_tuple(product=mock_product)],
+            None,
+        ]
+        handler = AsyncMock()
+
+        # Act
+        await self.adapter.relay_product_events(handler=handler, batch_size=10)
+
+        # Assert
+        product_events = handler.call_args[0][0]
         self.assertEqual(
-            self.mock_sessionmaker.return_value().rollback.call_count, 1
+            [event.type for event in product_events],
+            [ProductEventType.UPDATED],
         )
 
+    async def test_should_relay_product_events(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        deleted_id = uuid4()
+        mock_product_tuple = ProductHelper.create_product_tuple(
+            product=mock_product
+        )
+        outbox_result = MagicMock()
+        outbox_result.fetchall.return_value = [
+            OutboxRow(1, "created", mock_product.sku),
+            OutboxRow(2, "updated", mock_product.sku),
+            OutboxRow(3, "deleted", "deleted_sku", deleted_id, 7),
+        ]
+        self.mock_session.execute.side_effect = [
+            outbox_result,
+            [mock_product_tuple],
+            None,
+        ]
+        handler = AsyncMock()
+
+        # Act
+        relayed_rows = await self.adapter.relay_product_events(
+            handler=handler, batch_size=10
+        )
+
+        # Assert
+        self.assertEqual(relayed_rows, 3)
+        product_events = handler.call_args[0][0]
+        self.assertEqual(
+            [event.type for event in product_events],
+            [ProductEventType.UPDATED, ProductEventType.DELETED],
+        )
+        self.assertEqual(product_events[0].product.sku, mock_product.sku)
+        self.assertEqual(product_events[1].sku, "deleted_sku")
+        self.assertEqual(product_events[1].product_id, deleted_id)
+        self.assertEqual(product_events[1].version, 7)
+        self.assertEqual(self.mock_session.commit.call_count, 1)
+
+    async def test_should_relay_delete_before_recreated_product(self):
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        deleted_id = uuid4()
+        outbox_result = MagicMock()
+        outbox_result.fetchall.return_value = [
+            OutboxRow(1, "deleted", mock_product.sku, deleted_id, 4),
+            OutboxRow(2, "created", mock_product.sku),
+            OutboxRow(3, "updated", mock_product.sku),
+        ]
+        self.mock_session.execute.side_effect = [
+            outbox_result,
+            [ProductHelper.create_product_tuple(product=mock_product)],
+            None,
+        ]
+        handler = AsyncMock()
+
+        # Act
+        await self.adapter.relay_product_events(handler=handler, batch_size=10)
+
+        # Assert
+        product_events = handler.call_args[0][0]
+        self.assertEqual(
+            [event.type for event in product_events],
+            [ProductEventType.DELETED, ProductEventType.UPDATED],
+        )
+        self.assertEqual(product_events[0].sku, mock_product.sku)
+        self.assertEqual(product_events[0].product_id, deleted_id)
+        self.assertEqual(product_events[0].version, 4)
+        self.assertEqual(product_events[1].product.sku, mock_product.sku)
+
+    async def test_should_keep_outbox_rows_when_handler_fails(self):
+        # Arrange
+        outbox_result = MagicMock()
+        outbox_result.fetchall.return_value = [
+            OutboxRow(1, "deleted", "test_sku")
+        ]
+        self.mock_session.execute.side_effect = [outbox_result]
+        handler = AsyncMock(side_effect=Exception("Publish failed"))
+
+        # Act & Assert
+        with self.assertRaises(DatabaseException):
+            await self.adapter.relay_product_events(
+                handler=handler, batch_size=10
+            )
+
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
+        self.mock_session.commit.assert_not_called()
+
+    async def test_should_keep_outbox_rows_when_handler_times_out(self):
+        # Arrange
+        outbox_result = MagicMock()
+        outbox_result.fetchall.return_value = [
+            OutboxRow(1, "deleted", "test_sku")
+        ]
+        self.mock_session.execute.side_effect = [outbox_result]
+
+        async def slow_handler(product_events):
+            await asyncio.sleep(1)
+
+        # Act & Assert
+        with self.assertRaises(DatabaseException):
+            await self.adapter.relay_product_events(
+                handler=slow_handler, batch_size=10, handler_timeout=0.01
+            )
+
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+        self.assertEqual(self.mock_session.rollback.call_count, 1)
+        self.mock_session.commit.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
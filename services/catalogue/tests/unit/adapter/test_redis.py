@@ -0,0 +1,133 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.adapter.redis import RedisProductCache
+from src.serialization import dumps
+from tests.helpers.product import ProductHelper
+
+
+class TestRedisProductCache(unittest.IsolatedAsyncioTestCase):
+    @patch("src.adapter.redis.Redis")
+    def setUp(self, mock_redis: Mock) -> None:
+        self.mock_redis = AsyncMock()
+        self.mock_set_script = AsyncMock()
+        self.mock_delete_script = AsyncMock()
+        self.mock_redis.register_script = Mock(
+            side_effect=[self.mock_set_script, self.mock_delete_script]
+        )
+        mock_redis.from_url.return_value = self.mock_redis
+        self.cache = RedisProductCache(redis_url="redis://test", ttl=300)
+
+    async def test_should_get_product(self) -> None:
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.mock_redis.get.return_value = dumps(mock_product.to_dict())
+
+        # Act
+        product = await self.cache.get(mock_product.sku)
+
+        # Assert
+        self.assertEqual(product.to_dict(), mock_product.to_dict())
+        self.mock_redis.get.assert_called_once_with(
+            f"catalogue:product:{mock_product.sku}"
+        )
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    async def test_should_miss_product(self) -> None:
+        # Arrange
+        self.mock_redis.get.return_value = None
+
+        # Act
+        product = await self.cache.get("test_sku")
+
+        # Assert
+        self.assertIsNone(product)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    async def test_should_set_product_if_newer(self) -> None:
+        # Arrange
+        mock_product = ProductHelper.create_product()
+
+        # Act
+        await self.cache.set(mock_product)
+
+        # Assert
+        self.mock_set_script.assert_called_once_with(
+            keys=[
+                f"catalogue:product:{mock_product.sku}",
+                f"catalogue:product:{mock_product.sku}:generation",
+            ],
+            args=[dumps(mock_product.to_dict()), 0, 300, ""],
+        )
+
+    async def test_should_set_product_if_not_deleted_since(self) -> None:
+        # Arrange
+        mock_product = ProductHelper.create_product()
+        self.mock_redis.get.return_value = b"3"
+
+        # Act
+        generation = await self.cache.generation(mock_product.sku)
+        await self.cache.set(mock_product, generation=generation)
+
+        # Assert
+        self.mock_redis.get.assert_called_once_with(
+            f"catalogue:product:{mock_product.sku}:generation"
+        )
+        self.assertEqual(self.mock_set_script.call_args.kwargs["args"][3], 3)
+
+    async def test_should_delete_product(self) -> None:
+        # Act
+        await self.cache.delete("test_sku")
+
+        # Assert
+        self.mock_delete_script.assert_called_once_with(
+            keys=[
+                "catalogue:product:test_sku",
+                "catalogue:product:test_sku:generation",
+            ],
+            args=[300],
+        )
+        channel, message = self.mock_redis.publish.call_args.args
+        self.assertEqual(channel, "catalogue:product:invalidations")
+        self.assertTrue(message.endswith(" test_sku"))
+
+    async def test_should_invalidate_products_deleted_elsewhere(
+        self,
+    ) -> None:
+        # Arrange
+        await self.cache.delete("own_sku")
+        own_message = self.mock_redis.publish.call_args.args[1]
+        messages = [
+            {"type": "subscribe", "data": 1},
+            {"type": "message", "data": own_message.encode()},
+            {"type": "message", "data": b"other-process test_sku"},
+        ]
+        listened = asyncio.Event()
+
+        async def listen():
+            for message in messages:
+                yield message
+            listened.set()
+            await asyncio.Event().wait()
+
+        pubsub = AsyncMock()
+        pubsub.__aenter__.return_value = pubsub
+        pubsub.listen = listen
+        self.mock_redis.pubsub = Mock(return_value=pubsub)
+        on_invalidate = AsyncMock()
+
+        # Act
+        self.cache.start_invalidation_listener(on_invalidate)
+        await listened.wait()
+        await self.cache.close()
+
+        # Assert
+        pubsub.subscribe.assert_called_once_with(
+            "catalogue:product:invalidations"
+        )
+        on_invalidate.assert_called_once_with("test_sku")
+
+
+if __name__ == "__main__":
+    unittest.main()
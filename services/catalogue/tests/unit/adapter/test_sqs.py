@@ -1,8 +1,8 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 from src.adapter.exceptions import SqsException
-from src.adapter.sqs import SQSAdapter
+from src.adapter.sqs import BufferedSQSAdapter, SQSAdapter
 from src.domain.enums import ProductEventType
 from src.domain.events import ProductEvent
 
@@ -104,6 +104,194 @@ class TestSQSAdapter(unittest.TestCase):
             "Send message failed", context.exception.args[0]["message"]
         )
 
+    def test_should_cache_queue_url(self) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+
+        # Act
+        self.sqs_adapter._SQSAdapter__get_queue_url()
+        queue_url = self.sqs_adapter._SQSAdapter__get_queue_url()
+
+        # Assert
+        self.assertEqual(queue_url, "http://test-queue-url")
+        self.mock_sqs_client.get_queue_url.assert_called_once()
+
+    def test_should_publish_messages_in_batches_of_ten(self) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [],
+            "Failed": [],
+        }
+        product_events = [
+            ProductEvent(type=ProductEventType.DELETED, sku=str(index))
+            for index in range(25)
+        ]
+
+        # Act
+        self.sqs_adapter.publish_batch(product_events)
+
+        # Assert
+        calls = self.mock_sqs_client.send_message_batch.call_args_list
+        self.assertEqual(
+            [len(batch.kwargs["Entries"]) for batch in calls], [10, 10, 5]
+        )
+        self.assertEqual(
+            calls[2].kwargs["Entries"][0],
+            {"Id": "0", "MessageBody": product_events[20].to_json()},
+        )
+        self.mock_sqs_client.send_message.assert_not_called()
+
+    @patch("src.adapter.sqs.time.sleep")
+    def test_should_retry_only_failed_entries(self, mock_sleep) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.side_effect = [
+            {
+                "Successful": [{"Id": "0"}],
+                "Failed": [
+                    {"Id": "1", "SenderFault": False, "Code": "Throttled"}
+                ],
+            },
+            {"Successful": [{"Id": "1"}], "Failed": []},
+        ]
+        product_events = [
+            ProductEvent(type=ProductEventType.DELETED, sku="123"),
+            ProductEvent(type=ProductEventType.DELETED, sku="456"),
+        ]
+
+        # Act
+        self.sqs_adapter.publish_batch(product_events)
+
+        # Assert
+        retry = self.mock_sqs_client.send_message_batch.call_args_list[1]
+        self.assertEqual(
+            retry,
+            call(
+                QueueUrl="http://test-queue-url",
+                Entries=[
+                    {"Id": "1", "MessageBody": product_events[1].to_json()}
+                ],
+            ),
+        )
+        mock_sleep.assert_called_once()
+
+    def test_publish_batch_should_fail_on_sender_fault(self) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [],
+            "Failed": [{"Id": "0", "SenderFault": True, "Code": "TooLarge"}],
+        }
+        product_event = ProductEvent(type=ProductEventType.DELETED, sku="123")
+
+        # Act & Assert
+        with self.assertRaises(SqsException) as context:
+            self.sqs_adapter.publish_batch([product_event])
+
+        self.assertEqual(
+            context.exception.args[0]["code"],
+            "sqs.error.queue.send_message_batch",
+        )
+        self.mock_sqs_client.send_message_batch.assert_called_once()
+
+
+class TestBufferedSQSAdapter(unittest.TestCase):
+    @patch("boto3.client")
+    def setUp(self, mock_boto_client) -> None:
+        self.mock_sqs_client = mock_boto_client.return_value
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [],
+            "Failed": [],
+        }
+        self.sqs_adapter = BufferedSQSAdapter(
+            "test-queue",
+            "test-access-key",
+            "test-secret-key",
+            "http://localhost:4566",
+            "us-east-1",
+            max_buffer_size=1,
+            flush_interval=0.01,
+            put_timeout=0.01,
+        )
+
+    def tearDown(self) -> None:
+        self.sqs_adapter.close(timeout=1)
+
+    def test_should_flush_buffered_messages(self) -> None:
+        # Arrange
+        product_event = ProductEvent(type=ProductEventType.DELETED, sku="123")
+
+        # Act
+        self.sqs_adapter.publish(product_event)
+        self.sqs_adapter.close(timeout=1)
+
+        # Assert
+        self.mock_sqs_client.send_message_batch.assert_called_once_with(
+            QueueUrl="http://test-queue-url",
+            Entries=[{"Id": "0", "MessageBody": product_event.to_json()}],
+        )
+        self.assertEqual(self.sqs_adapter.stats()["published"], 1)
+
+    def test_publish_batch_should_wait_for_flush(self) -> None:
+        # Arrange
+        product_events = [
+            ProductEvent(type=ProductEventType.DELETED, sku="123")
+        ]
+
+        # Act
+        self.sqs_adapter.publish_batch(product_events)
+
+        # Assert
+        self.mock_sqs_client.send_message_batch.assert_called_once()
+        self.assertEqual(self.sqs_adapter.stats()["published"], 1)
+
+    def test_publish_batch_should_fail_when_flush_fails(self) -> None:
+        # Arrange
+        self.mock_sqs_client.send_message_batch.side_effect = Exception(
+            "Sqs unavailable"
+        )
+        product_events = [
+            ProductEvent(type=ProductEventType.DELETED, sku="123")
+        ]
+
+        # Act & Assert
+        with self.assertRaises(SqsException) as context:
+            self.sqs_adapter.publish_batch(product_events)
+
+        self.assertEqual(
+            context.exception.args[0]["code"], "sqs.error.buffer.flush"
+        )
+        self.assertEqual(self.sqs_adapter.stats()["failed"], 1)
+        self.assertEqual(self.sqs_adapter.stats()["dropped"], 0)
+
+    def test_publish_should_fail_when_buffer_is_full(self) -> None:
+        # Arrange
+        self.mock_sqs_client.send_message_batch.side_effect = lambda **_: (
+            self.sqs_adapter._BufferedSQSAdapter__closed.wait(1)
+        )
+        product_event = ProductEvent(type=ProductEventType.DELETED, sku="123")
+
+        # Act & Assert
+        with self.assertRaises(SqsException) as context:
+            for _ in range(20):
+                self.sqs_adapter.publish(product_event)
+
+        self.assertEqual(
+            context.exception.args[0]["code"], "sqs.error.buffer.full"
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,11 +8,43 @@ from src.utils.singleton import Singleton
 class Config(metaclass=Singleton):
     LOG_LEVEL = "DEBUG"
     MONGO_URL = os.getenv("MONGO_URL")
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_CONNECT_TIMEOUT_MS = int(
+        os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")
+    )
+    MONGO_SOCKET_TIMEOUT_MS = int(
+        os.getenv("MONGO_SOCKET_TIMEOUT_MS", "10000")
+    )
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(
+        os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")
+    )
     QUEUE_NAME = os.getenv("QUEUE_NAME")
     ENDPOINT_URL = os.getenv("ENDPOINT_URL")
     REGION_NAME = os.getenv("REGION_NAME")
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+    SQS_CONSUMER_POLLERS = int(os.getenv("SQS_CONSUMER_POLLERS", "2"))
+    SQS_CONSUMER_WORKERS = int(os.getenv("SQS_CONSUMER_WORKERS", "8"))
+    SQS_CONSUMER_MAX_IN_FLIGHT = int(
+        os.getenv("SQS_CONSUMER_MAX_IN_FLIGHT", "100")
+    )
+    SQS_CONSUMER_WAIT_TIME_SECONDS = int(
+        os.getenv("SQS_CONSUMER_WAIT_TIME_SECONDS", "20")
+    )
+    SEARCH_INDEX_ENABLED = (
+        os.getenv("SEARCH_INDEX_ENABLED", "true").lower() == "true"
+    )
+    SEARCH_PRICE_BUCKETS = [
+        float(boundary)
+        for boundary in os.getenv(
+            "SEARCH_PRICE_BUCKETS", "0,10,50,100,500,1000"
+        ).split(",")
+    ]
+    SEARCH_PAGE_MAX_SIZE = int(os.getenv("SEARCH_PAGE_MAX_SIZE", "200"))
+    PROJECTION_VERSION_CACHE_SIZE = int(
+        os.getenv("PROJECTION_VERSION_CACHE_SIZE", "100000")
+    )
 
 
 class LocalConfig(Config):
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger("app")
+
+SQS_MAX_BATCH_SIZE = 10
+
+
+class SQSConsumer:
+    """
+    Consume one SQS queue with several long-polling tasks.
+
+    Each received batch is processed in its own task, at most ``workers``
+    at a time, and the messages that were processed are acknowledged with
+    a single delete_message_batch. The handler receives the whole batch
+    and returns the ids of the messages it could not apply; those, or the
+    whole batch if the handler raises, are left on the queue so SQS
+    redelivers them once their visibility timeout expires. Pollers stop
+    receiving once ``max_in_flight`` messages are being processed.
+
+    The boto3 client is blocking, its calls run in the default executor.
+    """
+
+    def __init__(
+        self,
+        sqs: Any,
+        queue_url: str,
+        handler: Callable[[List[Dict[str, Any]]], Awaitable[Set[str]]],
+        pollers: int = 1,
+        workers: int = 4,
+        max_in_flight: int = 100,
+        wait_time_seconds: int = 20,
+    ) -> None:
+        self.__sqs = sqs
+        self.__queue_url = queue_url
+        self.__handler = handler
+        self.__pollers = pollers
+        self.__workers = workers
+        self.__max_in_flight = max(max_in_flight, SQS_MAX_BATCH_SIZE)
+        self.__wait_time_seconds = wait_time_seconds
+        self.__poll_tasks: List["asyncio.Task[None]"] = []
+        self.__process_tasks: Set["asyncio.Task[None]"] = set()
+        self.__stopping: Optional[asyncio.Event] = None
+        self.__worker_slots: Optional[asyncio.Semaphore] = None
+        self.__in_flight_changed: Optional[asyncio.Condition] = None
+        self.__in_flight = 0
+        self.__processed = 0
+        self.__failed = 0
+
+    def start(self) -> None:
+        # Created here so they bind to the running event loop.
+        self.__stopping = asyncio.Event()
+        self.__worker_slots = asyncio.Semaphore(self.__workers)
+        self.__in_flight_changed = asyncio.Condition()
+        for _ in range(self.__pollers):
+            self.__poll_tasks.append(asyncio.create_task(self.__poll()))
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop receiving and wait for the in-flight batches to finish."""
+        assert self.__stopping is not None, "start() was not called"
+        assert self.__in_flight_changed is not None
+        self.__stopping.set()
+        async with self.__in_flight_changed:
+            self.__in_flight_changed.notify_all()
+        # A poller may be blocked in a long poll, its result is dropped and
+        # the messages reappear once their visibility timeout expires.
+        for task in self.__poll_tasks:
+            task.cancel()
+        await asyncio.gather(*self.__poll_tasks, return_exceptions=True)
+        if self.__process_tasks:
+            await asyncio.wait(self.__process_tasks, timeout=timeout)
+
+    async def __reserve(self) -> bool:
+        stopping = self.__stopping
+        in_flight_changed = self.__in_flight_changed
+        assert stopping is not None and in_flight_changed is not None
+        async with in_flight_changed:
+            await in_flight_changed.wait_for(
+                lambda: stopping.is_set()
+                or self.__in_flight + SQS_MAX_BATCH_SIZE
+                <= self.__max_in_flight
+            )
+            if stopping.is_set():
+                return False
+            self.__in_flight += SQS_MAX_BATCH_SIZE
+            return True
+
+    async def __release(self, count: int) -> None:
+        assert self.__in_flight_changed is not None
+        async with self.__in_flight_changed:
+            self.__in_flight -= count
+            self.__in_flight_changed.notify_all()
+
+    async def __poll(self) -> None:
+        while await self.__reserve():
+            messages: List[Dict[str, Any]] = []
+            try:
+                response = await asyncio.to_thread(
+                    self.__sqs.receive_message,
+                    QueueUrl=self.__queue_url,
+                    MaxNumberOfMessages=SQS_MAX_BATCH_SIZE,
+                    WaitTimeSeconds=self.__wait_time_seconds,
+                )
+                messages = response.get("Messages", [])
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger.error(
+                    f"Error receiving messages from {self.__queue_url}: "
+                    f"{error}"
+                )
+                await asyncio.sleep(1)
+            finally:
+                await self.__release(SQS_MAX_BATCH_SIZE - len(messages))
+            if messages:
+                logger.info(f"Messages in queue: {len(messages)}")
+                task = asyncio.create_task(self.__process(messages))
+                self.__process_tasks.add(task)
+                task.add_done_callback(self.__process_tasks.discard)
+
+    async def __process(self, messages: List[Dict[str, Any]]) -> None:
+        assert self.__worker_slots is not None
+        try:
+            async with self.__worker_slots:
+                try:
+                    failed = await self.__handler(messages)
+                except Exception as error:
+                    logger.error(f"Error processing messages: {error}")
+                    failed = {message["MessageId"] for message in messages}
+                processed = [
+                    message
+                    for message in messages
+                    if message["MessageId"] not in failed
+                ]
+                await self.__acknowledge(processed)
+            self.__processed += len(processed)
+            self.__failed += len(messages) - len(processed)
+        finally:
+            await self.__release(len(messages))
+
+    async def __acknowledge(self, messages: List[Dict[str, Any]]) -> None:
+        if not messages:
+            return
+        try:
+            response = await asyncio.to_thread(
+                self.__sqs.delete_message_batch,
+                QueueUrl=self.__queue_url,
+                Entries=[
+                    {
+                        "Id": message["MessageId"],
+                        "ReceiptHandle": message["ReceiptHandle"],
+                    }
+                    for message in messages
+                ],
+            )
+            for failure in response.get("Failed", []):
+                logger.error(
+                    f"Error deleting message {failure['Id']}: "
+                    f"{failure.get('Message')}"
+                )
+        except Exception as error:
+            logger.error(
+                f"Error deleting messages from {self.__queue_url}: {error}"
+            )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.__in_flight,
+            "processed": self.__processed,
+            "failed": self.__failed,
+        }
@@ -1,24 +1,64 @@
+import base64
+import binascii
 import json
 import logging
-import threading
-import time
-from typing import Any, Dict, List, Optional, Union
+import re
+from functools import partial
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Union
 
 import boto3
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Response
+from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel
-from pymongo import MongoClient
+from pymongo import ASCENDING, TEXT, DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError
 from src.config import get_config
+from src.consumer import SQSConsumer
+from src.projection import AppliedVersions
+from src.search_index import InvertedIndex
 
 config = get_config()
 logger = logging.getLogger("app")
 
 app = FastAPI()
 
-client = MongoClient(config.MONGO_URL)
+client = AsyncIOMotorClient(
+    config.MONGO_URL,
+    maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+    minPoolSize=config.MONGO_MIN_POOL_SIZE,
+    connectTimeoutMS=config.MONGO_CONNECT_TIMEOUT_MS,
+    socketTimeoutMS=config.MONGO_SOCKET_TIMEOUT_MS,
+    serverSelectionTimeoutMS=config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+)
 db = client["product_search"]
 product_collection = db["product"]
 
+DUPLICATE_KEY_ERROR = 11000
+# Deleted products are kept as a tombstone holding their id and last
+# version, reads skip them.
+LIVE_PRODUCT = {"deleted": {"$ne": True}}
+PRODUCT_FIELDS = [
+    "name",
+    "name_lower",
+    "description",
+    "image_url",
+    "price",
+    "inventory",
+    "in_stock",
+    "category",
+]
+PRODUCT_PROJECTION = {
+    "_id": False,
+    "sku": True,
+    "version": True,
+    "name": True,
+    "description": True,
+    "image_url": True,
+    "price": True,
+    "inventory": True,
+    "category": True,
+}
+
 
 class Price(BaseModel):
     value: float
@@ -36,6 +76,7 @@ class Category(BaseModel):
 
 class Product(BaseModel):
     sku: str
+    version: Optional[int] = None
     name: str
     description: str
     image_url: str
@@ -44,6 +85,30 @@ class Product(BaseModel):
     category: Optional[Category] = None
 
 
+class FacetCount(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+
+class PriceRangeCount(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    count: int
+
+
+class FacetedSearchResult(BaseModel):
+    hits: List[Product]
+    total: int
+    categories: List[FacetCount]
+    price_ranges: List[PriceRangeCount]
+
+
+class ProductSuggestion(BaseModel):
+    sku: str
+    name: str
+    score: float
+
+
 sqs = boto3.client(
     "sqs",
     endpoint_url=config.ENDPOINT_URL,
@@ -54,111 +119,483 @@ sqs = boto3.client(
 queues = {
     "product-update": "http://localstack:4566/000000000000/product-update",
 }
+consumers: List[SQSConsumer] = []
+search_index = InvertedIndex() if config.SEARCH_INDEX_ENABLED else None
+applied_versions = AppliedVersions(
+    max_size=config.PROJECTION_VERSION_CACHE_SIZE
+)
+
+
+class ProjectionEvent(NamedTuple):
+    sku: str
+    product: Optional[Product]
+    product_id: Optional[str]
+    version: Optional[int]
+    write: Union[UpdateOne, DeleteOne]
+
+
+def upsert_operation(product: Product, product_id: Optional[str]) -> UpdateOne:
+    query: Dict[str, Any] = {"sku": product.sku}
+    if product.version is not None:
+        # Only newer versions of the same product match, and a tombstone
+        # only gives way to a product created again with another id. An
+        # older, repeated or deleted event misses the filter and its
+        # upsert hits the unique sku index instead.
+        query["$or"] = [
+            {
+                **LIVE_PRODUCT,
+                "product_id": {"$in": [product_id, None]},
+                "version": {"$lt": product.version},
+            },
+            {"deleted": True, "product_id": {"$ne": product_id}},
+            {"version": {"$exists": False}},
+        ]
+    return UpdateOne(
+        query,
+        {
+            "$set": {
+                "product_id": product_id,
+                "version": product.version,
+                "name": product.name,
+                "name_lower": product.name.lower(),
+                "description": product.description,
+                "image_url": product.image_url,
+                "price": {
+                    "value": product.price.value,
+                    "discount_percent": product.price.discount_percent,
+                    "discounted": product.price.value
+                    * (1 - product.price.discount_percent),
+                },
+                "inventory": {
+                    "quantity": product.inventory.quantity,
+                    "reserved": product.inventory.reserved,
+                },
+                "in_stock": product.inventory.quantity
+                > (product.inventory.reserved or 0),
+                "category": {"name": product.category.name},
+            },
+            "$unset": {"deleted": ""},
+        },
+        upsert=True,
+    )
+
+
+def delete_operation(
+    sku: str, product_id: Optional[str], version: Optional[int]
+) -> Union[UpdateOne, DeleteOne]:
+    if version is None:
+        # Sent before deleted events carried a version.
+        return DeleteOne({"sku": sku})
+    # The tombstone keeps rejecting the events of the deleted product
+    # that are redelivered after it.
+    return UpdateOne(
+        {"sku": sku, "product_id": {"$in": [product_id, None]}},
+        {
+            "$set": {
+                "deleted": True,
+                "product_id": product_id,
+                "version": version,
+            },
+            "$unset": {field: "" for field in PRODUCT_FIELDS},
+        },
+        upsert=True,
+    )
+
+
+def to_projection_event(data: Dict[str, Any]) -> Optional[ProjectionEvent]:
+    event_type = data.get("type")
+    if event_type in ["created", "updated", "inventory_updated"]:
+        # Inventory events carry the whole product and its new version.
+        product_id = data["product"].get("id")
+        product = Product(**data["product"])
+        return ProjectionEvent(
+            sku=product.sku,
+            product=product,
+            product_id=product_id,
+            version=product.version,
+            write=upsert_operation(product, product_id),
+        )
+    if event_type == "deleted":
+        sku = data["sku"]
+        product_id = data.get("product_id")
+        version = data.get("version")
+        return ProjectionEvent(
+            sku=sku,
+            product=None,
+            product_id=product_id,
+            version=version,
+            write=delete_operation(sku, product_id, version),
+        )
+    return None
+
 
+async def process_messages(
+    messages: List[Dict[str, Any]], queue_name: str
+) -> Set[str]:
+    """
+    Apply a batch of events with one unordered bulk write.
 
-def handle_sqs_message(queue_name: str, queue_url: str) -> None:
-    while True:
+    Each sku gets a single write: the event with the highest version of
+    its product, or the last one received when events carry no version.
+    A delete replaces an upsert of the same version.
+    Events already applied are skipped without touching Mongo. Returns
+    the ids of the messages that could not be applied so they are left
+    on the queue for redelivery, along with the events of a product
+    created again after one already written in this batch, so the two
+    are applied in order.
+    """
+    if queue_name != "product-update":
+        return set()
+
+    failed: Set[str] = set()
+    skipped = 0
+    message_ids_by_sku: Dict[str, List[str]] = {}
+    events_by_sku: Dict[str, ProjectionEvent] = {}
+    for message in messages:
         try:
-            messages = sqs.receive_message(
-                QueueUrl=queue_url, MaxNumberOfMessages=10, WaitTimeSeconds=1
-            )
-            if "Messages" in messages:
-                logger.info(f"Messages in queue: {len(messages['Messages'])}")
-                for message in messages["Messages"]:
-                    process_message(message, queue_name)
-                    sqs.delete_message(
-                        QueueUrl=queue_url,
-                        ReceiptHandle=message["ReceiptHandle"],
+            data = json.loads(message["Body"])
+            logger.info(data)
+            event = to_projection_event(data)
+        except Exception as error:
+            logger.error(error)
+            failed.add(message["MessageId"])
+            continue
+        if event is None:
+            continue
+        current = events_by_sku.get(event.sku)
+        if current is not None and current.product_id != event.product_id:
+            failed.add(message["MessageId"])
+            continue
+        if event.version is not None:
+            # A delete carries the version it removed, which is recorded
+            # as applied already, so it wins over that version's upsert.
+            if (
+                event.product is not None
+                and applied_versions.is_applied(
+                    event.sku, event.product_id, event.version
+                )
+            ) or (
+                current is not None
+                and current.version is not None
+                and (
+                    event.version < current.version
+                    or (
+                        event.version == current.version
+                        and (
+                            event.product is not None
+                            or current.product is None
+                        )
                     )
-        except Exception as e:
-            logger.error(
-                f"Error processing message for queue {queue_name}: {str(e)}"
-            )
-
+                )
+            ):
+                skipped += 1
+                continue
+        events_by_sku[event.sku] = event
+        message_ids_by_sku.setdefault(event.sku, []).append(
+            message["MessageId"]
+        )
+    applied_versions.count("skipped_duplicate", skipped)
 
-def process_message(
-    message: Dict[str, Union[str, Dict[str, Any]]], queue_name: str
-) -> None:
+    if not events_by_sku:
+        return failed
+    skus = list(events_by_sku)
+    unwritten: Set[str] = set()
+    stale: Set[str] = set()
     try:
-        data = json.loads(message["Body"])
-        logger.info(data)
-        if queue_name == "product-update":
-            event_type = data.get("type")
-            if event_type in ["created", "updated"]:
-                product_data = data.get("product")
-                product = Product(**product_data)
-                product_collection.update_one(
-                    {"sku": product.sku},
-                    {
-                        "$set": {
-                            "name": product.name,
-                            "description": product.description,
-                            "image_url": product.image_url,
-                            "price": {
-                                "value": product.price.value,
-                                "discount_percent": product.price.discount_percent,
-                            },
-                            "inventory": {
-                                "quantity": product.inventory.quantity,
-                                "reserved": product.inventory.reserved,
-                            },
-                            "category": {"name": product.category.name},
-                        }
-                    },
-                    upsert=True,
-                )
-            if event_type == "deleted":
-                sku_data = data.get("sku")
-                product_collection.delete_one({"sku": sku_data})
+        await product_collection.bulk_write(
+            [event.write for event in events_by_sku.values()], ordered=False
+        )
+    except BulkWriteError as error:
+        for write_error in error.details.get("writeErrors", []):
+            sku = skus[write_error["index"]]
+            if (
+                write_error["code"] == DUPLICATE_KEY_ERROR
+                and events_by_sku[sku].version is not None
+            ):
+                stale.add(sku)
+                continue
+            logger.error(f"Error writing product {sku}: {write_error}")
+            unwritten.add(sku)
     except Exception as error:
         logger.error(error)
-        raise
+        unwritten.update(skus)
+
+    for sku in skus:
+        if sku in unwritten:
+            failed.update(message_ids_by_sku[sku])
+            continue
+        event = events_by_sku[sku]
+        product = event.product
+        if product is None:
+            applied_versions.discard(sku)
+            if search_index is not None and sku not in stale:
+                search_index.remove(sku)
+            continue
+        if product.version is not None and sku not in stale:
+            applied_versions.record(sku, event.product_id, product.version)
+        if search_index is not None and sku not in stale:
+            index_product(product)
+    applied_versions.count("skipped_stale", len(stale))
+    applied_versions.count("failed", len(unwritten))
+    applied_versions.count("applied", len(skus) - len(unwritten) - len(stale))
+    return failed
+
+
+def index_product(product: Product) -> None:
+    assert search_index is not None
+    search_index.add(
+        sku=product.sku,
+        name=product.name,
+        description=product.description,
+        category=product.category.name if product.category else None,
+    )
+
+
+async def build_search_index() -> None:
+    assert search_index is not None
+    async for document in product_collection.find(
+        LIVE_PRODUCT, PRODUCT_PROJECTION
+    ):
+        index_product(Product(**document))
+    logger.info(f"search index built: {search_index.stats()}")
+
+
+@app.get("/product:suggest")
+async def suggest_products(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=config.SEARCH_PAGE_MAX_SIZE),
+) -> List[ProductSuggestion]:
+    if search_index is None:
+        raise HTTPException(
+            status_code=404, detail="Índice de busca desabilitado"
+        )
+    return [
+        ProductSuggestion(sku=sku, name=name, score=score)
+        for sku, name, score in search_index.search(q, limit=limit)
+    ]
 
 
 @app.get("/product/{sku}")
-def get_product_by_sku(sku: str):
+async def get_product_by_sku(sku: str):
     try:
-        result = product_collection.find_one({"sku": sku})
+        result = await product_collection.find_one(
+            {"sku": sku, **LIVE_PRODUCT}
+        )
         if result is None:
             raise HTTPException(
                 status_code=404, detail="Produto não encontrado"
             )
         return Product(**result)
+    except HTTPException:
+        raise
     except Exception as error:
         logger.error(error)
         raise HTTPException(status_code=500, detail="Erro ao buscar produto")
 
 
 @app.get("/product")
-def get_product_by_params(
+async def get_product_by_params(
+    response: Response,
     sku: Optional[str] = None,
     name: Optional[str] = None,
     description: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=config.SEARCH_PAGE_MAX_SIZE),
 ) -> List[Product]:
-    query: Dict[str, Union[str, Dict[str, Any]]] = {}
+    query: Dict[str, Any] = {**LIVE_PRODUCT}
     if sku:
         query["sku"] = sku
     if name:
-        query["name"] = {"$regex": name, "$options": "i"}
+        # Anchored on the lowercased copy so the prefix can use its index.
+        query["name_lower"] = {"$regex": f"^{re.escape(name.lower())}"}
     if description:
-        query["description"] = {"$regex": description, "$options": "i"}
+        query["$text"] = {"$search": description}
+    if cursor:
+        try:
+            after_sku = base64.urlsafe_b64decode(cursor.encode()).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        query["$and"] = [{"sku": {"$gt": after_sku}}]
 
     try:
-        result = list(product_collection.find(query))
+        documents = (
+            product_collection.find(query, PRODUCT_PROJECTION)
+            .sort("sku", ASCENDING)
+            .limit(limit + 1)
+            .batch_size(limit + 1)
+        )
+        result = [Product(**document) async for document in documents]
         if not result:
             raise HTTPException(
                 status_code=204, detail="Produtos não encontrados na busca"
             )
-        return [Product(**prod) for prod in result]
+        if len(result) > limit:
+            result = result[:limit]
+            response.headers["X-Next-Cursor"] = base64.urlsafe_b64encode(
+                result[-1].sku.encode()
+            ).decode()
+        return result
+    except HTTPException:
+        raise
+    except Exception as error:
+        logger.error(error)
+        raise HTTPException(status_code=500, detail="Erro ao buscar produtos")
+
+
+@app.get("/product:search")
+async def search_products(
+    q: Optional[str] = None,
+    category: Optional[List[str]] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    in_stock: Optional[bool] = None,
+    limit: int = Query(20, ge=1, le=config.SEARCH_PAGE_MAX_SIZE),
+) -> FacetedSearchResult:
+    """
+    Search products and count categories and discounted price ranges of
+    all matches in one aggregation.
+    """
+    query: Dict[str, Any] = {**LIVE_PRODUCT}
+    if q:
+        query["$text"] = {"$search": q}
+    if category:
+        query["category.name"] = {"$in": category}
+    if min_price is not None or max_price is not None:
+        price_range: Dict[str, float] = {}
+        if min_price is not None:
+            price_range["$gte"] = min_price
+        if max_price is not None:
+            price_range["$lt"] = max_price
+        query["price.discounted"] = price_range
+    if in_stock is not None:
+        query["in_stock"] = in_stock
+
+    if q:
+        hits_sort: Dict[str, Any] = {"score": {"$meta": "textScore"}}
+    else:
+        hits_sort = {"sku": ASCENDING}
+    boundaries = config.SEARCH_PRICE_BUCKETS
+    pipeline = [
+        {"$match": query},
+        {
+            "$facet": {
+                "hits": [
+                    {"$sort": hits_sort},
+                    {"$limit": limit},
+                    {"$project": PRODUCT_PROJECTION},
+                ],
+                "total": [{"$count": "count"}],
+                "categories": [{"$sortByCount": "$category.name"}],
+                "price_ranges": [
+                    {"$match": {"price.discounted": {"$ne": None}}},
+                    {
+                        "$bucket": {
+                            "groupBy": "$price.discounted",
+                            "boundaries": boundaries,
+                            "default": "other",
+                        }
+                    },
+                ],
+            }
+        },
+    ]
+    try:
+        (result,) = await product_collection.aggregate(pipeline).to_list(1)
     except Exception as error:
         logger.error(error)
         raise HTTPException(status_code=500, detail="Erro ao buscar produtos")
 
+    price_ranges = []
+    for bucket in result["price_ranges"]:
+        if bucket["_id"] == "other":
+            lower, upper = boundaries[-1], None
+        else:
+            lower = bucket["_id"]
+            upper = boundaries[boundaries.index(lower) + 1]
+        price_ranges.append(
+            PriceRangeCount(min=lower, max=upper, count=bucket["count"])
+        )
+    return FacetedSearchResult(
+        hits=[Product(**document) for document in result["hits"]],
+        total=result["total"][0]["count"] if result["total"] else 0,
+        categories=[
+            FacetCount(value=bucket["_id"], count=bucket["count"])
+            for bucket in result["categories"]
+        ],
+        price_ranges=price_ranges,
+    )
+
+
+@app.get("/metrics")
+async def get_metrics() -> Dict[str, Any]:
+    return {
+        "search_index": search_index.stats() if search_index else None,
+        "projection": applied_versions.stats(),
+        "consumers": [consumer.stats() for consumer in consumers],
+    }
+
+
+async def ensure_indexes() -> None:
+    # Version-conditional upserts rely on this index to reject stale events.
+    await product_collection.create_index("sku", unique=True)
+    await product_collection.create_index("name_lower")
+    await product_collection.create_index(
+        [("name", TEXT), ("description", TEXT)],
+        weights={"name": 10, "description": 1},
+        name="name_description_text",
+    )
+    await product_collection.create_index("category.name")
+    await product_collection.create_index("price.discounted")
+    await product_collection.create_index("in_stock")
+    await product_collection.update_many(
+        {"name_lower": {"$exists": False}},
+        [{"$set": {"name_lower": {"$toLower": "$name"}}}],
+    )
+    await product_collection.update_many(
+        {"in_stock": {"$exists": False}},
+        [
+            {
+                "$set": {
+                    "price.discounted": {
+                        "$multiply": [
+                            "$price.value",
+                            {"$subtract": [1, "$price.discount_percent"]},
+                        ]
+                    },
+                    "in_stock": {
+                        "$gt": [
+                            "$inventory.quantity",
+                            {"$ifNull": ["$inventory.reserved", 0]},
+                        ]
+                    },
+                }
+            }
+        ],
+    )
+
 
 @app.on_event("startup")
-def start_sqs_handlers():
+async def start_sqs_handlers() -> None:
+    await ensure_indexes()
+    if search_index is not None:
+        await build_search_index()
     logger.info("started event handler")
     for queue_name, queue_url in queues.items():
-        threading.Thread(
-            target=handle_sqs_message, args=(queue_name, queue_url)
-        ).start()
+        consumer = SQSConsumer(
+            sqs=sqs,
+            queue_url=queue_url,
+            handler=partial(process_messages, queue_name=queue_name),
+            pollers=config.SQS_CONSUMER_POLLERS,
+            workers=config.SQS_CONSUMER_WORKERS,
+            max_in_flight=config.SQS_CONSUMER_MAX_IN_FLIGHT,
+            wait_time_seconds=config.SQS_CONSUMER_WAIT_TIME_SECONDS,
+        )
+        consumer.start()
+        consumers.append(consumer)
+
+
+@app.on_event("shutdown")
+async def stop_sqs_handlers() -> None:
+    for consumer in consumers:
+        await consumer.stop()
+    client.close()
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class AppliedVersions:
+    """
+    Bounded LRU of the last product id and version written for each sku.
+
+    It lets the consumer drop redelivered and out of order events without
+    a round trip to Mongo. Mongo stays the source of truth: an event that
+    is not found here is still written with a version-conditional filter.
+    Versions only compare within a product, a product created again under
+    the same sku starts over.
+    """
+
+    def __init__(self, max_size: int = 100000) -> None:
+        self.__max_size = max_size
+        self.__versions: "OrderedDict[str, Tuple[Optional[str], int]]" = (
+            OrderedDict()
+        )
+        self.__lock = threading.Lock()
+        self.__counters: Dict[str, int] = {
+            "applied": 0,
+            "skipped_duplicate": 0,
+            "skipped_stale": 0,
+            "failed": 0,
+        }
+
+    def is_applied(
+        self, sku: str, product_id: Optional[str], version: int
+    ) -> bool:
+        with self.__lock:
+            applied = self.__versions.get(sku)
+            if applied is None:
+                return False
+            self.__versions.move_to_end(sku)
+            applied_product_id, applied_version = applied
+            return (
+                applied_product_id == product_id and version <= applied_version
+            )
+
+    def record(
+        self, sku: str, product_id: Optional[str], version: int
+    ) -> None:
+        with self.__lock:
+            applied = self.__versions.get(sku)
+            if (
+                applied is not None
+                and applied[0] == product_id
+                and version <= applied[1]
+            ):
+                return
+            self.__versions[sku] = (product_id, version)
+            self.__versions.move_to_end(sku)
+            while len(self.__versions) > self.__max_size:
+                self.__versions.popitem(last=False)
+
+    def discard(self, sku: str) -> None:
+        with self.__lock:
+            self.__versions.pop(sku, None)
+
+    def count(self, outcome: str, amount: int = 1) -> None:
+        with self.__lock:
+            self.__counters[outcome] += amount
+
+    def stats(self) -> Dict[str, int]:
+        with self.__lock:
+            return {"tracked": len(self.__versions), **self.__counters}
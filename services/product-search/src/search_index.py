@@ -0,0 +1,243 @@
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple, cast
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+FIELD_WEIGHTS = {"sku": 3, "name": 3, "category": 2, "description": 1}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index over product sku, name, category and
+    description ranked with BM25.
+
+    Terms are interned to integer ids and each posting list is a pair of
+    arrays holding document ids and field-weighted term frequencies.
+    Updating or removing a product only marks its document id as dead;
+    posting lists are rewritten once dead documents outnumber live ones.
+    The last query token is matched as a prefix for typeahead.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    MAX_PREFIX_EXPANSIONS = 50
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__term_ids: Dict[str, int] = {}
+        self.__sorted_terms: List[str] = []
+        self.__postings_docs: List["array[int]"] = []
+        self.__postings_freqs: List["array[int]"] = []
+        self.__document_frequency: List[int] = []
+        self.__doc_skus: List[Optional[str]] = []
+        self.__doc_names: List[Optional[str]] = []
+        self.__doc_terms: List[Optional["array[int]"]] = []
+        self.__doc_lengths = array("I")
+        self.__doc_ids: Dict[str, int] = {}
+        self.__total_length = 0
+
+    def __term_id(self, term: str) -> int:
+        term_id = self.__term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.__postings_docs)
+            self.__term_ids[term] = term_id
+            self.__sorted_terms.insert(
+                bisect_left(self.__sorted_terms, term), term
+            )
+            self.__postings_docs.append(array("I"))
+            self.__postings_freqs.append(array("H"))
+            self.__document_frequency.append(0)
+        return term_id
+
+    def add(
+        self,
+        sku: str,
+        name: str,
+        description: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> None:
+        """Index a product, replacing any earlier entry for its sku."""
+        frequencies: Dict[str, int] = {}
+        length = 0
+        for field, text in (
+            ("sku", sku),
+            ("name", name),
+            ("category", category),
+            ("description", description),
+        ):
+            for term in tokenize(text):
+                frequencies[term] = (
+                    frequencies.get(term, 0) + FIELD_WEIGHTS[field]
+                )
+                length += 1
+
+        with self.__lock:
+            self.__remove(sku)
+            doc_id = len(self.__doc_skus)
+            term_ids = array("I")
+            for term, frequency in frequencies.items():
+                term_id = self.__term_id(term)
+                self.__postings_docs[term_id].append(doc_id)
+                self.__postings_freqs[term_id].append(min(frequency, 65535))
+                self.__document_frequency[term_id] += 1
+                term_ids.append(term_id)
+            self.__doc_skus.append(sku)
+            self.__doc_names.append(name)
+            self.__doc_terms.append(term_ids)
+            self.__doc_lengths.append(length)
+            self.__doc_ids[sku] = doc_id
+            self.__total_length += length
+            self.__maybe_compact()
+
+    def remove(self, sku: str) -> None:
+        with self.__lock:
+            self.__remove(sku)
+            self.__maybe_compact()
+
+    def __maybe_compact(self) -> None:
+        dead = len(self.__doc_skus) - len(self.__doc_ids)
+        if dead > 1000 and dead > len(self.__doc_ids):
+            self.__compact()
+
+    def __remove(self, sku: str) -> None:
+        doc_id = self.__doc_ids.pop(sku, None)
+        if doc_id is None:
+            return
+        for term_id in self.__doc_terms[doc_id] or ():
+            self.__document_frequency[term_id] -= 1
+        self.__total_length -= self.__doc_lengths[doc_id]
+        self.__doc_skus[doc_id] = None
+        self.__doc_names[doc_id] = None
+        self.__doc_terms[doc_id] = None
+
+    def __compact(self) -> None:
+        new_ids: Dict[int, int] = {}
+        doc_ids: Dict[str, int] = {}
+        doc_skus: List[Optional[str]] = []
+        doc_names: List[Optional[str]] = []
+        doc_terms: List[Optional["array[int]"]] = []
+        doc_lengths = array("I")
+        for doc_id, sku in enumerate(self.__doc_skus):
+            if sku is None:
+                continue
+            new_ids[doc_id] = doc_ids[sku] = len(doc_skus)
+            doc_skus.append(sku)
+            doc_names.append(self.__doc_names[doc_id])
+            doc_terms.append(self.__doc_terms[doc_id])
+            doc_lengths.append(self.__doc_lengths[doc_id])
+        for term_id, docs in enumerate(self.__postings_docs):
+            freqs = self.__postings_freqs[term_id]
+            live_docs = array("I")
+            live_freqs = array("H")
+            for doc_id, frequency in zip(docs, freqs):
+                if doc_id in new_ids:
+                    live_docs.append(new_ids[doc_id])
+                    live_freqs.append(frequency)
+            self.__postings_docs[term_id] = live_docs
+            self.__postings_freqs[term_id] = live_freqs
+        self.__doc_skus = doc_skus
+        self.__doc_names = doc_names
+        self.__doc_terms = doc_terms
+        self.__doc_lengths = doc_lengths
+        self.__doc_ids = doc_ids
+
+    def __expand(self, token: str, prefix: bool) -> List[int]:
+        if not prefix:
+            term_id = self.__term_ids.get(token)
+            return [] if term_id is None else [term_id]
+        term_ids = []
+        start = bisect_left(self.__sorted_terms, token)
+        for term in self.__sorted_terms[start:]:
+            if not term.startswith(token):
+                break
+            term_id = self.__term_ids[term]
+            if not self.__document_frequency[term_id]:
+                continue
+            term_ids.append(term_id)
+            if len(term_ids) == self.MAX_PREFIX_EXPANSIONS:
+                break
+        return term_ids
+
+    def __score_term(
+        self, term_id: int, scores: Dict[int, float], average_length: float
+    ) -> Iterable[int]:
+        documents = len(self.__doc_ids)
+        frequency = self.__document_frequency[term_id]
+        idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+        matched = []
+        for doc_id, term_frequency in zip(
+            self.__postings_docs[term_id], self.__postings_freqs[term_id]
+        ):
+            if self.__doc_skus[doc_id] is None:
+                continue
+            norm = self.K1 * (
+                1
+                - self.B
+                + self.B * self.__doc_lengths[doc_id] / average_length
+            )
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                term_frequency * (self.K1 + 1) / (term_frequency + norm)
+            )
+            matched.append(doc_id)
+        return matched
+
+    def search(
+        self, query: str, limit: int = 10, prefix: bool = True
+    ) -> List[Tuple[str, str, float]]:
+        """
+        Return ``(sku, name, score)`` for the best matching products.
+
+        Every query token has to match; the last one may match as a
+        prefix when ``prefix`` is set.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self.__lock:
+            if not self.__doc_ids:
+                return []
+            average_length = max(self.__total_length / len(self.__doc_ids), 1)
+            scores: Dict[int, float] = {}
+            candidates: Optional[Set[int]] = None
+            for position, token in enumerate(tokens):
+                matched: Set[int] = set()
+                last = position == len(tokens) - 1
+                for term_id in self.__expand(token, prefix and last):
+                    matched.update(
+                        self.__score_term(term_id, scores, average_length)
+                    )
+                candidates = (
+                    matched if candidates is None else candidates & matched
+                )
+                if not candidates:
+                    return []
+            ranked = sorted(
+                candidates or (), key=lambda doc_id: -scores[doc_id]
+            )[:limit]
+            # Removed documents are skipped while scoring, every id is live.
+            return [
+                (
+                    cast(str, self.__doc_skus[doc_id]),
+                    cast(str, self.__doc_names[doc_id]),
+                    scores[doc_id],
+                )
+                for doc_id in ranked
+            ]
+
+    def stats(self) -> Dict[str, int]:
+        with self.__lock:
+            return {
+                "documents": len(self.__doc_ids),
+                "dead_documents": len(self.__doc_skus) - len(self.__doc_ids),
+                "terms": len(self.__term_ids),
+            }
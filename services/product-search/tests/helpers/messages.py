@@ -0,0 +1,75 @@
+import json
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+
+class MessageHelper:
+    @staticmethod
+    def create_product(
+        sku: str = "test_sku",
+        version: Optional[int] = 1,
+        product_id: str = "product-1",
+        name: str = "Test Product",
+        quantity: int = 10,
+        reserved: int = 0,
+    ) -> Dict[str, Any]:
+        return {
+            "id": product_id,
+            "sku": sku,
+            "version": version,
+            "name": name,
+            "description": "Test Description",
+            "image_url": "http://example.com/image.png",
+            "price": {
+                "id": str(uuid4()),
+                "value": 100.0,
+                "discount_percent": 0.1,
+                "discounted_price": 90.0,
+            },
+            "inventory": {
+                "id": str(uuid4()),
+                "quantity": quantity,
+                "reserved": reserved,
+            },
+            "category": {"id": str(uuid4()), "name": "Test Category"},
+        }
+
+    @staticmethod
+    def create_message(body: Any) -> Dict[str, Any]:
+        message_id = str(uuid4())
+        return {
+            "MessageId": message_id,
+            "ReceiptHandle": f"receipt-{message_id}",
+            "Body": body if isinstance(body, str) else json.dumps(body),
+        }
+
+    @classmethod
+    def create_product_message(
+        cls, event_type: str = "updated", **product: Any
+    ) -> Dict[str, Any]:
+        return cls.create_message(
+            {
+                "type": event_type,
+                "product": cls.create_product(**product),
+                "sku": None,
+                "product_id": None,
+                "version": None,
+            }
+        )
+
+    @classmethod
+    def create_deleted_message(
+        cls,
+        sku: str = "test_sku",
+        version: Optional[int] = 1,
+        product_id: Optional[str] = "product-1",
+    ) -> Dict[str, Any]:
+        return cls.create_message(
+            {
+                "type": "deleted",
+                "product": None,
+                "sku": sku,
+                "product_id": product_id,
+                "version": version,
+            }
+        )
@@ -0,0 +1,30 @@
+from typing import Any, Dict, List
+
+
+class CursorHelper:
+    """Motor cursor stand-in that yields the given documents."""
+
+    def __init__(self, documents: List[Dict[str, Any]]) -> None:
+        self.documents = documents
+
+    def sort(self, *args: Any) -> "CursorHelper":
+        return self
+
+    def limit(self, *args: Any) -> "CursorHelper":
+        return self
+
+    def batch_size(self, *args: Any) -> "CursorHelper":
+        return self
+
+    async def to_list(self, *args: Any) -> List[Dict[str, Any]]:
+        return self.documents
+
+    def __aiter__(self) -> "CursorHelper":
+        self.__iterator = iter(self.documents)
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        try:
+            return next(self.__iterator)
+        except StopIteration:
+            raise StopAsyncIteration
@@ -0,0 +1,319 @@
+import base64
+import unittest
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from fastapi.testclient import TestClient
+from pymongo import TEXT
+from src.search_index import InvertedIndex
+from tests.helpers.messages import MessageHelper
+from tests.helpers.mongo import CursorHelper
+
+with patch("boto3.client"):
+    from src import main
+
+
+def create_document(sku: str = "test_sku", **fields):
+    document = MessageHelper.create_product(sku=sku)
+    document.pop("id")
+    document.update(fields)
+    return document
+
+
+class TestEnsureIndexes(unittest.IsolatedAsyncioTestCase):
+    async def test_should_create_indexes(self) -> None:
+        # Arrange
+        product_collection = AsyncMock()
+
+        # Act
+        with patch.object(main, "product_collection", product_collection):
+            await main.ensure_indexes()
+
+        # Assert
+        product_collection.create_index.assert_has_awaits(
+            [
+                call("sku", unique=True),
+                call("name_lower"),
+                call(
+                    [("name", TEXT), ("description", TEXT)],
+                    weights={"name": 10, "description": 1},
+                    name="name_description_text",
+                ),
+            ]
+        )
+        backfilled = [
+            update.args[0]
+            for update in product_collection.update_many.await_args_list
+        ]
+        self.assertIn({"name_lower": {"$exists": False}}, backfilled)
+
+
+class TestGetProductByParams(unittest.TestCase):
+    def setUp(self) -> None:
+        self.product_collection = MagicMock()
+        patcher = patch.object(
+            main, "product_collection", self.product_collection
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(main.app)
+
+    def query(self):
+        return self.product_collection.find.call_args.args[0]
+
+    def test_should_search_name_prefix_and_description_text(self) -> None:
+        # Arrange
+        self.product_collection.find.return_value = CursorHelper(
+            [create_document()]
+        )
+
+        # Act
+        response = self.client.get(
+            "/product", params={"name": "Test.", "description": "shoes"}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.query(),
+            {
+                "deleted": {"$ne": True},
+                "name_lower": {"$regex": "^test\\."},
+                "$text": {"$search": "shoes"},
+            },
+        )
+        self.assertEqual(response.json()[0]["sku"], "test_sku")
+
+    def test_should_page_with_sku_cursor(self) -> None:
+        # Arrange
+        self.product_collection.find.return_value = CursorHelper(
+            [create_document("sku_1"), create_document("sku_2")]
+        )
+        cursor = base64.urlsafe_b64encode(b"sku_0").decode()
+
+        # Act
+        response = self.client.get(
+            "/product", params={"cursor": cursor, "limit": 1}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.query()["$and"], [{"sku": {"$gt": "sku_0"}}])
+        self.assertEqual([p["sku"] for p in response.json()], ["sku_1"])
+        self.assertEqual(
+            base64.urlsafe_b64decode(response.headers["X-Next-Cursor"]),
+            b"sku_1",
+        )
+
+    def test_should_reject_invalid_cursor(self) -> None:
+        # Act
+        response = self.client.get("/product", params={"cursor": "a"})
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+        self.product_collection.find.assert_not_called()
+
+
+class TestSearchProducts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.product_collection = MagicMock()
+        patcher = patch.object(
+            main, "product_collection", self.product_collection
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(main.app)
+
+    def pipeline(self):
+        return self.product_collection.aggregate.call_args.args[0]
+
+    def test_should_compute_facets_in_one_aggregation(self) -> None:
+        # Arrange
+        self.product_collection.aggregate.return_value = CursorHelper(
+            [
+                {
+                    "hits": [create_document()],
+                    "total": [{"count": 3}],
+                    "categories": [{"_id": "Test Category", "count": 3}],
+                    "price_ranges": [
+                        {"_id": 50.0, "count": 2},
+                        {"_id": "other", "count": 1},
+                    ],
+                }
+            ]
+        )
+
+        # Act
+        response = self.client.get(
+            "/product:search",
+            params={
+                "q": "shoes",
+                "category": ["Test Category", "Other Category"],
+                "min_price": 10,
+                "max_price": 100,
+                "in_stock": True,
+                "limit": 5,
+            },
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.product_collection.aggregate.assert_called_once()
+        match, facet = self.pipeline()
+        self.assertEqual(
+            match["$match"],
+            {
+                "deleted": {"$ne": True},
+                "$text": {"$search": "shoes"},
+                "category.name": {"$in": ["Test Category", "Other Category"]},
+                "price.discounted": {"$gte": 10, "$lt": 100},
+                "in_stock": True,
+            },
+        )
+        hits = facet["$facet"]["hits"]
+        self.assertEqual(hits[0], {"$sort": {"score": {"$meta": "textScore"}}})
+        self.assertEqual(hits[1], {"$limit": 5})
+        result = response.json()
+        self.assertEqual(result["total"], 3)
+        self.assertEqual([hit["sku"] for hit in result["hits"]], ["test_sku"])
+        self.assertEqual(
+            result["categories"], [{"value": "Test Category", "count": 3}]
+        )
+        self.assertEqual(
+            result["price_ranges"],
+            [
+                {"min": 50.0, "max": 100.0, "count": 2},
+                {"min": 1000.0, "max": None, "count": 1},
+            ],
+        )
+
+    def test_should_sort_by_sku_without_query(self) -> None:
+        # Arrange
+        self.product_collection.aggregate.return_value = CursorHelper(
+            [{"hits": [], "total": [], "categories": [], "price_ranges": []}]
+        )
+
+        # Act
+        response = self.client.get("/product:search")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        match, facet = self.pipeline()
+        self.assertEqual(match["$match"], {"deleted": {"$ne": True}})
+        self.assertEqual(facet["$facet"]["hits"][0], {"$sort": {"sku": 1}})
+        self.assertEqual(response.json()["total"], 0)
+
+    def test_should_fail_when_aggregation_fails(self) -> None:
+        # Arrange
+        self.product_collection.aggregate.side_effect = Exception("Error")
+
+        # Act
+        response = self.client.get("/product:search")
+
+        # Assert
+        self.assertEqual(response.status_code, 500)
+
+
+class TestGetProductBySku(unittest.TestCase):
+    def setUp(self) -> None:
+        self.product_collection = AsyncMock()
+        patcher = patch.object(
+            main, "product_collection", self.product_collection
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(main.app)
+
+    def test_should_get_live_product(self) -> None:
+        # Arrange
+        self.product_collection.find_one.return_value = create_document()
+
+        # Act
+        response = self.client.get("/product/test_sku")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["sku"], "test_sku")
+        self.product_collection.find_one.assert_awaited_once_with(
+            {"sku": "test_sku", "deleted": {"$ne": True}}
+        )
+
+    def test_should_not_find_missing_product(self) -> None:
+        # Arrange
+        self.product_collection.find_one.return_value = None
+
+        # Act
+        response = self.client.get("/product/test_sku")
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+
+
+class TestSuggestProducts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.search_index = InvertedIndex()
+        patcher = patch.object(main, "search_index", self.search_index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(main.app)
+
+    def test_should_suggest_products_by_prefix(self) -> None:
+        # Arrange
+        self.search_index.add("sku_1", "Red Shoes")
+        self.search_index.add("sku_2", "Red Hat")
+
+        # Act
+        response = self.client.get(
+            "/product:suggest", params={"q": "red sh", "limit": 5}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        (suggestion,) = response.json()
+        self.assertEqual(suggestion["sku"], "sku_1")
+        self.assertEqual(suggestion["name"], "Red Shoes")
+        self.assertGreater(suggestion["score"], 0)
+
+    def test_should_not_suggest_when_index_is_disabled(self) -> None:
+        # Act
+        with patch.object(main, "search_index", None):
+            response = self.client.get("/product:suggest", params={"q": "r"})
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+
+
+class TestSQSHandlers(unittest.IsolatedAsyncioTestCase):
+    async def test_should_start_and_stop_consumers(self) -> None:
+        # Arrange
+        consumer = MagicMock(stop=AsyncMock())
+        consumers = []
+
+        # Act
+        with patch.object(
+            main, "ensure_indexes", AsyncMock()
+        ) as ensure_indexes, patch.object(
+            main, "build_search_index", AsyncMock()
+        ) as build_search_index, patch.object(
+            main, "SQSConsumer", return_value=consumer
+        ) as sqs_consumer, patch.object(
+            main, "consumers", consumers
+        ), patch.object(
+            main, "client"
+        ) as client:
+            await main.start_sqs_handlers()
+            await main.stop_sqs_handlers()
+
+        # Assert
+        ensure_indexes.assert_awaited_once()
+        build_search_index.assert_awaited_once()
+        handler = sqs_consumer.call_args.kwargs["handler"]
+        self.assertIs(handler.func, main.process_messages)
+        self.assertEqual(handler.keywords, {"queue_name": "product-update"})
+        consumer.start.assert_called_once()
+        consumer.stop.assert_awaited_once()
+        self.assertEqual(consumers, [consumer])
+        client.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import time
+import unittest
+from typing import Any, Callable, Dict, List
+from unittest.mock import MagicMock
+
+from src.consumer import SQS_MAX_BATCH_SIZE, SQSConsumer
+from tests.helpers.messages import MessageHelper
+
+
+def receive_batches(batches: List[List[Dict[str, Any]]]) -> Callable:
+    def receive_message(**kwargs: Any) -> Dict[str, Any]:
+        if batches:
+            return {"Messages": batches.pop(0)}
+        time.sleep(0.01)
+        return {}
+
+    return receive_message
+
+
+async def wait_until(condition: Callable[[], bool]) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Condition not met")
+
+
+class TestSQSConsumer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.sqs = MagicMock()
+        self.sqs.delete_message_batch.return_value = {}
+
+    def create_batch(self, size: int = 2) -> List[Dict[str, Any]]:
+        return [
+            MessageHelper.create_product_message(sku=f"sku_{index}")
+            for index in range(size)
+        ]
+
+    async def test_should_delete_processed_messages_in_batch(self) -> None:
+        # Arrange
+        batch = self.create_batch(3)
+        failed_id = batch[1]["MessageId"]
+        self.sqs.receive_message.side_effect = receive_batches([batch])
+
+        async def handler(messages: List[Dict[str, Any]]) -> set:
+            return {failed_id}
+
+        consumer = SQSConsumer(self.sqs, "queue_url", handler)
+
+        # Act
+        consumer.start()
+        await wait_until(lambda: consumer.stats()["processed"] == 2)
+        await consumer.stop()
+
+        # Assert
+        self.sqs.delete_message_batch.assert_called_once_with(
+            QueueUrl="queue_url",
+            Entries=[
+                {
+                    "Id": message["MessageId"],
+                    "ReceiptHandle": message["ReceiptHandle"],
+                }
+                for message in (batch[0], batch[2])
+            ],
+        )
+        self.assertEqual(
+            consumer.stats(), {"in_flight": 0, "processed": 2, "failed": 1}
+        )
+
+    async def test_should_keep_batch_when_handler_raises(self) -> None:
+        # Arrange
+        self.sqs.receive_message.side_effect = receive_batches(
+            [self.create_batch(2)]
+        )
+
+        async def handler(messages: List[Dict[str, Any]]) -> set:
+            raise Exception("Error")
+
+        consumer = SQSConsumer(self.sqs, "queue_url", handler)
+
+        # Act
+        consumer.start()
+        await wait_until(lambda: consumer.stats()["failed"] == 2)
+        await consumer.stop()
+
+        # Assert
+        self.sqs.delete_message_batch.assert_not_called()
+        self.assertEqual(consumer.stats()["processed"], 0)
+
+    async def test_should_limit_concurrent_batches_to_workers(self) -> None:
+        # Arrange
+        self.sqs.receive_message.side_effect = receive_batches(
+            [self.create_batch() for _ in range(4)]
+        )
+        release = asyncio.Event()
+        running = []
+        max_running = []
+
+        async def handler(messages: List[Dict[str, Any]]) -> set:
+            running.append(messages)
+            max_running.append(len(running))
+            await release.wait()
+            running.remove(messages)
+            return set()
+
+        consumer = SQSConsumer(
+            self.sqs, "queue_url", handler, pollers=4, workers=2
+        )
+
+        # Act
+        consumer.start()
+        await wait_until(lambda: self.sqs.receive_message.call_count >= 4)
+        await wait_until(lambda: len(running) == 2)
+        await asyncio.sleep(0.05)
+        running_before_release = len(running)
+        release.set()
+        await wait_until(lambda: consumer.stats()["processed"] == 8)
+        await consumer.stop()
+
+        # Assert
+        self.assertEqual(running_before_release, 2)
+        self.assertEqual(max(max_running), 2)
+        self.assertEqual(self.sqs.delete_message_batch.call_count, 4)
+
+    async def test_should_stop_receiving_at_in_flight_limit(self) -> None:
+        # Arrange
+        self.sqs.receive_message.side_effect = receive_batches(
+            [self.create_batch(SQS_MAX_BATCH_SIZE) for _ in range(2)]
+        )
+        release = asyncio.Event()
+
+        async def handler(messages: List[Dict[str, Any]]) -> set:
+            await release.wait()
+            return set()
+
+        consumer = SQSConsumer(
+            self.sqs,
+            "queue_url",
+            handler,
+            pollers=2,
+            max_in_flight=SQS_MAX_BATCH_SIZE,
+        )
+
+        # Act
+        consumer.start()
+        await wait_until(lambda: self.sqs.receive_message.call_count == 1)
+        await asyncio.sleep(0.05)
+        calls_while_full = self.sqs.receive_message.call_count
+        in_flight_while_full = consumer.stats()["in_flight"]
+        release.set()
+        await wait_until(
+            lambda: consumer.stats()["processed"] == 2 * SQS_MAX_BATCH_SIZE
+        )
+        await consumer.stop()
+
+        # Assert
+        self.assertEqual(calls_while_full, 1)
+        self.assertEqual(in_flight_while_full, SQS_MAX_BATCH_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
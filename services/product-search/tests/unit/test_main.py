@@ -0,0 +1,315 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from src.projection import AppliedVersions
+from src.search_index import InvertedIndex
+from tests.helpers.messages import MessageHelper
+
+with patch("boto3.client"):
+    from src import main
+
+
+class TestProcessMessages(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.product_collection = AsyncMock()
+        self.applied_versions = AppliedVersions(max_size=100)
+        self.search_index = InvertedIndex()
+        for name, value in (
+            ("product_collection", self.product_collection),
+            ("applied_versions", self.applied_versions),
+            ("search_index", self.search_index),
+        ):
+            patcher = patch.object(main, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def written_operations(self):
+        return self.product_collection.bulk_write.call_args.args[0]
+
+    async def test_should_fold_events_into_one_write_per_sku(self) -> None:
+        # Arrange
+        messages = [
+            MessageHelper.create_product_message(version=1, name="First"),
+            MessageHelper.create_product_message(version=3, name="Third"),
+            MessageHelper.create_product_message(version=2, name="Second"),
+            MessageHelper.create_product_message(sku="other_sku", version=1),
+        ]
+
+        # Act
+        failed = await main.process_messages(messages, "product-update")
+
+        # Assert
+        self.assertEqual(failed, set())
+        self.product_collection.bulk_write.assert_awaited_once()
+        self.assertFalse(
+            self.product_collection.bulk_write.call_args.kwargs["ordered"]
+        )
+        first, second = self.written_operations()
+        self.assertEqual(first._doc["$set"]["name"], "Third")
+        self.assertEqual(second._filter["sku"], "other_sku")
+        self.assertTrue(
+            self.applied_versions.is_applied("test_sku", "product-1", 3)
+        )
+
+    async def test_should_skip_applied_versions(self) -> None:
+        # Arrange
+        self.applied_versions.record("test_sku", "product-1", 2)
+        messages = [MessageHelper.create_product_message(version=2)]
+
+        # Act
+        failed = await main.process_messages(messages, "product-update")
+
+        # Assert
+        self.assertEqual(failed, set())
+        self.product_collection.bulk_write.assert_not_awaited()
+        self.assertEqual(self.applied_versions.stats()["skipped_duplicate"], 1)
+
+    async def test_should_write_product_created_again(self) -> None:
+        # Arrange
+        self.applied_versions.record("test_sku", "product-1", 5)
+        messages = [
+            MessageHelper.create_product_message(
+                "updated", version=1, product_id="product-2"
+            )
+        ]
+
+        # Act
+        failed = await main.process_messages(messages, "product-update")
+
+        # Assert
+        self.assertEqual(failed, set())
+        self.product_collection.bulk_write.assert_awaited_once()
+        self.assertEqual(self.applied_versions.stats()["skipped_duplicate"], 0)
+        self.assertTrue(
+            self.applied_versions.is_applied("test_sku", "product-2", 1)
+        )
+
+    async def test_should_fail_poison_messages_only(self) -> None:
+        # Arrange
+        poison = MessageHelper.create_message("not json")
+        missing_fields = MessageHelper.create_message(
+            {"type": "updated", "product": {"sku": "test_sku"}}
+        )
+        valid = MessageHelper.create_product_message(sku="valid_sku")
+
+        # Act
+        failed = await main.process_messages(
+            [poison, missing_fields, valid], "product-update"
+        )
+
+        # Assert
+        self.assertEqual(
+            failed, {poison["MessageId"], missing_fields["MessageId"]}
+        )
+        (operation,) = self.written_operations()
+        self.assertEqual(operation._filter["sku"], "valid_sku")
+
+    async def test_should_map_write_errors_to_messages_by_index(
+        self,
+    ) -> None:
+        # Arrange
+        written = MessageHelper.create_product_message(sku="written_sku")
+        unwritten = MessageHelper.create_product_message(sku="unwritten_sku")
+        self.product_collection.bulk_write.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 2, "errmsg": "Error"}]}
+        )
+
+        # Act
+        failed = await main.process_messages(
+            [written, unwritten], "product-update"
+        )
+
+        # Assert
+        self.assertEqual(failed, {unwritten["MessageId"]})
+        self.assertTrue(
+            self.applied_versions.is_applied("written_sku", "product-1", 1)
+        )
+        self.assertFalse(
+            self.applied_versions.is_applied("unwritten_sku", "product-1", 1)
+        )
+        self.assertEqual(
+            [sku for sku, _, _ in self.search_index.search("test")],
+            ["written_sku"],
+        )
+
+    async def test_should_fail_batch_when_bulk_write_raises(self) -> None:
+        # Arrange
+        messages = [
+            MessageHelper.create_product_message(sku="first_sku"),
+            MessageHelper.create_product_message(sku="second_sku"),
+        ]
+        self.product_collection.bulk_write.side_effect = Exception("Error")
+
+        # Act
+        failed = await main.process_messages(messages, "product-update")
+
+        # Assert
+        self.assertEqual(
+            failed, {message["MessageId"] for message in messages}
+        )
+        self.assertEqual(self.applied_versions.stats()["failed"], 2)
+
+    async def test_should_ignore_other_queues(self) -> None:
+        # Arrange
+        messages = [MessageHelper.create_product_message()]
+
+        # Act
+        failed = await main.process_messages(messages, "other-queue")
+
+        # Assert
+        self.assertEqual(failed, set())
+        self.product_collection.bulk_write.assert_not_awaited()
+
+    async def test_should_only_write_newest_inventory_version(self) -> None:
+        # Arrange
+        messages = [
+            MessageHelper.create_product_message(
+                "inventory_updated", version=3, reserved=2
+            ),
+            MessageHelper.create_product_message(
+                "inventory_updated", version=2, reserved=1
+            ),
+        ]
+
+        # Act
+        failed = await main.process_messages(messages, "product-update")
+
+        # Assert
+        self.assertEqual(failed, set())
+        (operation,) = self.written_operations()
+        self.assertIsInstance(operation, UpdateOne)
+        self.assertEqual(
+            operation._doc["$set"]["inventory"],
+            {"quantity": 10, "reserved": 2},
+        )
+        self.assertIn(
+            {
+                "deleted": {"$ne": True},
+                "product_id": {"$in": ["product-1", None]},
+                "version": {"$lt": 3},
+            },
+            operation._filter["$or"],
+        )
+        self.assertEqual(self.applied_versions.stats()["skipped_duplicate"], 1)
+
+    async def test_should_write_tombstone_with_deleted_version(self) -> None:
+        # Arrange
+        self.search_index.add(
+            sku="test_sku",
+            name="Test Product",
+            description="Test Description",
+            category=None,
+        )
+        messages = [
+            MessageHelper.create_deleted_message(version=4),
+            MessageHelper.create_product_message("updated", version=3),
+        ]
+
+        # Act
+        failed = await main.process_messages(messages, "product-update")
+
+        # Assert
+        self.assertEqual(failed, set())
+        (operation,) = self.written_operations()
+        self.assertEqual(
+            operation._filter,
+            {"sku": "test_sku", "product_id": {"$in": ["product-1", None]}},
+        )
+        self.assertEqual(
+            operation._doc["$set"],
+            {"deleted": True, "product_id": "product-1", "version": 4},
+        )
+        self.assertTrue(operation._upsert)
+        self.assertEqual(self.search_index.search("test"), [])
+
+    async def test_should_delete_over_upsert_of_same_version(self) -> None:
+        # Arrange
+        created = MessageHelper.create_product_message("created", version=0)
+        deleted = MessageHelper.create_deleted_message(version=0)
+        redelivered = MessageHelper.create_product_message(
+            "created", version=0
+        )
+
+        # Act
+        failed = await main.process_messages(
+            [created, deleted, redelivered], "product-update"
+        )
+
+        # Assert
+        self.assertEqual(failed, set())
+        (operation,) = self.written_operations()
+        self.assertTrue(operation._doc["$set"]["deleted"])
+        self.assertEqual(self.applied_versions.stats()["skipped_duplicate"], 1)
+        self.assertFalse(
+            self.applied_versions.is_applied("test_sku", "product-1", 0)
+        )
+        self.assertEqual(self.search_index.search("test"), [])
+
+    async def test_should_delete_when_event_has_no_version(self) -> None:
+        # Arrange
+        messages = [MessageHelper.create_deleted_message(version=None)]
+
+        # Act
+        await main.process_messages(messages, "product-update")
+
+        # Assert
+        (operation,) = self.written_operations()
+        self.assertIsInstance(operation, DeleteOne)
+
+    async def test_should_not_resurrect_from_redelivered_update(self) -> None:
+        # Arrange
+        message = MessageHelper.create_product_message("updated", version=3)
+        self.product_collection.bulk_write.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 0, "code": main.DUPLICATE_KEY_ERROR}]}
+        )
+
+        # Act
+        failed = await main.process_messages([message], "product-update")
+
+        # Assert
+        self.assertEqual(failed, set())
+        self.assertEqual(self.applied_versions.stats()["skipped_stale"], 1)
+        self.assertFalse(
+            self.applied_versions.is_applied("test_sku", "product-1", 3)
+        )
+        self.assertEqual(self.search_index.search("test"), [])
+
+    async def test_should_replace_tombstone_of_another_product(self) -> None:
+        # Arrange
+        message = MessageHelper.create_product_message(
+            "created", version=0, product_id="product-2"
+        )
+
+        # Act
+        await main.process_messages([message], "product-update")
+
+        # Assert
+        (operation,) = self.written_operations()
+        self.assertIn(
+            {"deleted": True, "product_id": {"$ne": "product-2"}},
+            operation._filter["$or"],
+        )
+        self.assertEqual(operation._doc["$unset"], {"deleted": ""})
+
+    async def test_should_defer_product_created_again_in_batch(self) -> None:
+        # Arrange
+        deleted = MessageHelper.create_deleted_message(version=4)
+        created = MessageHelper.create_product_message(
+            "created", version=0, product_id="product-2"
+        )
+
+        # Act
+        failed = await main.process_messages(
+            [deleted, created], "product-update"
+        )
+
+        # Assert
+        self.assertEqual(failed, {created["MessageId"]})
+        (operation,) = self.written_operations()
+        self.assertTrue(operation._doc["$set"]["deleted"])
+
+
+if __name__ == "__main__":
+    unittest.main()
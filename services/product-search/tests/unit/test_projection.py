@@ -0,0 +1,102 @@
+import unittest
+
+from src.projection import AppliedVersions
+
+
+class TestAppliedVersions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.applied_versions = AppliedVersions(max_size=2)
+
+    def test_should_report_recorded_and_older_versions_as_applied(
+        self,
+    ) -> None:
+        # Arrange
+        self.applied_versions.record("sku_a", "product-1", 3)
+
+        # Act & Assert
+        self.assertTrue(
+            self.applied_versions.is_applied("sku_a", "product-1", 2)
+        )
+        self.assertTrue(
+            self.applied_versions.is_applied("sku_a", "product-1", 3)
+        )
+        self.assertFalse(
+            self.applied_versions.is_applied("sku_a", "product-1", 4)
+        )
+        self.assertFalse(
+            self.applied_versions.is_applied("sku_b", "product-1", 0)
+        )
+
+    def test_should_not_record_older_version(self) -> None:
+        # Arrange
+        self.applied_versions.record("sku_a", "product-1", 3)
+
+        # Act
+        self.applied_versions.record("sku_a", "product-1", 1)
+
+        # Assert
+        self.assertTrue(
+            self.applied_versions.is_applied("sku_a", "product-1", 3)
+        )
+
+    def test_should_not_apply_versions_of_another_product(self) -> None:
+        # Arrange
+        self.applied_versions.record("sku_a", "product-1", 5)
+
+        # Act
+        self.applied_versions.record("sku_a", "product-2", 0)
+
+        # Assert
+        self.assertFalse(
+            self.applied_versions.is_applied("sku_a", "product-2", 1)
+        )
+        self.assertTrue(
+            self.applied_versions.is_applied("sku_a", "product-2", 0)
+        )
+        self.assertFalse(
+            self.applied_versions.is_applied("sku_a", "product-1", 5)
+        )
+
+    def test_should_evict_least_recently_used_sku(self) -> None:
+        # Arrange
+        self.applied_versions.record("sku_a", "product-1", 1)
+        self.applied_versions.record("sku_b", "product-1", 1)
+        self.applied_versions.is_applied("sku_a", "product-1", 1)
+
+        # Act
+        self.applied_versions.record("sku_c", "product-1", 1)
+
+        # Assert
+        self.assertTrue(
+            self.applied_versions.is_applied("sku_a", "product-1", 1)
+        )
+        self.assertFalse(
+            self.applied_versions.is_applied("sku_b", "product-1", 1)
+        )
+        self.assertEqual(self.applied_versions.stats()["tracked"], 2)
+
+    def test_should_forget_discarded_sku(self) -> None:
+        # Arrange
+        self.applied_versions.record("sku_a", "product-1", 5)
+
+        # Act
+        self.applied_versions.discard("sku_a")
+
+        # Assert
+        self.assertFalse(
+            self.applied_versions.is_applied("sku_a", "product-1", 0)
+        )
+
+    def test_should_count_outcomes(self) -> None:
+        # Act
+        self.applied_versions.count("applied", 3)
+        self.applied_versions.count("skipped_stale")
+
+        # Assert
+        stats = self.applied_versions.stats()
+        self.assertEqual(stats["applied"], 3)
+        self.assertEqual(stats["skipped_stale"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+
+from src.search_index import InvertedIndex, tokenize
+
+
+class TestInvertedIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = InvertedIndex()
+
+    def test_should_tokenize_lowercase_words(self) -> None:
+        # Act
+        tokens = tokenize("Café-Cup 2X")
+
+        # Assert
+        self.assertEqual(tokens, ["café", "cup", "2x"])
+
+    def test_should_rank_weighted_fields_first(self) -> None:
+        # Arrange
+        self.index.add("sku_1", "Red Shoes", description="Running")
+        self.index.add("sku_2", "Blue Hat", description="Red ribbon")
+        self.index.add("sku_3", "Green Hat", description="Wool")
+
+        # Act
+        results = self.index.search("red")
+
+        # Assert
+        self.assertEqual([sku for sku, _, _ in results], ["sku_1", "sku_2"])
+        self.assertGreater(results[0][2], results[1][2])
+        self.assertEqual(results[0][1], "Red Shoes")
+
+    def test_should_rank_rare_terms_higher(self) -> None:
+        # Arrange
+        self.index.add("sku_1", "Hat", category="Wool")
+        self.index.add("sku_2", "Hat", category="Cotton")
+        self.index.add("sku_3", "Hat", category="Cotton")
+
+        # Act
+        (wool,) = self.index.search("wool")
+        cotton = self.index.search("cotton")
+
+        # Assert
+        self.assertEqual(len(cotton), 2)
+        self.assertGreater(wool[2], cotton[0][2])
+
+    def test_should_require_every_token(self) -> None:
+        # Arrange
+        self.index.add("sku_1", "Red Shoes")
+        self.index.add("sku_2", "Red Hat")
+
+        # Act
+        results = self.index.search("red hat")
+
+        # Assert
+        self.assertEqual([sku for sku, _, _ in results], ["sku_2"])
+
+    def test_should_match_last_token_as_prefix(self) -> None:
+        # Arrange
+        self.index.add("sku_1", "Red Shoes")
+        self.index.add("sku_2", "Red Shirt")
+
+        # Act
+        prefix_results = self.index.search("red sh")
+        exact_results = self.index.search("red sh", prefix=False)
+
+        # Assert
+        self.assertEqual(
+            sorted(sku for sku, _, _ in prefix_results), ["sku_1", "sku_2"]
+        )
+        self.assertEqual(exact_results, [])
+
+    def test_should_limit_results(self) -> None:
+        # Arrange
+        for number in range(5):
+            self.index.add(f"sku_{number}", "Hat")
+
+        # Act
+        results = self.index.search("hat", limit=2)
+
+        # Assert
+        self.assertEqual(len(results), 2)
+
+    def test_should_replace_product_on_add(self) -> None:
+        # Arrange
+        self.index.add("sku_1", "Red Shoes")
+
+        # Act
+        self.index.add("sku_1", "Blue Shoes")
+
+        # Assert
+        self.assertEqual(self.index.search("red"), [])
+        self.assertEqual(
+            self.index.search("blue")[0][:2], ("sku_1", "Blue Shoes")
+        )
+        self.assertEqual(
+            self.index.stats(),
+            {"documents": 1, "dead_documents": 1, "terms": 4},
+        )
+
+    def test_should_remove_product(self) -> None:
+        # Arrange
+        self.index.add("sku_1", "Red Shoes")
+
+        # Act
+        self.index.remove("sku_1")
+        self.index.remove("unknown_sku")
+
+        # Assert
+        self.assertEqual(self.index.search("red"), [])
+        self.assertEqual(self.index.stats()["documents"], 0)
+
+    def test_should_compact_when_dead_documents_outnumber_live(self) -> None:
+        # Arrange
+        self.index.add("kept_sku", "Kept Hat")
+
+        # Act
+        for _ in range(1002):
+            self.index.add("updated_sku", "Updated Hat")
+
+        # Assert
+        self.assertEqual(
+            self.index.stats(),
+            {"documents": 2, "dead_documents": 0, "terms": 5},
+        )
+        self.assertEqual(
+            sorted(sku for sku, _, _ in self.index.search("hat")),
+            ["kept_sku", "updated_sku"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()